@@ -75,12 +75,15 @@ def clean_version(v, remove_patch=True):
         v = re.sub(r"\(.*?\)", "", v).strip()
     return v
 
+# 复用同一个会话，多次请求共享 keep-alive 连接
+session = requests.Session()
+
 print("\n🔛 程序开始运行啦！\n")
 
 # 主循环
 for key, info in pages.items():
     try:
-        res = requests.get(info["url"], timeout=10)
+        res = session.get(info["url"], timeout=10)
         res.raise_for_status()
         soup = BeautifulSoup(res.text, "html.parser")
 
@@ -0,0 +1,42 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import json
+import os
+import sys
+import threading
+from datetime import datetime
+
+# 串行化配置文件的读取-合并-写入，避免并发更新互相覆盖
+_config_lock = threading.Lock()
+
+def get_config_path():
+    """获取配置文件的绝对路径（统一使用sys.argv[0]）"""
+    return os.path.join(os.path.dirname(sys.argv[0]), "config.json")
+
+def get_data_path(file_name: str) -> str:
+    """获取与配置文件同目录的数据文件路径（缓存等）"""
+    return os.path.join(os.path.dirname(get_config_path()), file_name)
+
+def load_config() -> dict:
+    """读取配置文件，不存在或损坏时返回空字典"""
+    try:
+        with open(get_config_path(), "r", encoding="utf-8") as f:
+            config = json.load(f)
+            return config if isinstance(config, dict) else {}
+    except Exception:
+        return {}
+
+def update_config(**values) -> dict:
+    """合并写入配置文件，保留其他已有的配置项（先写临时文件再替换，避免写坏配置文件）"""
+    with _config_lock:
+        config = load_config()
+        config.update(values)
+        config["last_updated"] = datetime.now().isoformat()
+
+        config_path = get_config_path()
+        os.makedirs(os.path.dirname(config_path) or ".", exist_ok=True)
+        tmp_path = config_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(config, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, config_path)
+    return config
@@ -0,0 +1,116 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+from typing import Dict, Optional
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QAction, QIcon
+from PySide6.QtWidgets import QApplication, QMenu, QSystemTrayIcon
+
+from app_config import load_config
+from card_state import CardState
+from checker import check_failed, check_services
+from fetch_engine import CheckBudget, CheckCancelled, FetchEngine, new_check_budget
+from mode_switch import get_current_window, load_window_class, set_current_window
+from scheduler import get_scheduler
+from services import service_names
+from workers import get_worker_pool, new_check_task
+
+# ===== 自动检查 =====
+class AutoCheckRunner(QObject):
+    """按调度器的计划自动检查更新
+
+    - 调度线程到期时发出 due 信号，检查在UI线程中发起
+    - 有可见的主窗口时在窗口中检查，结果直接显示在卡片上
+    - 没有窗口时（如后台模式）在工作线程池中检查，发现新版本时才打开窗口显示结果；
+      已有检查在进行时并入该检查，不重复检查
+    """
+    due = Signal()
+    updates_found = Signal(object)  # {应用键: CardState}
+
+    def __init__(self, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self.scheduler = get_scheduler()
+        self.fetch_engine = None
+        self.tray_icon = None
+        self.tray_menu = None
+        self.due.connect(self.run_check)
+        self.updates_found.connect(self.show_results)
+
+    def start(self):
+        """启动调度线程（到期通知经信号排队到UI线程）"""
+        self.scheduler.start(self.due.emit)
+
+    def stop(self):
+        """停止调度线程"""
+        self.scheduler.stop()
+
+    def run_check(self):
+        """执行一次到期的自动检查"""
+        window = get_current_window()
+        if window is not None and window.isVisible():
+            # 窗口中已有检查在进行时并入该检查，结束时会记录结果
+            window.run_check()
+            return
+        budget = new_check_budget()
+        get_worker_pool().submit(new_check_task(self._check_in_background, (budget,), budget))
+
+    def _check_in_background(self, budget: CheckBudget):
+        """不依赖窗口的检查（在工作线程池中执行，被取消时不记录检查）"""
+        if self.fetch_engine is None:
+            self.fetch_engine = FetchEngine()
+        try:
+            results = check_services(self.fetch_engine, service_names, budget=budget)
+        except CheckCancelled:
+            raise
+        except Exception:
+            self.scheduler.record_check(False)
+            return
+        self.scheduler.record_check(not check_failed(results))
+        if any(result.get("status_type") == "update_available" for result in results.values()):
+            self.updates_found.emit({key: CardState.from_result(result) for key, result in results.items()})
+
+    def show_results(self, states: Dict[str, CardState]):
+        """发现新版本时显示结果（已有可见窗口则更新卡片，否则打开窗口）"""
+        window = get_current_window()
+        if window is not None and window.isVisible():
+            for key, state in states.items():
+                window.update_card_result(key, state)
+        else:
+            window = self.open_window({"results": states, "manual_versions": {}, "running": False})
+        window.raise_()
+        window.activateWindow()
+
+    def open_window(self, initial_state: Optional[dict] = None):
+        """按配置中的首选模式打开主窗口（没有初始状态时窗口会自行检查）"""
+        window = get_current_window()
+        if initial_state is None and window is not None and window.isVisible():
+            return window
+        preferred_mode = load_config().get("preferred_mode", "normal")
+        window = load_window_class(preferred_mode)(initial_state=initial_state)
+        set_current_window(window)
+        window.show()
+        return window
+
+    # ----- 托盘图标（后台模式） -----
+    def install_tray_icon(self, icon_path: str) -> bool:
+        """后台模式下显示托盘图标（打开窗口/退出），系统不支持托盘时返回 False"""
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            return False
+        self.tray_icon = QSystemTrayIcon(QIcon(icon_path), self)
+        self.tray_icon.setToolTip("Update Checker for HONOR MagicBook")
+        # 托盘图标不接管菜单的所有权，需要保留引用
+        self.tray_menu = menu = QMenu()
+        open_action = QAction("打开", menu)
+        open_action.triggered.connect(lambda: self.open_window().activateWindow())
+        quit_action = QAction("退出", menu)
+        quit_action.triggered.connect(QApplication.quit)
+        menu.addAction(open_action)
+        menu.addAction(quit_action)
+        self.tray_icon.setContextMenu(menu)
+        self.tray_icon.activated.connect(self._on_tray_activated)
+        self.tray_icon.show()
+        return True
+
+    def _on_tray_activated(self, reason):
+        if reason == QSystemTrayIcon.Trigger:
+            self.open_window().activateWindow()
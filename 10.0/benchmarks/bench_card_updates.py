@@ -0,0 +1,115 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""长时间运行时卡片更新的开销基准
+
+用法：python benchmarks/bench_card_updates.py [--mode normal --mode glass] [--checks 500] [--tree DIR]
+
+模拟同一个窗口内反复检查更新：每轮把全部结果重新发送给 update_card_result，
+其中每 10 轮有一次结果真正变化（版本号和状态轮换）。统计：
+- 链接按钮 clicked 信号上的连接数（应保持不变）
+- 最后点击一次链接按钮时打开链接的次数（应为1）
+- 每轮更新的中位/最大耗时
+--tree 指向另一份 10.0 目录（如 git worktree 中的旧版本）即可得到改动前的数据。
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description="长时间运行时卡片更新的开销基准")
+parser.add_argument("--mode", action="append", choices=["normal", "glass"], help="要测量的模式（可重复）")
+parser.add_argument("--checks", type=int, default=500, help="模拟的检查次数")
+parser.add_argument("--tree", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."),
+                    help="被测的 10.0 目录")
+args = parser.parse_args()
+
+sys.path.insert(0, os.path.abspath(args.tree))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# 配置和缓存写到临时目录（配置文件路径由 sys.argv[0] 决定）
+data_dir = tempfile.mkdtemp(prefix="bench_card_updates_")
+sys.argv[0] = os.path.join(data_dir, "bench_card_updates.py")
+
+from PySide6.QtCore import SIGNAL, qInstallMessageHandler
+from PySide6.QtWidgets import QApplication
+
+import mode_switch
+from services import service_names
+
+STATUS_CYCLE = [
+    ("有新版本可用！", "update_available"),
+    ("本地版本高于官网版本", "higher_version"),
+]
+
+class OpenUrlCounter:
+    """替代窗口模块中的 QDesktopServices，只统计打开链接的次数"""
+    def __init__(self):
+        self.opened = 0
+
+    def openUrl(self, url):
+        self.opened += 1
+        return True
+
+def make_result(generation: int) -> dict:
+    """第 generation 代的检查结果（每代的版本号和状态不同）"""
+    status, status_type = STATUS_CYCLE[generation % len(STATUS_CYCLE)]
+    return {
+        "local_version": f"1.0.{generation}",
+        "online_version": f"1.0.{generation + 1}",
+        "status": status,
+        "status_type": status_type,
+        "download_url": "https://www.honor.com/cn/",
+    }
+
+def bench_mode(app, mode: str, checks: int) -> dict:
+    """在一个模式的窗口上模拟 checks 次检查"""
+    window_class = mode_switch.load_window_class(mode)
+    module = sys.modules[window_class.__module__]
+    counter = OpenUrlCounter()
+    module.QDesktopServices = counter
+
+    state = {"results": {key: make_result(0) for key in service_names}, "manual_versions": {}, "running": False}
+    window = window_class(initial_state=state)
+    window.show()
+    app.processEvents()
+
+    card = next(iter(window.software_cards.values()))
+    handlers_before = card.download_button.receivers(SIGNAL("clicked()"))
+    timings = []
+    for i in range(checks):
+        result = make_result(i // 10)
+        start = time.perf_counter()
+        for key in service_names:
+            window.update_card_result(key, result)
+        app.processEvents()
+        timings.append((time.perf_counter() - start) * 1000)
+    handlers_after = card.download_button.receivers(SIGNAL("clicked()"))
+
+    card.download_button.click()
+    window.close()
+    app.processEvents()
+    return {
+        "handlers": (handlers_before, handlers_after),
+        "opened": counter.opened,
+        "median_ms": statistics.median(timings),
+        "max_ms": max(timings),
+    }
+
+def main():
+    # 屏蔽 Qt 的样式表警告，避免输出耗时计入测量
+    qInstallMessageHandler(lambda mode, context, message: None)
+    app = QApplication(sys.argv[:1])
+
+    print(f"被测目录：{os.path.abspath(args.tree)}，模拟 {args.checks} 次检查")
+    print(f"{'模式':<8}{'连接数(前→后)':>14}{'单击打开次数':>12}{'中位(ms)':>10}{'最大(ms)':>10}")
+    for mode in args.mode or ["normal", "glass"]:
+        stats = bench_mode(app, mode, args.checks)
+        handlers = f"{stats['handlers'][0]}→{stats['handlers'][1]}"
+        print(f"{mode:<8}{handlers:>14}{stats['opened']:>12}{stats['median_ms']:>10.2f}{stats['max_ms']:>10.2f}")
+    print()
+    print("每轮更新全部卡片；结果每 10 轮变化一次。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""网络异常时一次检查结束所需的时间（检查时间预算与网络探测）
+
+用法：python benchmarks/bench_check_budget.py [--budget 8]
+
+用 stand_in_server 在本地返回页面副本，先完整检查一次（缓存官网版本），再模拟以下情况：
+- 正常：每个请求延迟0.1秒
+- 服务器无响应：连接成功但一直不返回响应
+- 服务器很慢：每个请求延迟6秒
+- 网络不可用：官网域名无法解析
+对比改动前（每个请求 timeout=10，没有预算和网络探测）与改动后（check_budget 秒的预算），
+统计从开始检查到全部应用有结果的时间，以及结果中使用缓存和检查失败的应用数。
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# 配置和缓存写到临时目录（配置文件路径由 sys.argv[0] 决定）
+data_dir = tempfile.mkdtemp(prefix="bench_check_budget_")
+sys.argv[0] = os.path.join(data_dir, "bench_check_budget.py")
+with open(os.path.join(data_dir, "config.json"), "w", encoding="utf-8") as f:
+    # 校验信息缓存的新鲜期设为0，每次检查都要访问网络
+    f.write('{"http_cache_ttl": 0}')
+
+import checker
+from fetch_engine import CONNECT_TIMEOUT, READ_TIMEOUT, CheckBudget, FetchEngine
+from services import redirect_site, website_config
+from stand_in_server import StandInServer
+
+OFFLINE_SITE = "http://honor-offline.invalid"
+
+def run_check(budget_seconds: float, before: bool) -> dict:
+    """检查全部应用，返回耗时、使用缓存和失败的应用数"""
+    # 改动前：每个请求的连接和读取超时都是10秒，不限制整次检查的时间
+    checker.CONNECT_TIMEOUT, checker.READ_TIMEOUT = (10, 10) if before else (CONNECT_TIMEOUT, READ_TIMEOUT)
+    budget = None if before else CheckBudget(budget_seconds)
+    start = time.perf_counter()
+    results = checker.check_services(FetchEngine(), list(website_config), budget=budget)
+    elapsed = time.perf_counter() - start
+    cached = sum(1 for result in results.values() if "使用缓存" in result["status"])
+    failed = sum(1 for result in results.values() if result.get("fetch_failed")) - cached
+    return {"seconds": elapsed, "cached": cached, "failed": failed}
+
+def main():
+    parser = argparse.ArgumentParser(description="网络异常时一次检查结束所需的时间")
+    parser.add_argument("--budget", type=float, default=8.0, help="检查时间预算（秒）")
+    args = parser.parse_args()
+
+    server = StandInServer()
+    base_url = server.start()
+    redirect_site(base_url)
+    run_check(args.budget, before=False)  # 缓存官网版本
+
+    scenarios = [
+        ("正常", base_url, 0.1),
+        ("服务器无响应", base_url, 3600),
+        ("服务器很慢（6秒）", base_url, 6),
+        ("网络不可用", OFFLINE_SITE, 0),
+    ]
+    print(f"检查时间预算 {args.budget:g} 秒，连接超时 {CONNECT_TIMEOUT:g} 秒，读取超时 {READ_TIMEOUT:g} 秒")
+    print(f"{'情况':<16}{'方式':<8}{'耗时(s)':>10}{'使用缓存':>10}{'失败':>6}")
+    for name, site, latency in scenarios:
+        for label, before in (("改动前", True), ("改动后", False)):
+            server.latency = latency
+            redirect_site(site)
+            # 把缓存的官网版本复制到当前地址下（网络不可用时地址是另一个域名）
+            cache = checker.get_validator_cache()
+            for info in website_config.values():
+                entry = cache.get(info["url"].replace(site, base_url))
+                cache.store(info["url"], entry["etag"], entry["last_modified"], entry["text"])
+            stats = run_check(args.budget, before)
+            print(f"{name:<16}{label:<8}{stats['seconds']:>10.2f}{stats['cached']:>10}{stats['failed']:>6}")
+    server.latency = 0
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""记录各阶段耗时对检查时间的影响
+
+用法：python benchmarks/bench_diagnostics.py [--rounds 200] [--latency 0]
+
+用 stand_in_server 在本地返回页面副本（默认不加延迟，耗时中没有网络等待，记录的开销占比最大），
+交替进行记录与不记录耗时的完整检查（config.json 的 diagnostics_enabled），各 --rounds 次，对比耗时中位数：
+- 条件请求：缓存已过期，服务器返回304
+- 下载页面：每次检查前清空缓存，下载并解析页面
+整次检查的耗时受本机负载影响，波动通常大于记录的开销，因此另外直接测量记录本身的耗时：
+统计一次检查中各阶段的记录次数，乘以单次记录的耗时，再加上读取配置和写入历史记录的耗时。
+最后输出最近一次检查各阶段的耗时和历史记录的中位数、P95。
+"""
+
+import argparse
+import collections
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# 配置和缓存写到临时目录（配置文件路径由 sys.argv[0] 决定）
+data_dir = tempfile.mkdtemp(prefix="bench_diagnostics_")
+sys.argv[0] = os.path.join(data_dir, "bench_diagnostics.py")
+with open(os.path.join(data_dir, "config.json"), "w", encoding="utf-8") as f:
+    # 校验信息缓存的新鲜期设为0，每次检查都要访问网络
+    f.write('{"http_cache_ttl": 0}')
+
+import diagnostics
+import http_cache
+from app_config import update_config
+from checker import check_services
+from fetch_engine import FetchEngine
+from http_session import SessionManager
+from services import redirect_site, website_config
+from stand_in_server import StandInServer
+
+def run_check(download: bool) -> float:
+    """检查全部应用一次，返回耗时（毫秒）"""
+    if download:
+        # 换一个空的校验信息缓存
+        path = os.path.join(data_dir, "http_cache.json")
+        if os.path.exists(path):
+            os.remove(path)
+        http_cache._cache = http_cache.ValidatorCache(path, ttl=0)
+    start = time.perf_counter()
+    check_services(FetchEngine(), list(website_config))
+    return (time.perf_counter() - start) * 1000
+
+def run_scenario(rounds: int, download: bool) -> dict:
+    """交替记录与不记录耗时，减少机器负载变化的影响"""
+    timings = {True: [], False: []}
+    for round_index in range(rounds * 2):
+        enabled = round_index % 2 == 0
+        update_config(diagnostics_enabled=enabled)
+        timings[enabled].append(run_check(download))
+    return {enabled: statistics.median(values) for enabled, values in timings.items()}
+
+def measure_us(func, count: int = 20000) -> float:
+    """func 单次调用的耗时（微秒）"""
+    start = time.perf_counter()
+    for _ in range(count):
+        func()
+    return (time.perf_counter() - start) / count * 1e6
+
+def record_stage():
+    with diagnostics.stage("parse"):
+        pass
+
+def record_service():
+    with diagnostics.recording(diagnostics.ServiceTimings()):
+        pass
+
+def bookkeeping_us(download: bool) -> float:
+    """一次检查中记录耗时本身花费的时间（微秒）"""
+    # 统计一次检查中各阶段的记录次数
+    calls = collections.Counter()
+    stage = diagnostics.stage
+
+    def counting_stage(name, exclude=()):
+        calls[name] += 1
+        return stage(name, exclude)
+
+    update_config(diagnostics_enabled=True)
+    diagnostics.stage = counting_stage
+    try:
+        run_check(download)
+    finally:
+        diagnostics.stage = stage
+
+    history = diagnostics.TimingHistory(os.path.join(data_dir, "bench_timings.jsonl"))
+    check = diagnostics.get_timing_history().latest()
+
+    def save_history():
+        history.add(check)
+        history.flush()
+
+    with diagnostics.recording(diagnostics.ServiceTimings()):
+        stage_us = measure_us(record_stage)
+    return (sum(calls.values()) * stage_us + len(website_config) * measure_us(record_service)
+            + measure_us(diagnostics.timings_enabled, 2000) + measure_us(save_history, 2000))
+
+def main():
+    parser = argparse.ArgumentParser(description="记录各阶段耗时对检查时间的影响")
+    parser.add_argument("--rounds", type=int, default=200, help="每种方式的检查次数")
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的延迟（秒）")
+    args = parser.parse_args()
+
+    server = StandInServer(latency=args.latency)
+    # 使用域名访问，连接时有DNS解析
+    redirect_site(server.start().replace("127.0.0.1", "localhost"))
+    run_check(download=False)  # 导入 requests、缓存官网版本
+
+    print(f"每种方式 {args.rounds} 次完整检查（替身服务每个请求延迟 {args.latency:g} 秒）")
+    print(f"{'场景':<12}{'不记录(ms)':>12}{'记录(ms)':>12}{'差值':>10}{'记录本身(ms)':>14}{'开销':>8}")
+    for name, download in (("条件请求（304）", False), ("下载页面", True)):
+        medians = run_scenario(args.rounds, download)
+        difference = medians[True] / medians[False] - 1
+        bookkeeping_ms = bookkeeping_us(download) / 1000
+        print(f"{name:<12}{medians[False]:>12.2f}{medians[True]:>12.2f}{difference:>10.1%}"
+              f"{bookkeeping_ms:>14.3f}{bookkeeping_ms / medians[False]:>8.2%}")
+    print()
+
+    # 新建连接时才有DNS解析和建立连接的耗时
+    SessionManager.instance().adapter.close()
+    update_config(diagnostics_enabled=True)
+    run_check(download=True)
+    history = diagnostics.get_timing_history()
+    latest = history.latest()
+    summary = history.summary()
+    print("最近一次检查（新建连接、下载页面）各阶段耗时（毫秒），以及历史记录的中位数和P95：")
+    print(f"{'阶段':<10}" + "".join(f"{key:>20}" for key in latest.services) + f"{'中位数':>10}{'P95':>10}")
+    for stage in diagnostics.STAGES + ("total",):
+        cells = [latest.services[key].stages.get(stage) for key in latest.services]
+        print(f"{diagnostics.STAGE_NAMES[stage]:<10}"
+              + "".join(f"{'-' if value is None else f'{value * 1000:.2f}':>20}" for value in cells)
+              + f"{summary[stage]['p50_ms']:>10.2f}{summary[stage]['p95_ms']:>10.2f}")
+    server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""对比各提取后端在官网页面副本上的耗时与峰值内存
+
+用法：python benchmarks/bench_extractors.py [--repeat 20] [--backend regex --backend stream]
+
+页面副本位于 fixtures/pages/，文件名与 website_config 中URL的最后一段对应。
+"""
+
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from extractors import EXTRACTORS, get_extractor
+from services import website_config
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "fixtures", "pages")
+
+# ===== 模拟响应 =====
+class SavedResponse:
+    """用页面副本模拟 stream=True 的 requests 响应"""
+    def __init__(self, data: bytes):
+        self.raw = io.BytesIO(data)
+        self.headers = {
+            "Content-Type": "text/html; charset=utf-8",
+            "Content-Length": str(len(data))
+        }
+        self.encoding = "utf-8"
+
+    @property
+    def content(self) -> bytes:
+        return self.raw.read()
+
+    def iter_content(self, chunk_size: int):
+        while True:
+            chunk = self.raw.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        pass
+
+# ===== 测量 =====
+def page_path(info: dict) -> str:
+    """website_config 条目对应的页面副本路径"""
+    return os.path.join(PAGES_DIR, info["url"].rstrip("/").rsplit("/", 1)[-1] + ".html")
+
+def run_once(backend, data: bytes, selector):
+    """提取一次，返回 (提取结果, 读取的字节数)"""
+    response = SavedResponse(data)
+    text = backend.extract_response(response, selector)
+    return text, response.raw.tell()
+
+def measure(backend, data: bytes, selector, repeat: int) -> dict:
+    """测量单个后端在单个页面上的耗时与峰值内存"""
+    text, bytes_read = run_once(backend, data, selector)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_once(backend, data, selector)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    run_once(backend, data, selector)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "text": text,
+        "bytes_read": bytes_read,
+        "median_ms": statistics.median(timings),
+        "min_ms": min(timings),
+        "peak_kb": peak / 1024
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="提取后端基准测试")
+    parser.add_argument("--repeat", type=int, default=20, help="每个页面的重复次数")
+    parser.add_argument("--backend", action="append", choices=sorted(EXTRACTORS),
+                        help="只测试指定后端（可重复指定）")
+    args = parser.parse_args()
+
+    backends = args.backend or sorted(EXTRACTORS)
+    reference = get_extractor("bs4")
+    mismatches = 0
+
+    print(f"{'页面':<28}{'后端':<10}{'中位数(ms)':>12}{'最快(ms)':>10}{'峰值内存(KB)':>14}{'读取字节':>10}  结果")
+    for key, info in website_config.items():
+        path = page_path(info)
+        if not os.path.exists(path):
+            print(f"{key}: 缺少页面副本 {path}")
+            continue
+        with open(path, "rb") as f:
+            data = f.read()
+        expected, _ = run_once(reference, data, info["selector"])
+
+        for name in backends:
+            result = measure(EXTRACTORS[name], data, info["selector"], args.repeat)
+            ok = result["text"] == expected
+            mismatches += not ok
+            print(f"{os.path.basename(path):<28}{name:<10}{result['median_ms']:>12.2f}{result['min_ms']:>10.2f}"
+                  f"{result['peak_kb']:>14.0f}{result['bytes_read']:>10}  "
+                  f"{'一致' if ok else '不一致: ' + repr(result['text'])}")
+        print()
+
+    if "lxml" in backends:
+        print("注：lxml 的文档树由C代码分配，tracemalloc 只统计到 Python 对象部分。")
+    if mismatches:
+        print(f"有 {mismatches} 项结果与 BeautifulSoup 不一致")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
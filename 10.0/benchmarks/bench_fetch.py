@@ -0,0 +1,94 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""官网版本获取（抓取引擎、校验信息缓存、页面解析）在本地替身服务上的耗时
+
+用法：python benchmarks/bench_fetch.py [--rounds 5] [--latency 0.1] [--bandwidth 512] [--error-rate 0.3]
+
+用 stand_in_server 在本地返回 fixtures/pages/ 中的页面副本（不访问网络），
+每种场景重复 --rounds 次完整获取三个官网版本，统计耗时中位数、请求数、发送字节数和失败数：
+- 首次：没有缓存，下载并解析页面（gzip / 不压缩）
+- 条件请求：缓存已过期，服务器返回304
+- 新鲜期内：不发送请求
+- 页面更新：每次获取前修改一个页面，其余页面返回304
+- 错误注入：按 --error-rate 的比例返回503（随机种子固定）
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# 配置和缓存写到临时目录（配置文件路径由 sys.argv[0] 决定）
+data_dir = tempfile.mkdtemp(prefix="bench_fetch_")
+sys.argv[0] = os.path.join(data_dir, "bench_fetch.py")
+
+import http_cache
+from fetch_engine import FetchEngine
+from fleet import fetch_online_versions
+from services import redirect_site
+from stand_in_server import StandInServer
+
+SCENARIOS = [
+    # (名称, 缓存新鲜期, 是否预先填充缓存, gzip, 是否注入错误, 是否修改页面)
+    ("首次（gzip）", 0, False, True, False, False),
+    ("首次（不压缩）", 0, False, False, False, False),
+    ("条件请求（304）", 0, True, True, False, False),
+    ("新鲜期内", 600, True, True, False, False),
+    ("页面更新（1个）", 0, True, True, False, True),
+    ("错误注入", 0, False, True, True, False),
+]
+
+def new_cache(ttl: float):
+    """换一个空的校验信息缓存（与重新安装程序一样）"""
+    path = os.path.join(data_dir, "http_cache.json")
+    if os.path.exists(path):
+        os.remove(path)
+    http_cache._cache = http_cache.ValidatorCache(path, ttl=ttl)
+
+def run_scenario(server: StandInServer, rounds: int, ttl: float, prime: bool, gzip_enabled: bool,
+                 inject: bool, update: bool, error_rate: float) -> dict:
+    server.gzip_enabled = gzip_enabled
+    new_cache(ttl)
+    if prime:
+        fetch_online_versions(FetchEngine())
+    server.error_rate = error_rate if inject else 0.0
+    server.reset_stats()
+    timings = []
+    failures = 0
+    for round_index in range(rounds):
+        if not prime:
+            new_cache(ttl)
+        if update:
+            page = server.pages["pc-manager"]
+            server.set_page("pc-manager", page.body + f"<!-- {round_index} -->".encode())
+        start = time.perf_counter()
+        online = fetch_online_versions(FetchEngine())
+        timings.append((time.perf_counter() - start) * 1000)
+        failures += sum(1 for result in online.values() if result.get("fetch_failed"))
+    server.error_rate = 0.0
+    stats = server.stats()
+    return {"median_ms": statistics.median(timings), "requests": stats["requests"],
+            "kb_sent": stats["bytes_sent"] / 1024, "failures": failures}
+
+def main():
+    parser = argparse.ArgumentParser(description="官网版本获取在本地替身服务上的耗时")
+    parser.add_argument("--rounds", type=int, default=5, help="每种场景的重复次数")
+    parser.add_argument("--latency", type=float, default=0.1, help="每个请求的延迟（秒）")
+    parser.add_argument("--bandwidth", type=float, default=512, help="带宽限制（KB/s），0 为不限速")
+    parser.add_argument("--error-rate", type=float, default=0.3, help="错误注入场景的错误比例")
+    args = parser.parse_args()
+
+    server = StandInServer(latency=args.latency, bandwidth=args.bandwidth * 1024, seed=1)
+    redirect_site(server.start())
+    print(f"替身服务：每个请求延迟 {args.latency:g} 秒，带宽 {args.bandwidth:g} KB/s，每种场景 {args.rounds} 次")
+    print(f"{'场景':<16}{'中位(ms)':>10}{'请求数':>8}{'发送(KB)':>10}{'失败数':>8}")
+    for name, ttl, prime, gzip_enabled, inject, update in SCENARIOS:
+        stats = run_scenario(server, args.rounds, ttl, prime, gzip_enabled, inject, update, args.error_rate)
+        print(f"{name:<16}{stats['median_ms']:>10.0f}{stats['requests']:>8}{stats['kb_sent']:>10.0f}{stats['failures']:>8}")
+    server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""批量检查的吞吐量与内存占用
+
+用法：python benchmarks/bench_fleet.py [--rows 1000000] [--hosts 200000] [--format ndjson]
+
+在临时目录生成 --rows 行的清单（约 --hosts 台电脑，每台最多 3 个应用，版本号随机新旧），
+使用固定的官网版本（不访问网络）运行 fleet.run_fleet，报告写到空设备。统计：
+- 每秒处理的行数
+- 处理 1/10 清单和整个清单时的 Python 内存峰值（tracemalloc），两者应基本相同
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import fleet
+
+ONLINE = {
+    "pc_manager": {"online_version": "20.0.0.31 (SP5)", "download_url": ""},
+    "honor_workstation": {"online_version": "5.5.1.48", "download_url": ""},
+    "yoyo_assistant": {"online_version": "9.0.2.42 (SP10)", "download_url": ""},
+}
+
+def make_inventory(path: str, rows: int, hosts: int, fmt: str):
+    """生成清单文件"""
+    rnd = random.Random(1)
+    services = list(ONLINE)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            f.write("host,service,installed_version\n")
+        for i in range(rows):
+            service = services[i % len(services)]
+            base = ONLINE[service]["online_version"].split(" ")[0].split(".")
+            base[-1] = str(max(0, int(base[-1]) + rnd.randint(-30, 2)))
+            version = ".".join(base) if rnd.random() > 0.01 else ""
+            host = f"mb-{rnd.randrange(hosts):06d}"
+            if fmt == "csv":
+                f.write(f"{host},{service},{version}\n")
+            else:
+                f.write(json.dumps({"host": host, "service": service, "installed_version": version}) + "\n")
+
+def run(path: str, fmt: str, limit: int = 0, trace: bool = False) -> dict:
+    """以流方式处理清单的前 limit 行（0 为全部），trace 为真时记录内存峰值"""
+    with open(path, "r", encoding="utf-8", newline="") as inventory, open(os.devnull, "w", encoding="utf-8") as output:
+        lines = inventory if not limit else (line for _, line in zip(range(limit + (fmt == "csv")), inventory))
+        if trace:
+            tracemalloc.start()
+        start = time.perf_counter()
+        writer = fleet.run_fleet(lines, output, fmt, fmt, online=ONLINE)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace else 0
+        if trace:
+            tracemalloc.stop()
+    return {"rows": sum(writer.counts.values()), "seconds": elapsed, "peak_kb": peak / 1024, "writer": writer}
+
+def main():
+    parser = argparse.ArgumentParser(description="批量检查的吞吐量与内存占用")
+    parser.add_argument("--rows", type=int, default=1000000, help="清单行数")
+    parser.add_argument("--hosts", type=int, default=200000, help="电脑数量")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson", help="清单和报告格式")
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(prefix="bench_fleet_"), "inventory." + args.format)
+    make_inventory(path, args.rows, args.hosts, args.format)
+    size_mb = os.path.getsize(path) / 1024 / 1024
+
+    stats = run(path, args.format)
+    print(f"清单：{args.rows} 行，{size_mb:.0f} MB（{args.format}）")
+    print(f"处理耗时 {stats['seconds']:.1f} 秒，每秒 {stats['rows'] / stats['seconds']:.0f} 行")
+    print(stats["writer"].summary())
+    print()
+
+    # 内存峰值：处理 1/10 清单和整个清单（tracemalloc 会使处理变慢，不计入上面的耗时）
+    print(f"{'处理行数':>10}{'内存峰值(KB)':>14}")
+    for limit in (max(1, args.rows // 10), 0):
+        traced = run(path, args.format, limit, trace=True)
+        print(f"{traced['rows']:>10}{traced['peak_kb']:>14.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""本地版本读取的耗时与解析次数
+
+用法：python benchmarks/bench_local_versions.py [--entries 2000] [--checks 100] [--resets 20] [--registry-apps 3]
+
+模拟 --checks 次检查和 --resets 次手动版本对话框的“还原”。
+
+XML：在临时目录生成两个 product_adapter_version.xml（版本元素在前，后面是 --entries 条适配信息），对比：
+- 改动前：每次用 ET.parse 解析整个文件再查找 .//version
+- XmlVersionProvider 未命中缓存：iterparse 读到第一个 <version> 即停止
+- XmlVersionProvider 命中缓存：文件未变化，不解析
+
+注册表：用 FakeRegistryBackend 模拟 HONOR 键，--registry-apps 个应用的版本都在该键下（可重复指定），
+中途修改一次其中一个值，统计打开键和枚举值的次数（改动前每个值每次都打开一次键）。
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from local_versions import (
+    FakeRegistryBackend, WinregBackend, XmlVersionProvider, read_installed_versions, set_registry_backend
+)
+from services import installed_versions_config
+
+HONOR_KEY = r"SOFTWARE\HONOR\Hihonornote"
+
+def make_xml(path: str, version: str, entries: int):
+    """生成版本文件：版本元素在前，后面是大量适配信息"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<config>\n')
+        f.write(f"  <product><name>bench</name><version>{version}</version></product>\n  <adapters>\n")
+        for i in range(entries):
+            f.write(f'    <adapter id="{i}"><model>MagicBook-{i}</model><min>1.0.{i}</min></adapter>\n')
+        f.write("  </adapters>\n</config>\n")
+
+def parse_whole(xml_path: str):
+    """改动前的读取方式"""
+    if os.path.exists(xml_path):
+        try:
+            version_elem = ET.parse(xml_path).getroot().find(".//version")
+            if version_elem is not None:
+                return version_elem.text.strip()
+        except Exception as e:
+            return f"读取版本失败: {e}"
+    return None
+
+def time_calls(func, paths, calls: int) -> list:
+    """每次读取全部文件，返回每次的耗时（毫秒）"""
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        for path in paths:
+            func(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def bench_registry(apps: int, calls: int) -> dict:
+    """apps 个应用的版本都在 HONOR 键下，读取 calls 轮，中途修改一次其中一个值"""
+    backend = FakeRegistryBackend({HONOR_KEY: {f"App{i}Version": f"1.0.{i}" for i in range(apps)}})
+    backend.set_value(HONOR_KEY, "InstallPath", r"C:\Program Files\HONOR")
+    set_registry_backend(backend)
+    keys = [f"bench_registry_{i}" for i in range(apps)]
+    for i, key in enumerate(keys):
+        installed_versions_config[key] = {"type": "registry", "path": HONOR_KEY, "value_name": f"App{i}Version"}
+    try:
+        start = time.perf_counter()
+        for round_index in range(calls):
+            if round_index == calls // 2:
+                backend.set_value(HONOR_KEY, "App0Version", "2.0.0")
+            versions = read_installed_versions(keys)
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        for key in keys:
+            del installed_versions_config[key]
+        set_registry_backend(WinregBackend())
+    assert versions[keys[0]] == "2.0.0"
+    return {"opens_before": apps * calls, "opens": backend.opens,
+            "enumerations": backend.enumerations, "total_ms": elapsed}
+
+def main():
+    parser = argparse.ArgumentParser(description="本地版本读取的耗时与解析次数")
+    parser.add_argument("--entries", type=int, default=2000, help="版本文件中的适配信息条数")
+    parser.add_argument("--checks", type=int, default=100, help="模拟的检查次数")
+    parser.add_argument("--resets", type=int, default=20, help="模拟的对话框还原次数")
+    parser.add_argument("--registry-apps", type=int, action="append", help="版本在注册表中的应用数（可重复）")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="bench_local_versions_")
+    paths = [os.path.join(data_dir, name) for name in ("pc_manager.xml", "yoyo_assistant.xml")]
+    for path, version in zip(paths, ("20.0.0.31", "9.0.2.42")):
+        make_xml(path, version, args.entries)
+    calls = args.checks + args.resets
+
+    provider = XmlVersionProvider()
+    assert [provider.read(p) for p in paths] == [parse_whole(p) for p in paths]
+
+    def cold(path):
+        provider.invalidate()
+        return provider.read(path)
+
+    rows = [("ET.parse 整个文件", time_calls(parse_whole, paths, calls), calls * len(paths))]
+    rows.append(("iterparse（未命中）", time_calls(cold, paths, calls), calls * len(paths)))
+    provider = XmlVersionProvider()
+    rows.append(("缓存命中", time_calls(provider.read, paths, calls), provider.misses))
+
+    size_kb = os.path.getsize(paths[0]) / 1024
+    print(f"2 个版本文件，各 {size_kb:.0f} KB；{args.checks} 次检查 + {args.resets} 次还原")
+    print(f"{'方式':<20}{'中位(ms)':>10}{'总计(ms)':>10}{'解析次数':>10}")
+    for name, timings, parses in rows:
+        print(f"{name:<20}{statistics.median(timings):>10.3f}{sum(timings):>10.1f}{parses:>10}")
+    print(f"缓存统计：{provider.stats()}")
+
+    print()
+    print(f"注册表（FakeRegistryBackend）：{calls} 轮读取，中途修改一次值")
+    print(f"{'应用数':<8}{'改动前打开次数':>14}{'打开次数':>10}{'枚举次数':>10}{'总计(ms)':>10}")
+    for apps in args.registry_apps or [1, 3, 10]:
+        stats = bench_registry(apps, calls)
+        print(f"{apps:<8}{stats['opens_before']:>14}{stats['opens']:>10}{stats['enumerations']:>10}{stats['total_ms']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
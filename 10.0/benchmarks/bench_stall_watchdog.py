@@ -0,0 +1,92 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""UI线程卡顿监测的准确度与空闲时的开销
+
+用法：python benchmarks/bench_stall_watchdog.py [--threshold 100] [--seconds 3]
+
+在UI线程中依次注入已知时长的阻塞（sleep 与纯Python计算两种），对比注入的时长与监测到的卡顿时长，
+以及是否取得了阻塞位置的调用栈；再让事件循环空闲运行 --seconds 秒，对比开启与关闭监测时进程占用的CPU时间。
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# 配置写到临时目录（配置文件路径由 sys.argv[0] 决定）
+data_dir = tempfile.mkdtemp(prefix="bench_stall_watchdog_")
+sys.argv[0] = os.path.join(data_dir, "bench_stall_watchdog.py")
+
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+
+from stall_watchdog import StallWatchdog
+
+def sleep_block(seconds: float):
+    time.sleep(seconds)
+
+def busy_block(seconds: float):
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        sum(range(1000))
+
+def run_loop(app: QApplication, seconds: float):
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+
+def idle_cpu(app: QApplication, seconds: float, watchdog) -> float:
+    """事件循环空闲运行 seconds 秒占用的CPU时间（毫秒）"""
+    if watchdog is not None:
+        watchdog.start()
+    start = time.process_time()
+    run_loop(app, seconds)
+    elapsed = time.process_time() - start
+    if watchdog is not None:
+        watchdog.stop()
+    return elapsed * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="UI线程卡顿监测的准确度与空闲时的开销")
+    parser.add_argument("--threshold", type=float, default=100, help="卡顿阈值（毫秒）")
+    parser.add_argument("--seconds", type=float, default=3, help="空闲运行的时间（秒）")
+    args = parser.parse_args()
+    app = QApplication(sys.argv[:1])
+
+    # 注入的阻塞：(函数, 时长)，低于阈值的不应记为卡顿
+    blocks = [(sleep_block, 0.05), (sleep_block, 0.15), (busy_block, 0.15), (sleep_block, 0.4), (busy_block, 0.4)]
+    watchdog = StallWatchdog(args.threshold)
+    watchdog.start()
+    delay = 300
+    for func, seconds in blocks:
+        QTimer.singleShot(delay, lambda func=func, seconds=seconds: func(seconds))
+        delay += int(seconds * 1000) + 300
+    run_loop(app, delay / 1000)
+    watchdog.stop()
+
+    print(f"卡顿阈值 {args.threshold:g} 毫秒，心跳间隔 {watchdog.interval * 1000:g} 毫秒")
+    print(f"{'注入':<24}{'监测到(ms)':>12}  调用栈位置")
+    stalls = iter(watchdog.stalls())
+    for func, seconds in blocks:
+        name = f"{func.__name__} {seconds * 1000:.0f}ms"
+        if seconds * 1000 < args.threshold:
+            print(f"{name:<24}{'-':>12}  （低于阈值）")
+            continue
+        stall = next(stalls, None)
+        if stall is None:
+            print(f"{name:<24}{'未监测到':>12}")
+        else:
+            print(f"{name:<24}{stall.duration * 1000:>12.1f}  {stall.location or '（未取得）'}")
+    extra = list(stalls)
+    if extra:
+        print(f"另有 {len(extra)} 次未注入的卡顿")
+    print()
+
+    off = idle_cpu(app, args.seconds, None)
+    on = idle_cpu(app, args.seconds, StallWatchdog(args.threshold))
+    print(f"空闲 {args.seconds:g} 秒的CPU时间：关闭监测 {off:.1f} 毫秒，开启监测 {on:.1f} 毫秒"
+          f"（每秒多 {(on - off) / args.seconds:.2f} 毫秒）")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""启动时显示结果所需的时间（首次启动/有结果快照时）
+
+用法：python benchmarks/bench_startup.py [--mode normal --mode glass] [--delay 1.0] [--tree DIR]
+
+用 stand_in_server 在本地返回 fixtures/pages/ 中的页面副本（每个请求延迟 --delay 秒），
+把官网地址指向它，在临时目录中保存配置和缓存，然后连续启动两次窗口：
+- 首次启动：没有结果快照，卡片要等网络请求完成才显示
+- 再次启动：先显示上次的结果快照，后台重新检查
+统计从创建窗口到全部卡片显示结果的时间、到后台检查完成的时间，以及检查完成后内容变化的卡片数。
+--tree 指向另一份 10.0 目录（如 git worktree 中的旧版本）即可得到改动前的数据。
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+parser = argparse.ArgumentParser(description="启动时显示结果所需的时间")
+parser.add_argument("--mode", action="append", choices=["normal", "glass"], help="要测量的模式（可重复）")
+parser.add_argument("--delay", type=float, default=1.0, help="每个页面请求的延迟（秒）")
+parser.add_argument("--tree", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."),
+                    help="被测的 10.0 目录")
+args = parser.parse_args()
+
+# 页面服务总是使用本目录的 stand_in_server（被测目录可能是没有它的旧版本）
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, ROOT_DIR)
+from stand_in_server import StandInServer
+sys.path.remove(ROOT_DIR)
+
+# 配置和缓存写到临时目录（配置文件路径由 sys.argv[0] 决定）
+data_dir = tempfile.mkdtemp(prefix="bench_startup_")
+sys.argv[0] = os.path.join(data_dir, "bench_startup.py")
+with open(os.path.join(data_dir, "config.json"), "w", encoding="utf-8") as f:
+    # 校验信息缓存的新鲜期设为0，每次启动都要访问网络
+    f.write('{"http_cache_ttl": 0}')
+
+sys.path.insert(0, os.path.abspath(args.tree))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import qInstallMessageHandler
+from PySide6.QtWidgets import QApplication
+
+import mode_switch
+from services import website_config
+
+# ===== 测量 =====
+def launch(app, mode: str) -> dict:
+    """创建一个窗口，测量全部卡片显示结果和后台检查完成的时间"""
+    try:
+        import snapshot
+        snapshot._snapshot = None  # 与重新启动程序一样从磁盘读取快照
+    except ImportError:
+        pass
+    window_class = mode_switch.load_window_class(mode)
+    start = time.perf_counter()
+    window = window_class()
+    window.show()
+    cards = list(window.software_cards.values())
+    shown_states = {}
+    content_ms = None
+    done = threading.Event()
+    window.worker_bridge.check_complete.connect(done.set)
+    while not done.is_set() or window.running:
+        app.processEvents()
+        if content_ms is None and all(card.isVisible() for card in cards):
+            content_ms = (time.perf_counter() - start) * 1000
+            shown_states = dict(window.check_results)
+        time.sleep(0.001)
+    done_ms = (time.perf_counter() - start) * 1000
+    changed = sum(1 for key, state in window.check_results.items() if shown_states.get(key) != state)
+    stale_label = getattr(window, "stale_label", None)
+    stale_visible = stale_label is not None and stale_label.isVisible()
+    window.close()
+    app.processEvents()
+    return {"content_ms": content_ms, "done_ms": done_ms, "changed": changed, "stale_visible": stale_visible}
+
+def main():
+    # 屏蔽 Qt 的样式表警告，避免输出耗时计入测量
+    qInstallMessageHandler(lambda mode, context, message: None)
+    base_url = StandInServer(latency=args.delay).start()
+    for info in website_config.values():
+        info["url"] = info["url"].replace("https://www.honor.com", base_url)
+    app = QApplication(sys.argv)
+
+    print(f"被测目录：{os.path.abspath(args.tree)}，每个请求延迟 {args.delay:g} 秒")
+    print(f"{'模式':<8}{'启动':<8}{'显示结果(ms)':>14}{'检查完成(ms)':>14}{'变化卡片':>10}")
+    for mode in args.mode or ["normal", "glass"]:
+        # 每个模式都从没有快照开始
+        snapshot_path = os.path.join(data_dir, "results_snapshot.json")
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+        for name in ("首次", "再次"):
+            stats = launch(app, mode)
+            print(f"{mode:<8}{name:<8}{stats['content_ms']:>14.0f}{stats['done_ms']:>14.0f}{stats['changed']:>10}")
+            if stats["stale_visible"]:
+                print("  检查完成后仍显示快照提示")
+    print()
+    print(f"“显示结果”为从创建窗口到全部卡片显示内容的时间。临时数据目录：{data_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""主题切换与结果渲染的耗时基准
+
+用法：python benchmarks/bench_styles.py [--mode normal --mode glass] [--rounds 50] [--tree DIR]
+
+在真实窗口上测量：
+- 主题切换：调用 on_system_theme_changed 在深色/浅色之间来回切换
+- 结果渲染：调用 update_card_result 让每张卡片在各状态之间轮换
+每项给出每次操作的中位/最小耗时，以及期间 Qt 重新计算样式（StyleChange 事件）的控件数量。
+--tree 指向另一份 10.0 目录（如 git worktree 中的旧版本）即可得到改动前的数据。
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+parser = argparse.ArgumentParser(description="主题切换与结果渲染的耗时基准")
+parser.add_argument("--mode", action="append", choices=["normal", "glass"], help="要测量的模式（可重复）")
+parser.add_argument("--rounds", type=int, default=50, help="每项的重复次数")
+parser.add_argument("--tree", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."),
+                    help="被测的 10.0 目录")
+args = parser.parse_args()
+
+sys.path.insert(0, os.path.abspath(args.tree))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# 配置和缓存写到临时目录（配置文件路径由 sys.argv[0] 决定）
+data_dir = tempfile.mkdtemp(prefix="bench_styles_")
+sys.argv[0] = os.path.join(data_dir, "bench_styles.py")
+
+from PySide6.QtCore import QEvent, QObject, qInstallMessageHandler
+from PySide6.QtWidgets import QApplication
+
+import mode_switch
+from services import service_names
+
+STATUS_CYCLE = [
+    ("已是最新版本", "up_to_date"),
+    ("有更新可用", "update_available"),
+    ("检查失败", "error"),
+    ("本地版本较高", "higher_version"),
+]
+
+class StyleChangeCounter(QObject):
+    """统计 StyleChange 事件（每个事件对应一个控件重新解析/应用样式）"""
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.StyleChange:
+            self.count += 1
+        return False
+
+def make_result(index: int) -> dict:
+    """第 index 轮的检查结果"""
+    status, status_type = STATUS_CYCLE[index % len(STATUS_CYCLE)]
+    return {
+        "local_version": f"1.0.{index}",
+        "online_version": f"1.0.{index + 1}",
+        "status": status,
+        "status_type": status_type,
+        "download_url": "https://www.honor.com/cn/",
+    }
+
+def measure(app, counter, rounds: int, action) -> tuple:
+    """执行 rounds 次 action(i)，返回 (中位ms, 最小ms, 平均每次的StyleChange数)"""
+    timings = []
+    counter.count = 0
+    for i in range(rounds):
+        start = time.perf_counter()
+        action(i)
+        app.processEvents()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), min(timings), counter.count / rounds
+
+def bench_mode(app, counter, mode: str, rounds: int):
+    """在一个模式的窗口上测量主题切换与结果渲染"""
+    state = {"results": {key: make_result(0) for key in service_names}, "manual_versions": {}, "running": False}
+    window = mode_switch.load_window_class(mode)(initial_state=state)
+    window.show()
+    app.processEvents()
+
+    def switch_theme(i):
+        window.on_system_theme_changed(not window.theme_manager.is_dark_mode)
+
+    def render_results(i):
+        for key in service_names:
+            window.update_card_result(key, make_result(i + 1))
+
+    theme = measure(app, counter, rounds, switch_theme)
+    render = measure(app, counter, rounds, render_results)
+    window.close()
+    app.processEvents()
+    return theme, render
+
+def main():
+    # 屏蔽 Qt 的样式表警告（如 Unknown property box-shadow），避免输出耗时计入测量
+    qInstallMessageHandler(lambda mode, context, message: None)
+    app = QApplication(sys.argv[:1])
+    counter = StyleChangeCounter()
+    app.installEventFilter(counter)
+
+    print(f"被测目录：{os.path.abspath(args.tree)}")
+    print(f"{'模式':<8}{'操作':<10}{'中位(ms)':>10}{'最小(ms)':>10}{'样式重算/次':>12}")
+    for mode in args.mode or ["normal", "glass"]:
+        theme, render = bench_mode(app, counter, mode, args.rounds)
+        for name, (median_ms, min_ms, restyled) in (("主题切换", theme), ("结果渲染", render)):
+            print(f"{mode:<8}{name:<10}{median_ms:>10.2f}{min_ms:>10.2f}{restyled:>12.1f}")
+    print()
+    print("结果渲染一次更新全部卡片；样式重算为平均每次操作触发的 StyleChange 事件数。")
+
+if __name__ == "__main__":
+    main()
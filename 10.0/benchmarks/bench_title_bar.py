@@ -0,0 +1,106 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""标题栏取色的微基准：5次单像素截取+聚类 与 一次整行截取+向量化主色提取
+
+用法：python benchmarks/bench_title_bar.py [--repeat 200] [--screen]
+
+默认从合成的“壁纸”图像上截取，只比较截取后的转换与计算开销；
+加 --screen 时改为真实的 QScreen.grabWindow 截屏（需要在桌面环境中运行）。
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen" if "--screen" not in sys.argv else "")
+
+import numpy as np
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from title_bar_sampler import (
+    SAMPLE_PERCENTS, adjust_caption_color, cluster_colors, dominant_color, strip_pixels
+)
+
+# ===== 合成壁纸 =====
+def make_wallpapers(width: int) -> dict:
+    """生成几种典型背景的一行像素 (width, 3)"""
+    rng = np.random.default_rng(20251014)
+    x = np.linspace(0, 1, width)[:, None]
+
+    solid = np.clip(np.array([30, 31, 34]) + rng.integers(-2, 3, (width, 3)), 0, 255)
+    gradient = np.clip(np.array([9, 28, 58]) * (1 - x) + np.array([60, 90, 140]) * x, 0, 255)
+
+    # 繁杂壁纸：深蓝背景上散布多种颜色的图标和噪点
+    busy = np.clip(np.array([12, 30, 61]) + rng.integers(-6, 7, (width, 3)), 0, 255)
+    for start in range(0, width, 37):
+        busy[start:start + 9] = rng.integers(0, 256, 3)
+
+    return {"纯色": solid, "渐变": gradient, "繁杂": busy}
+
+def to_pixmap(row: np.ndarray) -> QPixmap:
+    """把一行像素转换为 QPixmap，模拟屏幕内容"""
+    data = np.ascontiguousarray(row.astype(np.uint8)[None, :, :])
+    image = QImage(data.data, data.shape[1], 1, data.shape[1] * 3, QImage.Format_RGB888)
+    return QPixmap.fromImage(image.copy())
+
+# ===== 两种取色方式 =====
+def five_point_tick(grab, width: int) -> str:
+    """原方式：5次单像素截取，Python聚类"""
+    colors = []
+    for percent in SAMPLE_PERCENTS:
+        color = grab(int(width * percent), 1).toImage().pixelColor(0, 0)
+        colors.append((color.red(), color.green(), color.blue()))
+    return adjust_caption_color(cluster_colors(colors))
+
+def strip_tick(grab, width: int) -> str:
+    """新方式：一次整行截取，向量化主色提取"""
+    return adjust_caption_color(dominant_color(strip_pixels(grab(0, width).toImage())))
+
+def time_per_call(func, repeat: int) -> float:
+    """平均每次调用的耗时（微秒）"""
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="标题栏取色微基准")
+    parser.add_argument("--repeat", type=int, default=200, help="每项的重复次数")
+    parser.add_argument("--screen", action="store_true", help="使用真实截屏")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    screen = QApplication.primaryScreen()
+
+    print(f"{'背景':<6}{'宽度':>6}{'5点(us)':>10}{'整行(us)':>10}{'1x1截屏':>10}{'整行截屏':>10}{'平衡点':>10}  5点结果 / 整行结果")
+    for width in (400, 600, 800):
+        for name, row in make_wallpapers(width).items():
+            if args.screen:
+                grab = lambda x, w: screen.grabWindow(0, x, 0, w, 1)
+            else:
+                pixmap = to_pixmap(row)
+                grab = lambda x, w, pixmap=pixmap: pixmap.copy(x, 0, w, 1)
+
+            old_us = time_per_call(lambda: five_point_tick(grab, width), args.repeat)
+            new_us = time_per_call(lambda: strip_tick(grab, width), args.repeat)
+            pixel_grab_us = time_per_call(lambda: grab(0, 1).toImage(), args.repeat)
+            strip_grab_us = time_per_call(lambda: grab(0, width).toImage(), args.repeat)
+
+            # 截屏以外的计算开销；单次截屏耗时超过平衡点时整行方式更快
+            old_compute = old_us - 5 * pixel_grab_us
+            new_compute = new_us - strip_grab_us
+            break_even = max(0.0, (new_compute - old_compute) / 4)
+            print(f"{name:<6}{width:>6}{old_us:>10.1f}{new_us:>10.1f}{pixel_grab_us:>10.1f}{strip_grab_us:>10.1f}"
+                  f"{break_even:>10.1f}  {five_point_tick(grab, width)} / {strip_tick(grab, width)}")
+
+    print()
+    print("5点/整行：每次取色的总耗时（含截屏）；平衡点：单次截屏耗时超过该值（us）时整行方式更快。")
+    if not args.screen:
+        print("未使用 --screen 时截屏只是复制内存中的图像，远低于真实截屏（从合成后的桌面读回像素）的开销。")
+    app.quit()
+
+if __name__ == "__main__":
+    main()
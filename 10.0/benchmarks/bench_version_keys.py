@@ -0,0 +1,116 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""整数键的整列比较与排序
+
+用法：python benchmarks/bench_version_keys.py [--rows 1000000] [--distinct 500] [--corpus 5000]
+
+先用回归语料（边界值、超过4段、超大段号、SP 超过127、空文本和非数字内容等 --corpus 个文本）
+检查整数键与改动前 version_tuple 的顺序完全一致：随机两两比较、与每个官网版本的整列比较、排序结果。
+
+再生成 --rows 行的本地版本列（共 --distinct 种），与一个官网版本比较并排序，对比：
+- 改动前：逐行 clean_version + version_tuple 后比较元组
+- compare_versions：逐行比较（解析结果有缓存）
+- pack_versions：把整列编码为 int64 数组
+- compare_packed：已编码的列与官网版本一次比较
+- 排序：按 version_tuple 排序与 argsort_versions
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bench_versions import old_clean_version, old_version_tuple
+from checker import compare_versions
+from optional_deps import get_numpy
+from versions import (
+    PACK_SP_BITS, UNPACKABLE, argsort_versions, compare_column, compare_packed, pack_version, pack_versions, parse_version
+)
+
+EDGE_CASES = [
+    "", "0", "1", "1.2", "1.2.0", "1.2.0.0", "1.2.0.0.0", "0.0.0.0", "16382.16382.16382.16382",
+    "16383.0.0.0", "99999", "1..2", "1.a.3", "²", "Version", "版本 5.5.1.48", "Version 20.0.0.31 (SP5C233)",
+    "20.0.0.31 (SP127)", "20.0.0.31 (SP128)", "20.0.0.31 (C233)", "9.0.2.42 (SP10)", " 9.0.2.42 ", "v1.0",
+]
+
+def old_key(text: str):
+    return old_version_tuple(old_clean_version(text or ""))
+
+def make_corpus(count: int, rnd: random.Random) -> list:
+    """回归语料：边界值加随机版本文本"""
+    corpus = list(EDGE_CASES)
+    values = [0, 1, 2, 9, 10, 99, 16381, 16382, 16383, 20000]
+    while len(corpus) < count:
+        parts = [str(rnd.choice(values) if rnd.random() < 0.3 else rnd.randint(0, 40))
+                 for _ in range(rnd.choice([1, 2, 3, 4, 4, 4, 5]))]
+        text = ".".join(parts)
+        if rnd.random() < 0.3:
+            text = f"Version {text} (SP{rnd.choice([0, 1, 5, 126, 127, 128, 300])}C{rnd.randint(1, 999)})"
+        elif rnd.random() < 0.05:
+            text += ".beta"
+        corpus.append(text)
+    return corpus
+
+def check_corpus(corpus: list, rnd: random.Random) -> dict:
+    """整数键、整列比较和排序与改动前的 version_tuple 顺序一致"""
+    packable = [text for text in corpus if pack_version(text) != UNPACKABLE]
+    pairs = 0
+    for _ in range(300000):
+        a, b = rnd.choice(packable), rnd.choice(packable)
+        ka, kb = pack_version(a) >> PACK_SP_BITS, pack_version(b) >> PACK_SP_BITS
+        assert (ka < kb) == (old_key(a) < old_key(b)) and (ka == kb) == (old_key(a) == old_key(b)), (a, b)
+        pairs += 1
+    for online in rnd.sample(corpus, 50) + EDGE_CASES:
+        expected = [(old_key(text) > old_key(online)) - (old_key(text) < old_key(online)) for text in corpus]
+        assert list(compare_column(corpus, online)) == expected, online
+    order = [packable[index] for index in argsort_versions(packable)]
+    assert all(old_key(a) <= old_key(b) for a, b in zip(order, order[1:]))
+    order = [corpus[index] for index in argsort_versions(corpus)]
+    assert all(old_key(a) <= old_key(b) for a, b in zip(order, order[1:]))
+    return {"texts": len(corpus), "unpackable": len(corpus) - len(packable), "pairs": pairs}
+
+def measure(name: str, func, rows: int):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<30}{elapsed * 1000:>10.1f}{elapsed / rows * 1e9:>12.1f}")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description="整数键的整列比较与排序")
+    parser.add_argument("--rows", type=int, default=1000000, help="本地版本列的行数")
+    parser.add_argument("--distinct", type=int, default=500, help="不同本地版本的种类数")
+    parser.add_argument("--corpus", type=int, default=5000, help="回归语料的文本数")
+    args = parser.parse_args()
+    if get_numpy() is None:
+        print("未安装 NumPy，整列比较和排序退回到逐个比较")
+
+    rnd = random.Random(1)
+    stats = check_corpus(make_corpus(args.corpus, rnd), rnd)
+    print(f"回归语料：{stats['texts']} 个文本（{stats['unpackable']} 个无法编码），"
+          f"{stats['pairs']} 次两两比较、整列比较和排序均与 version_tuple 一致")
+    print()
+
+    pool = [f"20.0.{rnd.randint(0, 9)}.{rnd.randint(1, 99)}" for _ in range(args.distinct)]
+    column = [rnd.choice(pool) for _ in range(args.rows)]
+    online = "Version 20.0.5.50 (SP5C233)"
+    online_tuple = old_key(online)
+
+    print(f"{args.rows} 行本地版本（{args.distinct} 种）与 {online!r} 比较")
+    print(f"{'方式':<30}{'总计(ms)':>10}{'每行(ns)':>12}")
+    measure("改动前：逐行 version_tuple", lambda: [old_key(text) < online_tuple for text in column], args.rows)
+    measure("compare_versions 逐行", lambda: [compare_versions(text, online) for text in column], args.rows)
+    keys = measure("pack_versions 编码整列", lambda: pack_versions(column), args.rows)
+    if get_numpy() is not None:
+        measure("compare_packed 整列（已编码）", lambda: compare_packed(keys, pack_version(online)), args.rows)
+    measure("改动前：按 version_tuple 排序", lambda: sorted(range(len(column)), key=lambda i: old_key(column[i])),
+            args.rows)
+    measure("argsort_versions", lambda: argsort_versions(column), args.rows)
+    print()
+    print(f"解析缓存：{parse_version.cache_info()}")
+    print(f"编码缓存：{pack_version.cache_info()}")
+
+if __name__ == "__main__":
+    main()
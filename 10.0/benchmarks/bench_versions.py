@@ -0,0 +1,96 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""版本号解析与比较的吞吐量
+
+用法：python benchmarks/bench_versions.py [--count 1000000] [--distinct 500]
+
+生成 --count 个版本文本（共 --distinct 种，形如官网的 "Version 20.0.0.31 (SP5C233)"
+和本地的 "20.0.0.31"），对比：
+- 改动前的比较：每次比较都对两边执行 clean_version（re.sub）和最多三次 version_tuple
+- Version.parse：不使用缓存，每个文本都完整解析一次
+- parse_version：带 LRU 缓存的解析
+- compare_versions：改动后的比较（两边都命中解析缓存）
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from checker import compare_versions
+from versions import Version, parse_version
+
+# ===== 改动前的实现 =====
+def old_version_tuple(v):
+    try:
+        return tuple(int(x) for x in v.strip().split(".") if x.isdigit())
+    except ValueError:
+        return (0,)
+
+def old_clean_version(v, remove_patch=True):
+    v = v.replace("Version", "").replace("版本", "").strip()
+    if remove_patch:
+        v = re.sub(r"\(.*?\)", "", v).strip()
+    return v
+
+def old_compare_versions(local_version, version_display):
+    version_compare = old_clean_version(version_display, remove_patch=True)
+    local_ver_compare = old_clean_version(local_version or "", remove_patch=True)
+    if not local_version:
+        return "未获取到本地版本", "error"
+    elif old_version_tuple(local_ver_compare) == old_version_tuple(version_compare):
+        return "已是最新版本", "up_to_date"
+    elif old_version_tuple(local_ver_compare) < old_version_tuple(version_compare):
+        return "有新版本可用！", "update_available"
+    else:
+        return "本地版本高于官网版本", "higher_version"
+
+# ===== 测量 =====
+def make_texts(count: int, distinct: int) -> list:
+    """生成 count 个版本文本（distinct 种，一半为官网格式，一半为本地格式）"""
+    rnd = random.Random(1)
+    pool = []
+    for i in range(distinct):
+        release = f"{rnd.randint(1, 30)}.{rnd.randint(0, 9)}.{rnd.randint(0, 9)}.{rnd.randint(1, 99)}"
+        if i % 2:
+            pool.append(f"Version {release} (SP{rnd.randint(1, 20)}C{rnd.randint(100, 999)})")
+        else:
+            pool.append(release)
+    return [pool[rnd.randrange(distinct)] for _ in range(count)]
+
+def measure(name: str, func, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        func(*item)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28}{elapsed:>10.2f}{elapsed / len(items) * 1e9:>12.0f}")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="版本号解析与比较的吞吐量")
+    parser.add_argument("--count", type=int, default=1000000, help="版本文本的数量")
+    parser.add_argument("--distinct", type=int, default=500, help="不同版本文本的种类数")
+    args = parser.parse_args()
+
+    texts = make_texts(args.count, args.distinct)
+    singles = [(text,) for text in texts]
+    pairs = list(zip(texts[::2], texts[1::2]))
+    for local, online in pairs[:1000]:
+        assert old_compare_versions(local, online) == compare_versions(local, online)
+
+    print(f"{args.count} 个版本文本（{args.distinct} 种），{len(pairs)} 次比较")
+    print(f"{'方式':<28}{'总计(s)':>10}{'每次(ns)':>12}")
+    measure("改动前：清理+转换为元组", lambda text: old_version_tuple(old_clean_version(text)), singles)
+    measure("Version.parse（无缓存）", Version.parse, singles)
+    parse_version.cache_clear()
+    measure("parse_version（LRU缓存）", parse_version, singles)
+    measure("改动前：compare_versions", old_compare_versions, pairs)
+    measure("改动后：compare_versions", compare_versions, pairs)
+    print()
+    print(f"解析缓存：{parse_version.cache_info()}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""工作线程池的取消、并入与时限
+
+用法：python benchmarks/bench_workers.py [--latency 1.0] [--clicks 5]
+
+用 stand_in_server 在本地返回页面副本（每个请求延迟 --latency 秒），对比每次检查新建线程与使用 workers 任务池：
+- 关闭窗口：检查开始 0.2 秒后关闭窗口，新建的线程无法停止，任务池中的检查被取消，记录检查结束所需的时间；
+  另在子进程中检查并在 0.2 秒后取消，记录从取消到进程退出的时间（正在进行的请求随取消关闭连接，不等读取超时）
+- 连续检查：每隔 50 毫秒发起一次检查，共 --clicks 次，记录实际执行的检查次数、官网请求数和全部结束的时间
+- 时限：任务时限为 0.3 秒，记录任务结束的时间和结果
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# 配置和缓存写到临时目录（配置文件路径由 sys.argv[0] 决定）
+data_dir = tempfile.mkdtemp(prefix="bench_workers_")
+sys.argv[0] = os.path.join(data_dir, "bench_workers.py")
+with open(os.path.join(data_dir, "config.json"), "w", encoding="utf-8") as f:
+    # 校验信息缓存的新鲜期设为0，每次检查都要访问网络
+    f.write('{"http_cache_ttl": 0}')
+
+from checker import check_services
+from fetch_engine import CancelToken, CheckCancelled, FetchEngine, new_check_budget
+from services import redirect_site, website_config
+from stand_in_server import StandInServer
+from workers import Task, WorkerPool, new_check_task
+
+def check(engine: FetchEngine, budget) -> dict:
+    return check_services(engine, list(website_config), budget=budget)
+
+def outcome(task: Task) -> str:
+    try:
+        task.result()
+    except CheckCancelled as e:
+        return f"取消（{e}）"
+    except Exception as e:
+        return f"失败（{e}）"
+    return "完成"
+
+def close_window(server: StandInServer, pool: WorkerPool, engine: FetchEngine):
+    """检查开始 0.2 秒后关闭窗口"""
+    server.reset_stats()
+    thread = threading.Thread(target=check, args=(engine, new_check_budget()), daemon=True)
+    thread.start()
+    time.sleep(0.2)
+    closed = time.perf_counter()
+    thread.join()
+    thread_ms = (time.perf_counter() - closed) * 1000
+    thread_requests = server.stats()["requests"]
+
+    server.reset_stats()
+    budget = new_check_budget()
+    task = pool.submit(new_check_task(check, (engine, budget), budget))
+    time.sleep(0.2)
+    closed = time.perf_counter()
+    task.cancel("窗口已关闭")
+    task.future.exception()
+    task_ms = (time.perf_counter() - closed) * 1000
+    print("关闭窗口后检查结束所需的时间：")
+    print(f"  新建线程  {thread_ms:>8.1f} 毫秒（线程不能停止，请求 {thread_requests} 次）")
+    print(f"  任务池    {task_ms:>8.1f} 毫秒（{outcome(task)}，请求 {server.stats()['requests']} 次）")
+
+def process_exit(base_url: str) -> float:
+    """子进程中检查 0.2 秒后取消，返回从取消到子进程退出的时间（毫秒）"""
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), "--exit-child", base_url],
+                            capture_output=True, text=True, check=True).stdout
+    exited = time.time()
+    return (exited - float(output.split()[-1])) * 1000
+
+def exit_child(base_url: str):
+    """（子进程）开始检查，0.2 秒后取消并退出"""
+    redirect_site(base_url)
+    engine = FetchEngine()
+    pool = WorkerPool()
+    budget = new_check_budget()
+    task = pool.submit(new_check_task(check, (engine, budget), budget))
+    time.sleep(0.2)
+    print(time.time(), flush=True)
+    task.cancel("窗口已关闭")
+    pool.shutdown()
+
+def rapid_clicks(server: StandInServer, pool: WorkerPool, engine: FetchEngine, clicks: int):
+    """每隔 50 毫秒发起一次检查"""
+    print(f"连续发起 {clicks} 次检查：")
+    print(f"  {'方式':<14}{'执行':>6}{'完成':>6}{'请求':>6}{'全部结束(ms)':>14}")
+
+    server.reset_stats()
+    start = time.perf_counter()
+    threads = []
+    for _ in range(clicks):
+        thread = threading.Thread(target=check, args=(engine, new_check_budget()), daemon=True)
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join()
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"  {'新建线程':<14}{clicks:>6}{clicks:>6}{server.stats()['requests']:>6}{elapsed:>14.1f}")
+
+    for name, replace in (("任务池（并入）", False), ("任务池（取代）", True)):
+        server.reset_stats()
+        start = time.perf_counter()
+        tasks = []
+        for _ in range(clicks):
+            budget = new_check_budget()
+            task = pool.submit(new_check_task(check, (engine, budget), budget), replace=replace)
+            if task not in tasks:
+                tasks.append(task)
+            time.sleep(0.05)
+        for task in tasks:
+            task.future.exception()
+        elapsed = (time.perf_counter() - start) * 1000
+        completed = sum(outcome(task) == "完成" for task in tasks)
+        print(f"  {name:<14}{len(tasks):>6}{completed:>6}{server.stats()['requests']:>6}{elapsed:>14.1f}")
+
+def timeout(pool: WorkerPool, engine: FetchEngine):
+    """任务时限为 0.3 秒"""
+    budget = new_check_budget(CancelToken())
+    task = Task(check, (engine, budget), name="check", timeout=0.3, token=budget.cancel_token)
+    start = time.perf_counter()
+    pool.submit(task)
+    task.future.exception()
+    print(f"时限 0.3 秒：{(time.perf_counter() - start) * 1000:.1f} 毫秒后结束，{outcome(task)}")
+
+def main():
+    parser = argparse.ArgumentParser(description="工作线程池的取消、并入与时限")
+    parser.add_argument("--latency", type=float, default=1.0, help="每个请求的延迟（秒）")
+    parser.add_argument("--clicks", type=int, default=5, help="连续发起检查的次数")
+    parser.add_argument("--exit-child", metavar="URL", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.exit_child:
+        exit_child(args.exit_child)
+        return
+
+    server = StandInServer(latency=args.latency)
+    base_url = server.start()
+    redirect_site(base_url)
+    engine = FetchEngine()
+    pool = WorkerPool()
+    print(f"替身服务每个请求延迟 {args.latency:g} 秒")
+    close_window(server, pool, engine)
+    print(f"  取消后进程退出 {process_exit(base_url):>8.1f} 毫秒")
+    print()
+    rapid_clicks(server, pool, engine, args.clicks)
+    print()
+    timeout(pool, engine)
+    pool.shutdown()
+    server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""基于 python -X importtime 的启动导入耗时报告
+
+用法：python benchmarks/importtime_report.py [--mode normal --mode glass] [--budget-ms 600] [--top 15]
+
+对每个模式在新进程中执行 main.load_window_class(mode)（即启动到创建窗口前的全部导入），
+按顶层包汇总导入耗时，并检查：
+- 总导入耗时是否超出预算
+- 是否导入了应在首次检查时才加载的模块（requests、bs4 等）或另一个模式的窗口模块
+任一项不满足时以非零状态退出。
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+APP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# 启动阶段不应导入的模块
+DEFERRED_MODULES = ["requests", "urllib3", "bs4", "lxml"]
+WINDOW_MODULES = {"normal": "main_normal", "glass": "main_transparency"}
+
+# ===== 采集 =====
+def collect(mode: str) -> List[Tuple[str, int, int, int]]:
+    """在新进程中导入指定模式，返回 [(模块名, 自身耗时us, 累计耗时us, 层级)]"""
+    code = f"import main; main.load_window_class({mode!r})"
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=APP_DIR, env=env, capture_output=True, text=True, encoding="utf-8", errors="replace"
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{mode} 模式导入失败：\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        level = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), level))
+    return rows
+
+# ===== 汇总 =====
+def summarize(rows: List[Tuple[str, int, int, int]]) -> Dict[str, int]:
+    """按顶层包汇总各模块自身的导入耗时（子模块计入所属的顶层包）"""
+    totals: Dict[str, int] = {}
+    for name, self_us, _, _ in rows:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return totals
+
+def report(mode: str, budget_ms: float, top: int) -> bool:
+    """打印单个模式的报告，返回是否满足预算与延迟加载要求"""
+    rows = collect(mode)
+    imported = {name for name, _, _, _ in rows}
+    totals = summarize(rows)
+    total_ms = sum(totals.values()) / 1000
+
+    print(f"===== {mode} 模式：导入 {len(rows)} 个模块，共 {total_ms:.1f} ms（预算 {budget_ms:.0f} ms） =====")
+    for package, self_us in sorted(totals.items(), key=lambda item: -item[1])[:top]:
+        print(f"{self_us / 1000:>10.1f} ms  {package}")
+
+    ok = total_ms <= budget_ms
+    if not ok:
+        print(f"超出预算 {total_ms - budget_ms:.1f} ms")
+
+    unexpected = [m for m in DEFERRED_MODULES if m in imported]
+    unexpected += [m for other, m in WINDOW_MODULES.items() if other != mode and m in imported]
+    if unexpected:
+        ok = False
+        print("启动时不应导入：" + "、".join(unexpected))
+    print()
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="启动导入耗时报告")
+    parser.add_argument("--mode", action="append", choices=sorted(WINDOW_MODULES),
+                        help="只检查指定模式（可重复指定）")
+    parser.add_argument("--budget-ms", type=float, default=600, help="单个模式的导入耗时预算（毫秒）")
+    parser.add_argument("--top", type=int, default=15, help="显示耗时最多的顶层模块数量")
+    args = parser.parse_args()
+
+    results = [report(mode, args.budget_ms, args.top) for mode in (args.mode or ["normal", "glass"])]
+    sys.exit(0 if all(results) else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""自动检查调度的机群模拟（不访问网络）
+
+用法：python benchmarks/simulate_scheduler.py [--laptops 2000] [--days 21] [--interval 1] [--outage-hours 6]
+
+用 FakeClock 模拟大量电脑同时开机（如系统更新后统一重启）后的自动检查：
+- 首次检查之后，每分钟访问官网的峰值次数（有/无随机推迟）
+- 官网故障期间的重试次数（指数退避/固定每 5 分钟重试）
+"""
+
+import argparse
+import heapq
+import os
+import random
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import scheduler
+from scheduler import CheckScheduler, FakeClock
+
+def simulate(laptops: int, days: int, interval: int, outage: float, jitter: bool, backoff: bool) -> dict:
+    """模拟 days 天（按到期时间依次处理），返回首次检查之后每分钟请求数的峰值、故障期间的请求数和总请求数"""
+    clock = FakeClock(0)
+    rand = random.Random(1).random if jitter else (lambda: 0.0)
+    config = {"check_interval": interval}
+    schedulers = [CheckScheduler(clock=clock.time, rand=rand, load=lambda: dict(config), save=lambda **kw: None)
+                  for _ in range(laptops)]
+    # 故障从第一次定期检查到期时开始
+    outage_start = scheduler.interval_seconds(interval)
+    outage_end = outage_start + outage
+    end = days * 24 * 3600
+
+    per_minute = Counter()
+    outage_requests = 0
+    total = 0
+    queue = [(item.due_time(), index) for index, item in enumerate(schedulers)]
+    heapq.heapify(queue)
+    while queue and queue[0][0] < end:
+        due, index = heapq.heappop(queue)
+        item = schedulers[index]
+        clock.now = due
+        if item.poll():
+            if due > 0:
+                per_minute[int(due // 60)] += 1
+            total += 1
+            ok = not (outage_start <= due < outage_end)
+            outage_requests += not ok
+            item.record_check(ok)
+            if not ok and not backoff:
+                # 对照：失败后固定每 RETRY_BASE 秒重试
+                item.next_check_time = due + scheduler.RETRY_BASE
+        heapq.heappush(queue, (item.due_time(), index))
+    return {"peak": max(per_minute.values(), default=0), "outage_requests": outage_requests, "total": total}
+
+def main():
+    parser = argparse.ArgumentParser(description="自动检查调度的机群模拟")
+    parser.add_argument("--laptops", type=int, default=2000, help="电脑数量")
+    parser.add_argument("--days", type=int, default=21, help="模拟天数")
+    parser.add_argument("--interval", type=int, default=1, help="check_interval 下标（0 每小时 … 3 每周）")
+    parser.add_argument("--outage-hours", type=float, default=6, help="官网故障时长（小时）")
+    args = parser.parse_args()
+
+    outage = args.outage_hours * 3600
+    print(f"{args.laptops} 台电脑同时开机，间隔 {scheduler.CHECK_INTERVALS[args.interval][0]}，"
+          f"第一次定期检查时官网故障 {args.outage_hours:g} 小时，模拟 {args.days} 天")
+    print(f"{'方案':<20}{'每分钟峰值':>10}{'故障期请求':>10}{'总请求':>10}")
+    for name, jitter, backoff in (("无随机推迟/固定重试", False, False),
+                                  ("随机推迟/固定重试", True, False),
+                                  ("随机推迟/指数退避", True, True)):
+        stats = simulate(args.laptops, args.days, args.interval, outage, jitter, backoff)
+        print(f"{name:<20}{stats['peak']:>10}{stats['outage_requests']:>10}{stats['total']:>10}")
+    print()
+    print("每分钟峰值不含同时开机时的首次检查。")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""系统主题监听的模拟（不依赖 Windows 注册表）
+
+用法：python benchmarks/simulate_theme_watcher.py [--rounds 200]
+
+用 FakeThemeBackend 代替注册表变更通知，在后台线程中模拟系统设置的变化，
+ThemeWatcher 的回调与窗口中一样把主题排队交给UI线程（这里用队列代替Qt的事件队列），逐项核对UI线程收到的主题：
+- 设置未变化的通知（如更换壁纸、强调色）不发出变化
+- 每次深色/浅色切换恰好发出一次，顺序与切换顺序一致
+- 两次切换合并为一次通知（切换后又切回）时不发出变化
+- stop 之后的通知不再处理
+最后输出每次通知的平均处理时间。任何一项不符时以非零状态退出。
+"""
+
+import argparse
+import os
+import queue
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from theme_watcher import FakeThemeBackend, ThemeWatcher
+
+def drive(backend: FakeThemeBackend, rounds: int) -> list:
+    """（后端线程）模拟系统设置的变化，返回应当发出的主题变化"""
+    expected = []
+    for _ in range(rounds):
+        # 与主题无关的设置变化
+        backend.notify()
+        # 切换主题
+        backend.set_dark_mode(not backend.is_dark_mode)
+        expected.append(backend.is_dark_mode)
+        backend.notify()
+        # 切换后又切回，只收到一次通知
+        backend.is_dark_mode = not backend.is_dark_mode
+        backend.set_dark_mode(not backend.is_dark_mode)
+    return expected
+
+def main():
+    parser = argparse.ArgumentParser(description="系统主题监听的模拟")
+    parser.add_argument("--rounds", type=int, default=200, help="模拟的轮数（每轮4次通知、1次主题切换）")
+    args = parser.parse_args()
+
+    backend = FakeThemeBackend(is_dark_mode=False)
+    # 代替UI线程的事件队列：回调在后端线程中排队，由主线程依次处理
+    events = queue.Queue()
+    callback_threads = set()
+
+    def on_theme_changed(is_dark_mode: bool):
+        callback_threads.add(threading.current_thread().name)
+        events.put(is_dark_mode)
+
+    watcher = ThemeWatcher(on_theme_changed, backend=backend, read_theme=backend.read)
+    watcher.start()
+
+    result = {}
+
+    def run():
+        start = time.perf_counter()
+        result["expected"] = drive(backend, args.rounds)
+        result["elapsed"] = time.perf_counter() - start
+        watcher.stop()
+        # stop 之后的通知不再处理
+        backend.set_dark_mode(not backend.is_dark_mode)
+        events.put(None)
+
+    thread = threading.Thread(target=run, name="theme-driver")
+    thread.start()
+    received = []
+    for is_dark_mode in iter(events.get, None):
+        received.append(is_dark_mode)
+    thread.join()
+
+    expected = result["expected"]
+    stats = watcher.stats()
+    checks = [
+        ("UI线程收到的主题与切换顺序一致", received == expected),
+        ("每次切换恰好一次变化", stats["changes"] == len(expected)),
+        ("回调都在后端通知的线程中执行", callback_threads <= {"theme-driver"}),
+        ("stop 之后不再处理通知", stats["notifications"] == args.rounds * 4 and not backend.running),
+    ]
+    print(f"后端 {stats['backend']}：通知 {stats['notifications']} 次，主题变化 {stats['changes']} 次，"
+          f"UI线程收到 {len(received)} 次")
+    for name, ok in checks:
+        print(f"{'通过' if ok else '失败'}  {name}")
+    print(f"每次通知平均处理 {result['elapsed'] / stats['notifications'] * 1e6:.1f} 微秒（含读取主题）")
+    if not all(ok for _, ok in checks):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
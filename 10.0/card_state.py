@@ -0,0 +1,54 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+from typing import NamedTuple, Optional, Tuple, Union
+
+# 显示“更新链接”按钮的状态
+LINK_STATUS_TYPES = ("update_available", "higher_version")
+
+# ===== 卡片显示状态 =====
+class CardState(NamedTuple):
+    """软件卡片的显示状态（不可变）
+
+    由检查结果生成，经 WorkerBridge.update_result 发送到UI线程。卡片保存上一次的状态，
+    只更新与新状态不同的字段。
+    """
+    local_version: str = "未知"
+    online_version: str = "未知"
+    status: str = ""
+    status_type: str = ""
+    download_url: str = ""
+    fetch_failed: bool = False  # 本次请求失败或超出时间预算（显示的是缓存的官网版本或检查失败）
+
+    @classmethod
+    def from_result(cls, result: dict) -> "CardState":
+        """由检查结果字典生成显示状态（版本号为空时显示“未知”）"""
+        return cls(
+            local_version=result.get("local_version") or "未知",
+            online_version=result.get("online_version") or "未知",
+            status=result.get("status", ""),
+            status_type=result.get("status_type", ""),
+            download_url=result.get("download_url") or "",
+            fetch_failed=bool(result.get("fetch_failed"))
+        )
+
+    @property
+    def show_link(self) -> bool:
+        """是否显示链接按钮"""
+        return self.status_type in LINK_STATUS_TYPES and bool(self.download_url)
+
+    @property
+    def link_text(self) -> str:
+        """链接按钮的文字"""
+        return "官网链接" if self.status_type == "higher_version" else "更新链接"
+
+    def changed_fields(self, previous: Optional["CardState"]) -> Tuple[str, ...]:
+        """与上一次状态相比发生变化的字段（没有上一次状态时为全部字段）"""
+        if previous is None:
+            return self._fields
+        return tuple(name for name, old, new in zip(self._fields, previous, self) if old != new)
+
+def as_card_state(value: Union[CardState, dict]) -> CardState:
+    """统一为 CardState（兼容检查结果字典）"""
+    if isinstance(value, CardState):
+        return value
+    return CardState.from_result(value)
@@ -0,0 +1,212 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import math
+from typing import List, Optional
+
+import tracing
+from card_state import CardState, as_card_state
+from checker import check_failed, check_services
+from fetch_engine import CheckBudget, new_check_budget
+from scheduler import get_scheduler
+from services import service_names
+from snapshot import get_result_snapshot, stale_text
+from workers import Task, get_worker_pool, new_check_task
+from PySide6.QtCore import QTimer
+
+# ===== 检查与结果显示（普通模式与通透模式窗口共用） =====
+class CheckWindowMixin:
+    """窗口的检查流程：发起检查、在工作线程中检查、更新进度和卡片、显示快照结果、切换模式时导出和恢复状态
+
+    窗口类同时继承 QWidget，在 __init__ 中先调用 _init_check_state，并提供：
+    - 控件：check_button、progress_frame、progress_bar、progress_label、placeholder_label、stale_label，
+      software_cards（应用键到卡片，卡片有 apply_state）
+    - worker_bridge（update_progress、update_result、check_complete 连接到本类的同名处理方法）
+    - session_manager、fetch_engine
+    """
+    def _init_check_state(self):
+        """初始化检查相关的状态"""
+        self.running = False
+        # 手动设置的版本号
+        self.manual_versions = {}
+        # 最近一次检查的结果（切换模式时带到新窗口）
+        self.check_results = {}
+        # 显示的快照结果中尚未刷新的应用，及其最早的检查时间
+        self.stale_keys = set()
+        self.stale_since = None
+        # 检查的时间预算（检查期间在进度文字后显示剩余时间）和正在进行的检查任务
+        self.check_budget = None
+        self.check_worker = None
+        self.progress_value = 0
+        self.progress_message = ""
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(250)
+        self.progress_timer.timeout.connect(self._refresh_progress)
+    
+    def run_manual_check(self) -> Task:
+        """用户点击“检查更新”：每个页面都向官网确认（发送条件请求），不使用新鲜期内的缓存"""
+        return self.run_check(revalidate=True)
+    
+    def run_check(self, revalidate: bool = False) -> Task:
+        """运行更新检查，返回执行检查的任务
+
+        检查进行中时不再发起新的检查，返回正在进行的任务（调用方可等待其结果或在其结束时收到 check_complete）。
+        自动检查使用新鲜期内的页面缓存，revalidate 为真时（手动检查）每个页面都发送条件请求。
+        """
+        if self.running:
+            return self.check_worker
+        
+        self.running = True
+        get_scheduler().record_started()
+        self.check_button.setEnabled(False)
+        self.check_button.setText("正在检查...")
+        
+        # 显示进度条区域
+        self.progress_frame.setVisible(True)
+        self.check_budget = new_check_budget(revalidate=revalidate)
+        self.update_progress(0, "准备检查更新...")
+        self.progress_timer.start()
+        
+        # 隐藏占位符，显示所有选中的卡片
+        self.placeholder_label.setVisible(False)
+        self._update_stale_label()
+        
+        # 检查所有服务
+        selected_services = list(service_names.keys())
+        
+        # 在工作线程池中检查：取代其他窗口或后台正在进行的检查（其已完成的页面直接命中缓存），
+        # 关闭窗口时取消；任务结束（含失败和取消）时通过 check_complete 通知UI线程
+        task = new_check_task(self.check_task, (selected_services, self.check_budget), self.check_budget)
+        task.add_done_callback(self.worker_bridge.check_complete.emit)
+        self.check_worker = get_worker_pool().submit(task, replace=True)
+        return self.check_worker
+    
+    @tracing.traced()
+    def check_task(self, services: List[str], budget: Optional[CheckBudget] = None) -> dict:
+        """更新检查的具体任务：并发请求官网页面，按完成顺序发送结果（超出时间预算的应用使用缓存的结果）
+
+        在工作线程池中执行，返回全部结果；检查被取消时抛出 CheckCancelled，不再发送结果和记录检查。
+        """
+        budget = budget or new_check_budget()
+        total_services = len(services)
+        if total_services == 0:
+            return {}
+        
+        self.worker_bridge.update_progress.emit(0, f"正在检查 {total_services} 个应用...")
+        
+        # 等待后台预连接完成，避免与首次检查重复建立连接
+        with tracing.span("wait_ready"):
+            self.session_manager.wait_ready(timeout=min(3, budget.remaining()))
+        budget.raise_if_cancelled()
+        
+        # 按完成顺序更新卡片和进度
+        completed = 0
+        
+        def on_result(key: str, result: dict):
+            nonlocal completed
+            completed += 1
+            # 发送显示状态到UI线程
+            self.worker_bridge.update_result.emit(key, CardState.from_result(result))
+            self.worker_bridge.update_progress.emit(
+                int(completed / total_services * 100),
+                f"{service_names[key]} 检查完成 ({completed}/{total_services})"
+            )
+        
+        with tracing.span("check_services", services=len(services)):
+            results = check_services(self.fetch_engine, services, self.manual_versions, on_result, budget)
+        
+        # 记录本次检查，自动检查据此计算下次检查时间（失败时退避重试）
+        with tracing.span("record_check"):
+            get_scheduler().record_check(not check_failed(results))
+        
+        # 更新进度为100%（检查完成由任务结束时的 check_complete 通知UI线程）
+        self.worker_bridge.update_progress.emit(100, "检查完成")
+        return results
+    
+    def on_check_complete(self, task: Optional[Task] = None):
+        """检查完成后的处理（已被取代的检查任务直接忽略）"""
+        if task is not self.check_worker:
+            return
+        self.check_worker = None
+        self.running = False
+        self.progress_timer.stop()
+        self.check_budget = None
+        self.check_button.setEnabled(True)
+        self.check_button.setText("检查更新")
+        
+        # 隐藏进度条
+        self.progress_frame.setVisible(False)
+        self._update_stale_label()
+    
+    def update_progress(self, value: int, message: str):
+        """更新进度条"""
+        self.progress_value = value
+        self.progress_message = message
+        self._refresh_progress()
+    
+    def _refresh_progress(self):
+        """显示进度：检查期间进度不低于已用时间的比例，并在文字后显示剩余时间"""
+        value, message = self.progress_value, self.progress_message
+        budget = self.check_budget
+        if self.running and budget is not None and value < 100:
+            value = max(value, min(99, int(budget.fraction_used() * 100)))
+            message = f"{message}（最多还需 {math.ceil(budget.remaining())} 秒）"
+        self.progress_bar.setValue(value)
+        self.progress_label.setText(message)
+    
+    def update_card_result(self, service_key: str, state: CardState):
+        """更新卡片显示结果（只更新发生变化的字段）"""
+        state = as_card_state(state)
+        self.check_results[service_key] = state
+        if service_key in self.software_cards:
+            card = self.software_cards[service_key]
+            card.setVisible(True)
+            card.apply_state(state)
+        # 使用缓存或检查失败的结果不算刷新，仍提示上次的检查时间
+        if service_key in self.stale_keys and not state.fetch_failed:
+            self.stale_keys.discard(service_key)
+            self._update_stale_label()
+    
+    def show_snapshot(self):
+        """先显示上次保存的检查结果，并标注结果的检查时间"""
+        snapshot = get_result_snapshot()
+        states = {key: state for key, state in snapshot.states().items() if key in self.software_cards}
+        if not states:
+            return
+        self.placeholder_label.setVisible(False)
+        for key, state in states.items():
+            self.update_card_result(key, state)
+        self.stale_keys = set(states)
+        self.stale_since = snapshot.checked_at(states)
+        self._update_stale_label()
+    
+    def _update_stale_label(self):
+        """更新快照结果提示，全部卡片都换成本次检查成功获取的结果后隐藏"""
+        if self.stale_keys and self.stale_since:
+            self.stale_label.setText(stale_text(self.stale_since, refreshing=self.running))
+            self.stale_label.setVisible(True)
+        else:
+            self.stale_label.setVisible(False)
+    
+    def export_state(self) -> dict:
+        """导出切换模式时带到新窗口的状态"""
+        return {
+            "results": dict(self.check_results),
+            "manual_versions": dict(self.manual_versions),
+            "running": self.running,
+            "revalidate": self.running and self.check_budget is not None and self.check_budget.revalidate,
+            "stale_keys": set(self.stale_keys),
+            "stale_since": self.stale_since
+        }
+    
+    def restore_state(self, state: dict):
+        """恢复从另一个模式窗口带来的状态"""
+        self.manual_versions = dict(state.get("manual_versions", {}))
+        for key, result in state.get("results", {}).items():
+            self.update_card_result(key, result)
+        # 原窗口中尚未刷新的快照结果
+        self.stale_keys = set(state.get("stale_keys", ()))
+        self.stale_since = state.get("stale_since")
+        self._update_stale_label()
+        if state.get("running") or not self.check_results:
+            # 原窗口的检查尚未完成，重新检查（已完成的页面直接命中缓存）
+            self.run_check(revalidate=bool(state.get("revalidate")))
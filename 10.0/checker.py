@@ -0,0 +1,249 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import diagnostics
+import tracing
+from card_state import CardState
+from extractors import get_extractor
+from fetch_engine import CONNECT_TIMEOUT, READ_TIMEOUT, CheckBudget
+from http_cache import get_validator_cache
+from http_session import get_session, probe_network
+from local_versions import read_installed_version, read_installed_versions
+from services import website_config
+from snapshot import get_result_snapshot
+from versions import display_version, parse_version
+
+# ===== 版本比较 =====
+# 本地版本与官网版本比较的结果（低于为 -1，相同为 0，高于为 1）对应的 (状态文本, 状态类型)
+COMPARE_STATUS = {
+    -1: ("有新版本可用！", "update_available"),
+    0: ("已是最新版本", "up_to_date"),
+    1: ("本地版本高于官网版本", "higher_version")
+}
+
+def compare_versions(local_version: Optional[str], version_display: str) -> Tuple[str, str]:
+    """比较本地版本与官网版本，返回 (状态文本, 状态类型)
+
+    只比较数字部分（Version.release），本地版本文件中通常没有官网显示的补丁号。
+    """
+    if not local_version:
+        return "未获取到本地版本", "error"
+    local = parse_version(local_version).release
+    online = parse_version(version_display).release
+    return COMPARE_STATUS[(local > online) - (local < online)]
+
+# ===== 单个应用的检查 =====
+def error_result(local_version: Optional[str], error: Exception, url: str = "") -> dict:
+    """生成检查失败时的结果"""
+    return {
+        "local_version": local_version or "",
+        "online_version": "获取失败",
+        "status": f"检查失败: {str(error)[:30]}...",
+        "status_type": "error",
+        "download_url": url,
+        "fetch_failed": True  # 请求或解析过程出错（区别于未获取到本地版本等结果）
+    }
+
+def fetch_version_text(info: dict, timeout: Optional[Tuple[float, float]] = None,
+                       revalidate: bool = False) -> Optional[str]:
+    """获取官网页面中版本元素的文本，未找到时返回 None
+
+    优先使用校验信息缓存：新鲜期内不发送请求（revalidate 为真时除外，用于手动检查）；
+    其余情况发送条件请求，服务器返回304时直接复用上次的提取结果，不再下载和解析页面。
+    需要下载时按 info["extractor"] 指定的方式提取，默认边下载边解析，版本元素闭合后立即停止读取。
+    timeout 为 (连接超时, 读取超时)，默认为 (CONNECT_TIMEOUT, READ_TIMEOUT)。
+    """
+    url = info["url"]
+    cache = get_validator_cache()
+    entry = cache.get(url)
+    if not revalidate and cache.is_fresh(entry):
+        return entry["text"]
+
+    # 以流式方式请求，流式提取时找到版本元素后即停止下载
+    session = get_session()
+    with diagnostics.stage("ttfb", exclude=("dns", "connect", "tls")):
+        res = session.get(url, headers=cache.conditional_headers(entry),
+                          timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT), stream=True)
+    try:
+        if res.status_code == 304 and entry:
+            cache.revalidated(url)
+            return entry["text"]
+        res.raise_for_status()
+        text = get_extractor(info.get("extractor")).extract_response(res, info["selector"])
+    finally:
+        res.close()
+
+    cache.store(url, res.headers.get("ETag"), res.headers.get("Last-Modified"), text)
+    return text
+
+def fetch_online(info: Optional[dict], timeout: Optional[Tuple[float, float]] = None,
+                 revalidate: bool = False) -> dict:
+    """请求官网页面获取最新版本（不与本地版本比较）
+
+    返回 online_version / download_url；配置不存在或未找到版本时同时带有 status / status_type。
+    """
+    if not info:
+        # 配置不存在
+        return {
+            "online_version": "配置不存在",
+            "status": "配置错误",
+            "status_type": "error",
+            "download_url": ""
+        }
+
+    return online_from_text(info, fetch_version_text(info, timeout, revalidate))
+
+def online_from_text(info: dict, latest_version_text: Optional[str]) -> dict:
+    """由页面中版本元素的文本生成 fetch_online 的结果"""
+    if latest_version_text is None:
+        # 未找到版本信息
+        return {
+            "online_version": "未找到",
+            "status": "未找到官网版本",
+            "status_type": "error",
+            "download_url": info["url"]
+        }
+
+    return {
+        "online_version": display_version(latest_version_text.split("|")[0], remove_patch=False),
+        "download_url": info["url"]
+    }
+
+def classify(local_version: Optional[str], online: dict) -> dict:
+    """用 fetch_online 的结果和本地版本生成检查结果（官网版本未知时直接沿用其状态）"""
+    if "status_type" in online:
+        return {"local_version": local_version, **online}
+    status, status_type = compare_versions(local_version, online["online_version"])
+    return {
+        "local_version": local_version,
+        "online_version": online["online_version"],
+        "status": status,
+        "status_type": status_type,
+        "download_url": online["download_url"]
+    }
+
+def check_online(info: Optional[dict], local_version: Optional[str],
+                 timeout: Optional[Tuple[float, float]] = None, revalidate: bool = False) -> dict:
+    """请求官网页面获取最新版本，并与本地版本比较"""
+    online = fetch_online(info, timeout, revalidate)
+    with diagnostics.stage("compare"):
+        return classify(local_version, online)
+
+def cached_result(key: str, local_version: Optional[str], reason: str,
+                  error: Optional[Exception] = None) -> dict:
+    """无法请求官网时的结果：用缓存中上次获取的官网版本比较，没有缓存时为检查失败（显示 error）
+
+    两种情况都记为 fetch_failed（不写入结果快照，自动检查按失败退避重试）。
+    """
+    info = website_config.get(key)
+    url = info["url"] if info else ""
+    entry = get_validator_cache().get(url) if info else None
+    if not entry or not entry.get("text"):
+        return error_result(local_version, error or TimeoutError(reason), url)
+    result = classify(local_version, online_from_text(info, entry["text"]))
+    result["status"] = f"{result['status']}（{reason}，使用缓存）"
+    result["fetch_failed"] = True
+    return result
+
+def is_timeout(error: Exception) -> bool:
+    """是否为连接或读取超时"""
+    import requests
+
+    return isinstance(error, (TimeoutError, requests.exceptions.Timeout))
+
+# ===== 一次完整的检查 =====
+def check_service(key: str, manual_versions: Optional[dict] = None,
+                  installed_versions: Optional[dict] = None, budget: Optional[CheckBudget] = None) -> dict:
+    """检查单个应用：读取本地版本（优先使用手动设置的版本号）并与官网版本比较
+
+    installed_versions 为预先批量读取的本地版本（见 local_versions.read_installed_versions），
+    budget 为本次检查的时间预算（请求超时不超过剩余时间，budget.revalidate 时不使用新鲜期内的缓存）。
+    """
+    local_version = None
+    try:
+        if manual_versions and manual_versions.get(key):
+            local_version = manual_versions[key]
+        elif installed_versions is not None and key in installed_versions:
+            local_version = installed_versions[key]
+        else:
+            with diagnostics.stage("local"):
+                local_version = read_installed_version(key)
+
+        # 请求官网页面获取最新版本
+        return check_online(website_config.get(key), local_version, budget.timeout() if budget else None,
+                            budget is not None and budget.revalidate)
+    except Exception as e:
+        if budget is not None:
+            # 有时间预算时（窗口和自动检查），请求超时或失败都先使用缓存的官网版本
+            return cached_result(key, local_version, "检查超时" if budget.expired() or is_timeout(e) else "请求失败", e)
+        # 发生错误
+        return error_result(local_version, e, website_config.get(key, {}).get("url", ""))
+
+def check_services(fetch_engine, services: Iterable[str], manual_versions: Optional[dict] = None,
+                   on_result: Optional[Callable[[str, dict], None]] = None,
+                   budget: Optional[CheckBudget] = None) -> Dict[str, dict]:
+    """用抓取引擎并发检查多个应用，按完成顺序回调 on_result，返回全部结果（不依赖窗口）
+
+    成功的结果同时记入结果快照，下次启动时先显示快照中的结果；各应用各阶段的耗时记入检查耗时历史。
+    有时间预算时先快速探测网络：确定无法访问官网时立即以缓存的结果（见 cached_result）结束全部应用；
+    预算用完时，尚未完成的应用同样使用缓存的结果。预算的取消标记被取消时抛出 CheckCancelled（不记入检查耗时历史）。
+    """
+    results: Dict[str, dict] = {}
+    snapshot = get_result_snapshot()
+    check = diagnostics.CheckTimings() if diagnostics.timings_enabled() else None
+
+    def collect(key: str, result: dict):
+        results[key] = result
+        if not result.get("fetch_failed") and not (manual_versions or {}).get(key):
+            snapshot.record(key, CardState.from_result(result))
+        if on_result is not None:
+            on_result(key, result)
+
+    services = list(services)
+    # 先批量读取本地版本，同一注册表键只打开一次（每个应用的读取耗时都记为整批的耗时）
+    local_keys = [key for key in services if not (manual_versions or {}).get(key)]
+    start = time.perf_counter()
+    installed_versions = read_installed_versions(local_keys)
+    if check is not None:
+        elapsed = time.perf_counter() - start
+        for key in local_keys:
+            check.service(key).add("local", elapsed)
+
+    def task(key: str) -> dict:
+        with tracing.span("check_service", "check", service=key), \
+                diagnostics.recording(check.service(key) if check is not None else None):
+            return check_service(key, manual_versions, installed_versions, budget)
+
+    def local_version(key: str) -> Optional[str]:
+        return (manual_versions or {}).get(key) or installed_versions.get(key)
+
+    jobs = [(key, website_config.get(key, {}).get("url", "")) for key in services]
+    try:
+        offline_reason = probe_network((url for _, url in jobs), budget.probe_timeout) if budget else None
+        if offline_reason:
+            for key in services:
+                collect(key, cached_result(key, local_version(key), offline_reason))
+        else:
+            fetch_engine.run(
+                jobs, task, collect,
+                timeout=budget.remaining() if budget else None,
+                on_timeout=lambda key: cached_result(key, local_version(key), "检查超时"),
+                cancel=budget.cancel_token if budget else None
+            )
+    finally:
+        # 保存页面校验信息，下次检查可发送条件请求（取消时保存已完成的部分）
+        get_validator_cache().flush()
+        snapshot.flush()
+    if check is not None:
+        check.finish()
+        history = diagnostics.get_timing_history()
+        history.add(check)
+        history.flush()
+    return results
+
+def check_failed(results: Dict[str, dict]) -> bool:
+    """是否有应用因请求或解析出错而检查失败（用于自动检查的失败退避）"""
+    return any(result.get("fetch_failed") for result in results.values())
+
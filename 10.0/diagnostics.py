@@ -0,0 +1,249 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import tracing
+from app_config import get_data_path, load_config
+
+# 检查的各个阶段（按发生顺序）
+STAGES = ("local", "dns", "connect", "tls", "ttfb", "download", "parse", "compare")
+STAGE_NAMES = {
+    "local": "读取本地版本",
+    "dns": "DNS解析",
+    "connect": "建立连接",
+    "tls": "TLS握手",
+    "ttfb": "等待首字节",
+    "download": "下载页面",
+    "parse": "解析页面",
+    "compare": "比较版本",
+    "total": "合计"
+}
+HISTORY_SIZE = 50  # 保留最近多少次检查的耗时
+
+# ===== 单次检查的耗时 =====
+class ServiceTimings:
+    """一个应用在一次检查中各阶段的耗时（秒，同一阶段多次发生时累加）"""
+    __slots__ = ("stages",)
+
+    def __init__(self, stages: Optional[Dict[str, float]] = None):
+        self.stages: Dict[str, float] = dict(stages or {})
+
+    def add(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def get(self, stage: str) -> float:
+        return self.stages.get(stage, 0.0)
+
+class CheckTimings:
+    """一次检查中各应用各阶段的耗时"""
+    def __init__(self, started_at: Optional[float] = None):
+        self.started_at = time.time() if started_at is None else started_at
+        self.total = 0.0
+        self.services: Dict[str, ServiceTimings] = {}
+        self._start = time.perf_counter()
+
+    def service(self, key: str) -> ServiceTimings:
+        timings = self.services.get(key)
+        if timings is None:
+            timings = self.services[key] = ServiceTimings()
+        return timings
+
+    def finish(self):
+        self.total = time.perf_counter() - self._start
+
+    def to_dict(self) -> dict:
+        """微秒（整数）为单位的字典（JSON 导出和历史记录使用）"""
+        return {
+            "started_at": self.started_at,
+            "total_us": int(self.total * 1e6),
+            "services": {
+                key: {stage: int(seconds * 1e6) for stage, seconds in timings.stages.items()}
+                for key, timings in self.services.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CheckTimings":
+        check = cls(float(data.get("started_at", 0)))
+        check.total = int(data.get("total_us", 0)) / 1e6
+        for key, stages in (data.get("services") or {}).items():
+            check.services[key] = ServiceTimings({stage: int(us) / 1e6 for stage, us in stages.items()})
+        return check
+
+# ===== 记录 =====
+# 当前线程正在记录的应用（抓取引擎中每个应用在各自的线程中检查）
+_local = threading.local()
+
+def current() -> Optional[ServiceTimings]:
+    """当前线程正在记录的应用，没有时返回 None（不记录）"""
+    return getattr(_local, "timings", None)
+
+@contextmanager
+def recording(timings: Optional[ServiceTimings]) -> Iterator[None]:
+    """在当前线程中把各阶段的耗时记入 timings，并记录合计时间（timings 为 None 时不记录）"""
+    if timings is None:
+        yield
+        return
+    previous = current()
+    _local.timings = timings
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add("total", time.perf_counter() - start)
+        _local.timings = previous
+
+class stage:
+    """记录一个阶段的耗时，exclude 中的阶段在此期间的耗时不计入（如首字节不含建立连接）
+
+    每次检查要记录几十次（流式解析每个数据块一次），用类实现比生成器形式的上下文管理器开销小。
+    开启跟踪（main.py --trace）时各阶段同时记为跟踪事件。
+    """
+    __slots__ = ("name", "exclude", "timings", "span", "start", "excluded")
+
+    def __init__(self, name: str, exclude: Tuple[str, ...] = ()):
+        self.name = name
+        self.exclude = exclude
+        self.timings = current()
+        self.span = tracing.span(name, "check")
+
+    def __enter__(self):
+        self.span.__enter__()
+        if self.timings is not None:
+            self.excluded = sum(self.timings.get(other) for other in self.exclude)
+            self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        timings = self.timings
+        if timings is not None:
+            elapsed = time.perf_counter() - self.start
+            if self.exclude:
+                elapsed -= sum(timings.get(other) for other in self.exclude) - self.excluded
+            timings.add(self.name, max(0.0, elapsed))
+        self.span.__exit__(*exc_info)
+
+def timings_enabled() -> bool:
+    """是否记录检查耗时（config.json 的 diagnostics_enabled，默认开启）"""
+    return bool(load_config().get("diagnostics_enabled", True))
+
+# ===== 历史记录 =====
+def percentile(values: List[float], fraction: float) -> float:
+    """最近秩法的百分位数（values 已排序）"""
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+class TimingHistory:
+    """最近 size 次检查的耗时，保存在 check_timings.jsonl 中（每行一次检查）
+
+    每次检查只在文件末尾追加一行，行数超过 size 的两倍时才重写文件，只保留最近 size 次。
+    """
+    def __init__(self, path: str, size: int = HISTORY_SIZE):
+        self.path = path
+        self.size = size
+        self._lock = threading.Lock()
+        self._pending: List[CheckTimings] = []  # 还未写入文件的检查
+        self._file_lines = 0
+        self._checks: List[CheckTimings] = self._load()
+
+    def _load(self) -> List[CheckTimings]:
+        """读取历史记录，跳过损坏的行"""
+        checks = []
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    self._file_lines += 1
+                    try:
+                        checks.append(CheckTimings.from_dict(json.loads(line)))
+                    except (ValueError, TypeError, AttributeError):
+                        pass
+        except OSError:
+            pass
+        return checks[-self.size:]
+
+    def add(self, check: CheckTimings):
+        with self._lock:
+            self._checks.append(check)
+            del self._checks[:-self.size]
+            self._pending.append(check)
+
+    def checks(self) -> List[CheckTimings]:
+        with self._lock:
+            return list(self._checks)
+
+    def latest(self) -> Optional[CheckTimings]:
+        with self._lock:
+            return self._checks[-1] if self._checks else None
+
+    def summary(self, stages: Iterable[str] = STAGES + ("total",)) -> Dict[str, dict]:
+        """各阶段的中位数和P95（毫秒），只统计发生了该阶段的样本（如复用连接时没有DNS解析）"""
+        samples: Dict[str, List[float]] = {name: [] for name in stages}
+        for check in self.checks():
+            for timings in check.services.values():
+                for name, values in samples.items():
+                    if name in timings.stages:
+                        values.append(timings.stages[name] * 1000)
+        result = {}
+        for name, values in samples.items():
+            values.sort()
+            result[name] = {
+                "p50_ms": round(percentile(values, 0.5), 2),
+                "p95_ms": round(percentile(values, 0.95), 2),
+                "count": len(values)
+            }
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            "exported_at": datetime.now().isoformat(),
+            "summary": self.summary(),
+            "checks": [check.to_dict() for check in self.checks()]
+        }
+
+    def export(self, path: str, **sections):
+        """导出为JSON（含各阶段的中位数和P95），sections 为一并导出的其他内容（如界面卡顿）"""
+        data = json.dumps(dict(self.to_dict(), **sections), ensure_ascii=False, indent=2)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data)
+
+    def flush(self):
+        """把新的检查追加到文件末尾，行数过多时改为重写文件（先写临时文件再替换）"""
+        with self._lock:
+            if not self._pending:
+                return
+            rewrite = self._file_lines + len(self._pending) > self.size * 2
+            checks = self._checks if rewrite else self._pending
+            data = "".join(json.dumps(check.to_dict(), separators=(",", ":")) + "\n" for check in checks)
+            self._pending = []
+            self._file_lines = len(checks) if rewrite else self._file_lines + len(checks)
+        try:
+            if rewrite:
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(tmp_path, self.path)
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(data)
+        except Exception:
+            # 写入失败不影响检查结果
+            pass
+
+_history = None
+_history_lock = threading.Lock()
+
+def get_timing_history() -> TimingHistory:
+    """获取全局共享的检查耗时历史记录"""
+    global _history
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = TimingHistory(get_data_path("check_timings.jsonl"))
+    return _history
@@ -0,0 +1,305 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import ctypes
+from ctypes import wintypes
+from datetime import datetime
+
+from diagnostics import STAGE_NAMES, STAGES, get_timing_history
+from services import service_names
+from stall_watchdog import get_stall_watchdog
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QDialog, QFileDialog, QHBoxLayout, QHeaderView, QLabel, QMessageBox, QPlainTextEdit, QPushButton, QTableWidget,
+    QTableWidgetItem, QTabWidget, QVBoxLayout, QWidget
+)
+
+# 各主题的颜色
+DIALOG_COLORS = {
+    False: {"bg": "#f3f3f3", "text": "#495057", "info": "#6c757d", "table_bg": "white",
+            "grid": "#e9ecef", "header_bg": "#f8f9fa"},
+    True: {"bg": "#2d2d2d", "text": "#f3f3f3", "info": "#adb5bd", "table_bg": "#1e1e1e",
+           "grid": "#404040", "header_bg": "#3d3d3d"},
+}
+
+def format_ms(seconds: float) -> str:
+    """秒转换为毫秒文本"""
+    ms = seconds * 1000
+    return f"{ms:.1f}" if ms < 100 else f"{ms:.0f}"
+
+# ===== 检查耗时诊断对话框 =====
+class DiagnosticsDialog(QDialog):
+    """检查耗时诊断对话框
+
+    - 检查耗时：最近一次检查各应用各阶段的耗时，以及历史记录的中位数和P95
+    - 界面卡顿：开启卡顿监测时，最近的UI线程卡顿及卡顿时的调用栈
+    """
+    def __init__(self, parent=None, is_dark_mode: bool = False):
+        super().__init__(parent)
+        self.setWindowTitle("检查耗时诊断")
+        self.setModal(True)
+        self.setFixedSize(560, 460)
+        self.is_dark_mode = is_dark_mode
+        self.history = get_timing_history()
+        self.watchdog = get_stall_watchdog()
+
+        colors = DIALOG_COLORS[is_dark_mode]
+        self.setStyleSheet(f"""
+            QDialog {{
+                background-color: {colors['bg']};
+                border-radius: 12px;
+            }}
+            QLabel {{
+                color: {colors['text']};
+                font-size: 13px;
+            }}
+            QLabel#InfoLabel {{
+                font-size: 11px;
+                color: {colors['info']};
+            }}
+            QTableWidget {{
+                background-color: {colors['table_bg']};
+                color: {colors['text']};
+                gridline-color: {colors['grid']};
+                border: 1px solid {colors['grid']};
+                border-radius: 6px;
+                font-size: 12px;
+            }}
+            QHeaderView::section {{
+                background-color: {colors['header_bg']};
+                color: {colors['text']};
+                border: none;
+                padding: 4px;
+                font-size: 12px;
+            }}
+            QTableCornerButton::section {{
+                background-color: {colors['header_bg']};
+                border: none;
+            }}
+            QTabWidget::pane {{
+                border: none;
+            }}
+            QTabBar::tab {{
+                background-color: {colors['header_bg']};
+                color: {colors['text']};
+                padding: 6px 14px;
+                border-radius: 6px;
+                margin-right: 4px;
+                font-size: 12px;
+            }}
+            QTabBar::tab:selected {{
+                background-color: #3773e8;
+                color: white;
+            }}
+            QPlainTextEdit {{
+                background-color: {colors['table_bg']};
+                color: {colors['text']};
+                border: 1px solid {colors['grid']};
+                border-radius: 6px;
+                font-family: Consolas, monospace;
+                font-size: 11px;
+            }}
+            QPushButton {{
+                background-color: #3773e8;
+                color: white;
+                border: none;
+                border-radius: 6px;
+                padding: 8px 16px;
+                font-size: 13px;
+            }}
+            QPushButton:hover {{
+                background-color: #4285f4;
+            }}
+        """)
+
+        # 创建布局
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.setContentsMargins(20, 15, 20, 15)
+        self.main_layout.setSpacing(8)
+        self.tabs = QTabWidget()
+        self.main_layout.addWidget(self.tabs)
+
+        # 检查耗时页
+        timings_page = QWidget()
+        timings_layout = QVBoxLayout(timings_page)
+        timings_layout.setContentsMargins(0, 8, 0, 0)
+        timings_layout.setSpacing(8)
+
+        # 最近一次检查和历史记录的说明
+        self.info_label = QLabel()
+        self.info_label.setObjectName("InfoLabel")
+        self.info_label.setWordWrap(True)
+        timings_layout.addWidget(self.info_label)
+
+        # 耗时表格（毫秒）
+        self.table = QTableWidget()
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionMode(QTableWidget.NoSelection)
+        self.table.setFocusPolicy(Qt.NoFocus)
+        timings_layout.addWidget(self.table)
+        self.fill_table()
+        self.tabs.addTab(timings_page, "检查耗时（毫秒）")
+
+        # 界面卡顿页
+        stalls_page = QWidget()
+        stalls_layout = QVBoxLayout(stalls_page)
+        stalls_layout.setContentsMargins(0, 8, 0, 0)
+        stalls_layout.setSpacing(8)
+
+        self.stall_label = QLabel()
+        self.stall_label.setObjectName("InfoLabel")
+        self.stall_label.setWordWrap(True)
+        stalls_layout.addWidget(self.stall_label)
+
+        # 卡顿列表，选中一行时在下方显示卡顿时UI线程的调用栈
+        self.stall_table = QTableWidget()
+        self.stall_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.stall_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.stall_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.stall_table.verticalHeader().setVisible(False)
+        self.stall_table.itemSelectionChanged.connect(self.show_stall_stack)
+        stalls_layout.addWidget(self.stall_table)
+
+        self.stack_view = QPlainTextEdit()
+        self.stack_view.setReadOnly(True)
+        self.stack_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        stalls_layout.addWidget(self.stack_view)
+        self.fill_stalls()
+        self.tabs.addTab(stalls_page, "界面卡顿")
+
+        # 底部按钮
+        buttons_layout = QHBoxLayout()
+        buttons_layout.setSpacing(8)
+
+        self.export_button = QPushButton("导出 JSON")
+        self.export_button.clicked.connect(self.export_json)
+        self.export_button.setEnabled(bool(self.history.checks()) or bool(self.watchdog and self.watchdog.stall_count))
+
+        self.close_button = QPushButton("关闭")
+        self.close_button.setFixedWidth(80)
+        self.close_button.clicked.connect(self.accept)
+
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(self.export_button)
+        buttons_layout.addWidget(self.close_button)
+        self.main_layout.addLayout(buttons_layout)
+
+    def fill_table(self):
+        """行为各阶段，列为最近一次检查中的各应用，以及历史记录的中位数和P95"""
+        latest = self.history.latest()
+        stages = STAGES + ("total",)
+        service_keys = list(latest.services) if latest else []
+        headers = [service_names.get(key, key) for key in service_keys] + ["中位数", "P95"]
+
+        self.table.setRowCount(len(stages))
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setVerticalHeaderLabels([STAGE_NAMES[name] for name in stages])
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Stretch)
+
+        summary = self.history.summary(stages)
+        for row, name in enumerate(stages):
+            values = []
+            for key in service_keys:
+                timings = latest.services[key]
+                values.append(format_ms(timings.get(name)) if name in timings.stages else "-")
+            stats = summary[name]
+            if stats["count"]:
+                values += [format_ms(stats["p50_ms"] / 1000), format_ms(stats["p95_ms"] / 1000)]
+            else:
+                values += ["-", "-"]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setTextAlignment(Qt.AlignCenter)
+                self.table.setItem(row, column, item)
+
+        if latest is None:
+            self.info_label.setText("还没有检查耗时记录，检查一次更新后再来查看。")
+        else:
+            started_at = datetime.fromtimestamp(latest.started_at).strftime("%Y-%m-%d %H:%M:%S")
+            self.info_label.setText(
+                f"最近一次检查：{started_at}，共耗时 {format_ms(latest.total)} 毫秒；"
+                f"中位数和P95统计最近 {len(self.history.checks())} 次检查（只统计发生了该阶段的应用，"
+                f"如复用连接时没有DNS解析和建立连接）"
+            )
+
+    def fill_stalls(self):
+        """最近的卡顿（从晚到早）"""
+        self.stalls = list(reversed(self.watchdog.stalls())) if self.watchdog else []
+        if self.watchdog is None:
+            self.stall_label.setText(
+                "未开启界面卡顿监测。在 config.json 中设置 stall_threshold_ms（如 200）后重新启动程序，"
+                "UI线程超过该时间未处理事件时会记录卡顿和当时的调用栈。"
+            )
+        else:
+            self.stall_label.setText(self.watchdog.format_stats())
+
+        headers = ["时间", "持续（毫秒）", "位置"]
+        self.stall_table.setRowCount(len(self.stalls))
+        self.stall_table.setColumnCount(len(headers))
+        self.stall_table.setHorizontalHeaderLabels(headers)
+        header = self.stall_table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.Stretch)
+        for row, stall in enumerate(self.stalls):
+            values = [
+                datetime.fromtimestamp(stall.started_at).strftime("%H:%M:%S.%f")[:-3],
+                format_ms(stall.duration),
+                stall.location or "（卡顿结束后才检测到，未取得调用栈）"
+            ]
+            for column, value in enumerate(values):
+                self.stall_table.setItem(row, column, QTableWidgetItem(value))
+        if self.stalls:
+            self.stall_table.selectRow(0)
+
+    def show_stall_stack(self):
+        rows = self.stall_table.selectionModel().selectedRows()
+        stall = self.stalls[rows[0].row()] if rows else None
+        self.stack_view.setPlainText(stall.stack if stall else "")
+
+    def export_json(self):
+        """导出全部历史记录、统计结果和界面卡顿"""
+        path, _ = QFileDialog.getSaveFileName(self, "导出检查耗时", "check_timings_export.json", "JSON 文件 (*.json)")
+        if not path:
+            return
+        try:
+            if self.watchdog is not None:
+                self.history.export(path, ui_stalls=self.watchdog.to_dict())
+            else:
+                self.history.export(path)
+        except OSError as e:
+            QMessageBox.warning(self, "导出失败", f"无法写入文件：{e}")
+
+    def set_windows_title_bar_color(self, hex_color):
+        """设置Windows窗口标题栏颜色和文字颜色"""
+        try:
+            # 转换十六进制颜色到RGB
+            hex_color = hex_color.lstrip('#')
+            r = int(hex_color[0:2], 16)
+            g = int(hex_color[2:4], 16)
+            b = int(hex_color[4:6], 16)
+
+            # 定义Windows API
+            DWMWA_CAPTION_COLOR = 35
+            DWMWA_TEXT_COLOR = 36
+            HWND = self.winId()
+            dwmapi = ctypes.WinDLL('dwmapi')
+
+            # 设置标题栏背景颜色
+            color_value = wintypes.DWORD((b << 16) | (g << 8) | r)
+            dwmapi.DwmSetWindowAttribute(HWND, DWMWA_CAPTION_COLOR, ctypes.byref(color_value), ctypes.sizeof(color_value))
+
+            # 判断是否为深色背景，如果是则设置文字为白色
+            brightness = (r * 299 + g * 587 + b * 114) / 1000
+            if brightness < 128:
+                text_color = wintypes.DWORD(0xFFFFFF)  # 白色
+                dwmapi.DwmSetWindowAttribute(HWND, DWMWA_TEXT_COLOR, ctypes.byref(text_color), ctypes.sizeof(text_color))
+        except Exception:
+            # 忽略错误，确保程序正常运行
+            pass
+
+    def showEvent(self, event):
+        """显示事件 - 标题栏颜色与对话框背景一致"""
+        super().showEvent(event)
+        self.set_windows_title_bar_color(DIALOG_COLORS[self.is_dark_mode]["bg"])
@@ -0,0 +1,335 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import codecs
+import importlib.util
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+import diagnostics
+
+# bs4 / lxml 只在对应后端首次使用时导入，默认的流式提取不需要它们
+
+# 没有结束标签的元素，不入栈
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr"
+}
+
+# 这些元素内的文字不计入 get_text 的结果（与 BeautifulSoup 一致）
+NON_TEXT_ELEMENTS = {"script", "style", "template"}
+
+# ===== 增量HTML解析 =====
+class SelectorTextParser(HTMLParser):
+    """增量查找第一个匹配 (tag, class) 的元素并收集其文字
+
+    规则与 soup.find(tag, class_=cls).get_text(strip=True) 保持一致：
+    - class 属性按空白拆分后包含 cls，或整个属性值等于 cls 即视为匹配
+    - 每段文字去除首尾空白后直接拼接，忽略注释和 script/style 内容
+    - 结束标签按 BeautifulSoup 的方式回溯到最近的同名元素
+    目标元素闭合后 done 变为 True，调用方即可停止读取。
+    """
+    def __init__(self, tag: str, cls: str):
+        super().__init__(convert_charrefs=True)
+        self.tag = tag
+        self.cls = cls
+        self.stack: List[str] = []       # 当前打开的元素
+        self.target_depth = -1           # 目标元素在栈中的位置，-1 表示尚未找到
+        self.parts: List[str] = []
+        self._pending: List[str] = []    # 尚未结束的连续文字（可能跨越多个数据块）
+        self.found = False
+        self.done = False
+
+    def _class_matches(self, attrs) -> bool:
+        for name, value in attrs:
+            if name == "class" and value is not None:
+                return value == self.cls or self.cls in value.split()
+        return False
+
+    def _inside_target(self) -> bool:
+        return self.target_depth >= 0 and not self.done
+
+    def _flush(self):
+        """一段连续文字结束，去除首尾空白后记录"""
+        if self._pending:
+            text = "".join(self._pending).strip()
+            self._pending = []
+            if text:
+                self.parts.append(text)
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        self._flush()
+        if not self.found and tag == self.tag and self._class_matches(attrs):
+            self.found = True
+            self.target_depth = len(self.stack)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(tag)
+        elif self.found and self.target_depth == len(self.stack):
+            # 目标本身是自闭合元素
+            self.done = True
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        if self.done or tag not in self.stack:
+            return
+        self._flush()
+        # 回溯到最近的同名元素，期间弹出的元素视为隐式闭合
+        while self.stack:
+            if self.stack.pop() == tag:
+                break
+        if self.target_depth >= 0 and len(self.stack) <= self.target_depth:
+            self.done = True
+
+    def handle_data(self, data):
+        if not self._inside_target():
+            return
+        if any(name in NON_TEXT_ELEMENTS for name in self.stack[self.target_depth + 1:]):
+            return
+        self._pending.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    @property
+    def text(self) -> Optional[str]:
+        """目标元素的文字，未找到时返回 None"""
+        self._flush()
+        return "".join(self.parts) if self.found else None
+
+def find_text(markup: str, selector: Tuple[str, str]) -> Optional[str]:
+    """在完整的HTML文本中查找元素文字"""
+    tag, cls = selector
+    parser = SelectorTextParser(tag, cls)
+    parser.feed(markup)
+    if not parser.done:
+        parser.close()
+    return parser.text
+
+# ===== 流式提取 =====
+def _response_encoding(response) -> str:
+    """响应头声明了字符集时使用该字符集，否则按UTF-8解码（官网页面为UTF-8）"""
+    content_type = response.headers.get("Content-Type", "")
+    if "charset" in content_type.lower() and response.encoding:
+        return response.encoding
+    return "utf-8"
+
+def extract_streaming(response, selector: Tuple[str, str],
+                      chunk_size: int = 16 * 1024, drain_limit: int = 16 * 1024) -> Optional[str]:
+    """边下载边解析，目标元素闭合后立即停止读取
+
+    response 需以 stream=True 发送。找到目标后若剩余内容不超过 drain_limit 字节，
+    会读完剩余部分以便连接放回连接池；否则直接关闭连接，不再下载页面其余部分。
+    """
+    tag, cls = selector
+    parser = SelectorTextParser(tag, cls)
+    decoder = codecs.getincrementaldecoder(_response_encoding(response))(errors="replace")
+
+    # 下载和解析交替进行，下载的耗时不含解析
+    try:
+        with diagnostics.stage("download", exclude=("parse",)):
+            chunks = response.iter_content(chunk_size)
+            for chunk in chunks:
+                with diagnostics.stage("parse"):
+                    parser.feed(decoder.decode(chunk))
+                if parser.done:
+                    break
+            else:
+                with diagnostics.stage("parse"):
+                    parser.feed(decoder.decode(b"", final=True))
+                    parser.close()
+
+            if parser.done and _remaining_bytes(response) <= drain_limit:
+                for _ in chunks:
+                    pass
+    finally:
+        response.close()
+
+    return parser.text
+
+def _remaining_bytes(response) -> float:
+    """响应体剩余未读取的字节数，无法得知时返回无穷大"""
+    try:
+        length = int(response.headers["Content-Length"])
+        return max(0, length - response.raw.tell())
+    except Exception:
+        return float("inf")
+
+# ===== 提取后端 =====
+class Extractor:
+    """版本文本提取后端
+
+    extract_text 在完整页面内容中查找元素文字，结果与
+    soup.find(tag, class_=cls).get_text(strip=True) 一致，未找到时返回 None；
+    extract_response 从响应中读取页面后提取，默认读取完整响应。
+    """
+    name = ""
+
+    def extract_text(self, data: bytes, selector: Tuple[str, str],
+                     encoding: str = "utf-8") -> Optional[str]:
+        raise NotImplementedError
+
+    def extract_response(self, response, selector: Tuple[str, str]) -> Optional[str]:
+        try:
+            with diagnostics.stage("download"):
+                data = response.content
+        finally:
+            response.close()
+        with diagnostics.stage("parse"):
+            return self.extract_text(data, selector, _response_encoding(response))
+
+class SoupExtractor(Extractor):
+    """BeautifulSoup 构建完整文档树后查找"""
+    name = "bs4"
+
+    def extract_text(self, data, selector, encoding="utf-8"):
+        from bs4 import BeautifulSoup
+
+        tag, cls = selector
+        soup = BeautifulSoup(data.decode(encoding, errors="replace"), "html.parser")
+        elem = soup.find(tag, class_=cls)
+        return elem.get_text(strip=True) if elem else None
+
+class StrainerExtractor(Extractor):
+    """BeautifulSoup 只为匹配 (tag, class) 的元素建树，其余内容解析后直接丢弃"""
+    name = "strainer"
+
+    def extract_text(self, data, selector, encoding="utf-8"):
+        from bs4 import BeautifulSoup, SoupStrainer
+
+        tag, cls = selector
+        # 过滤时 class 尚未按空白拆分，需自行判断是否包含 cls
+        strainer = SoupStrainer(tag, class_=lambda value: _class_contains(value, cls))
+        soup = BeautifulSoup(data.decode(encoding, errors="replace"), "html.parser",
+                             parse_only=strainer)
+        elem = soup.find(tag, class_=cls)
+        return elem.get_text(strip=True) if elem else None
+
+def _class_contains(value, cls: str) -> bool:
+    """class 属性值（字符串或列表）是否包含 cls"""
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return value == cls or cls in value.split()
+    return cls in value
+
+class LxmlExtractor(Extractor):
+    """lxml（C实现的HTML解析器）建树后用 XPath 查找
+
+    标签嵌套不合法时按 libxml2 的规则修正（如 p 内出现 p 会先闭合前一个），
+    这类页面上的结果可能与 html.parser 不同。
+    """
+    name = "lxml"
+
+    def extract_text(self, data, selector, encoding="utf-8"):
+        from lxml import etree
+
+        tag, cls = selector
+        parser = etree.HTMLParser(encoding=encoding)
+        root = etree.fromstring(data, parser)
+        if root is None:
+            return None
+        matches = root.xpath(
+            f'//{tag}[@class = $cls or contains(concat(" ", normalize-space(@class), " "), $padded)]',
+            cls=cls, padded=f" {cls} "
+        )
+        return _lxml_text(matches[0]) if matches else None
+
+def _lxml_text(elem) -> str:
+    """按 get_text(strip=True) 的规则拼接 lxml 元素的文字（忽略注释和 script/style）"""
+    parts = []
+
+    def collect(text):
+        if text and text.strip():
+            parts.append(text.strip())
+
+    def walk(node):
+        if node.tag not in NON_TEXT_ELEMENTS:
+            collect(node.text)
+            for child in node:
+                if isinstance(child.tag, str):
+                    walk(child)
+                collect(child.tail)
+
+    walk(elem)
+    return "".join(parts)
+
+class RegexExtractor(Extractor):
+    """直接在原始字节上用正则匹配目标元素，匹配不到或元素内含子标签/实体时退回完整解析"""
+    name = "regex"
+
+    def __init__(self, fallback: Extractor):
+        self.fallback = fallback
+        self._patterns: Dict[Tuple[str, str], "re.Pattern"] = {}
+
+    def _pattern(self, selector: Tuple[str, str]) -> "re.Pattern":
+        pattern = self._patterns.get(selector)
+        if pattern is None:
+            tag, cls = (re.escape(s.encode("utf-8")) for s in selector)
+            pattern = re.compile(
+                rb"<" + tag + rb"\b[^>]*?\bclass\s*=\s*([\"'])(?:[^\"']*\s)?" + cls
+                + rb"(?:\s[^\"']*)?\1[^>]*>(.*?)</" + tag + rb"\s*>",
+                re.IGNORECASE | re.DOTALL
+            )
+            self._patterns[selector] = pattern
+        return pattern
+
+    def extract_text(self, data, selector, encoding="utf-8"):
+        for match in self._pattern(selector).finditer(data):
+            if _inside_raw_block(data, match.start()):
+                continue
+            inner = match.group(2)
+            if b"<" not in inner and b"&" not in inner:
+                return inner.decode(encoding, errors="replace").strip()
+            break
+        return self.fallback.extract_text(data, selector, encoding)
+
+def _inside_raw_block(data: bytes, pos: int) -> bool:
+    """pos 是否位于注释或 script/style 内（这些位置的标签不是真正的元素）"""
+    if data.rfind(b"<!--", 0, pos) > data.rfind(b"-->", 0, pos):
+        return True
+    lowered = data[:pos].lower()
+    for name in (b"script", b"style"):
+        if lowered.rfind(b"<" + name, 0, pos) > lowered.rfind(b"</" + name, 0, pos):
+            return True
+    return False
+
+class StreamingExtractor(Extractor):
+    """增量解析，目标元素闭合后立即停止读取（见 extract_streaming）"""
+    name = "stream"
+
+    def extract_text(self, data, selector, encoding="utf-8"):
+        return find_text(data.decode(encoding, errors="replace"), selector)
+
+    def extract_response(self, response, selector):
+        return extract_streaming(response, selector)
+
+# ===== 后端注册表 =====
+DEFAULT_EXTRACTOR = "stream"
+
+EXTRACTORS: Dict[str, Extractor] = {
+    "bs4": SoupExtractor(),
+    "strainer": StrainerExtractor(),
+    "stream": StreamingExtractor(),
+}
+EXTRACTORS["regex"] = RegexExtractor(fallback=EXTRACTORS["bs4"])
+if importlib.util.find_spec("lxml") is not None:
+    # 未安装 lxml 时 lxml 后端退回到 BeautifulSoup
+    EXTRACTORS["lxml"] = LxmlExtractor()
+
+def get_extractor(name: Optional[str] = None) -> Extractor:
+    """按名称获取提取后端，未指定或不可用时使用默认的流式提取"""
+    if name == "lxml" and name not in EXTRACTORS:
+        return EXTRACTORS["bs4"]
+    return EXTRACTORS.get(name or DEFAULT_EXTRACTOR, EXTRACTORS[DEFAULT_EXTRACTOR])
@@ -0,0 +1,292 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from app_config import load_config
+
+# ===== 协作式取消 =====
+class CheckCancelled(Exception):
+    """检查已被取消（关闭窗口、重新检查或超出任务时限）"""
+
+class CancelToken:
+    """协作式取消标记
+
+    取消不会打断正在执行的代码，任务在各检查点调用 raise_if_cancelled 自行结束；
+    waiter() 返回在取消时完成的 Future，可以和其他 Future 一起等待，取消后立即唤醒等待方；
+    add_callback 登记取消时要执行的操作（如关闭正在使用的连接，中断阻塞中的读取）。
+    """
+    def __init__(self):
+        self.reason = ""
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._waiter = Future()
+        self._callbacks: List[Callable[[], None]] = []
+
+    def cancel(self, reason: str = "已取消") -> bool:
+        """请求取消，首次取消时返回 True"""
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        self._waiter.set_result(reason)
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass
+        return True
+
+    def add_callback(self, callback: Callable[[], None]):
+        """取消时调用 callback（已取消时立即调用）"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """等待取消，最多 timeout 秒，返回是否已取消"""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise CheckCancelled(self.reason)
+
+    def waiter(self) -> Future:
+        return self._waiter
+
+# 抓取线程正在执行的任务的取消标记，及任务期间登记的取消回调
+_job = threading.local()
+
+def on_cancel(callback: Callable[[], None]):
+    """当前抓取任务被取消时调用 callback，任务结束后不再调用（不在抓取任务中时不做任何处理）"""
+    token = getattr(_job, "token", None)
+    if token is not None:
+        _job.callbacks.append(callback)
+        token.add_callback(callback)
+
+# ===== 检查时间预算 =====
+DEFAULT_CHECK_BUDGET = 8.0   # 一次检查的总时间（秒），超出后使用缓存的结果
+CONNECT_TIMEOUT = 3.0        # 建立连接的超时（秒）
+READ_TIMEOUT = 10.0          # 两次读取之间的超时（秒，与原来每个请求的 timeout=10 相同）
+PROBE_TIMEOUT = 0.08         # 检查前网络探测的等待时间（秒）
+
+class CheckBudget:
+    """一次检查的时间预算
+
+    从创建时开始计时，到 total 秒后截止；每个请求的连接和读取超时都不超过剩余时间，
+    抓取引擎在截止时不再等待未完成的请求。有 cancel_token 时，取消后预算立即用完。
+    revalidate 为真时（用户手动检查）不使用新鲜期内的页面缓存，每个页面都发送条件请求。
+    """
+    def __init__(self, total: float = DEFAULT_CHECK_BUDGET, connect_timeout: float = CONNECT_TIMEOUT,
+                 read_timeout: float = READ_TIMEOUT, probe_timeout: float = PROBE_TIMEOUT,
+                 clock: Callable[[], float] = time.monotonic,
+                 cancel_token: Optional[CancelToken] = None, revalidate: bool = False):
+        self.total = total
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.probe_timeout = probe_timeout
+        self.cancel_token = cancel_token
+        self.revalidate = revalidate
+        self._clock = clock
+        self.deadline = clock() + total
+
+    def remaining(self) -> float:
+        """剩余的秒数（截止或取消后为0）"""
+        if self.cancel_token is not None and self.cancel_token.cancelled():
+            return 0.0
+        return max(0.0, self.deadline - self._clock())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def fraction_used(self) -> float:
+        """已用时间占总时间的比例（0~1）"""
+        return 1.0 - self.remaining() / self.total if self.total > 0 else 1.0
+
+    def timeout(self) -> Tuple[float, float]:
+        """本次请求的 (连接超时, 读取超时)，不超过剩余时间"""
+        remaining = max(0.001, self.remaining())
+        return min(self.connect_timeout, remaining), min(self.read_timeout, remaining)
+
+    def raise_if_cancelled(self):
+        """检查已取消时抛出 CheckCancelled"""
+        if self.cancel_token is not None:
+            self.cancel_token.raise_if_cancelled()
+
+def new_check_budget(cancel_token: Optional[CancelToken] = None, revalidate: bool = False) -> CheckBudget:
+    """按 config.json 的 check_budget / connect_timeout / read_timeout 创建检查时间预算（revalidate 见 CheckBudget）"""
+    config = load_config()
+    return CheckBudget(
+        total=float(config.get("check_budget", DEFAULT_CHECK_BUDGET)),
+        connect_timeout=float(config.get("connect_timeout", CONNECT_TIMEOUT)),
+        read_timeout=float(config.get("read_timeout", READ_TIMEOUT)),
+        cancel_token=cancel_token,
+        revalidate=revalidate
+    )
+
+# ===== 令牌桶限速器 =====
+class TokenBucket:
+    """令牌桶限速器：按固定速率发放令牌，允许少量突发，替代固定的 time.sleep"""
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate              # 每秒发放的令牌数
+        self.capacity = capacity      # 桶容量（允许的突发请求数）
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        """根据流逝的时间补充令牌（调用方需持有锁）"""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """尝试取出令牌，成功返回0，否则返回还需等待的秒数"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0, cancel: Optional[CancelToken] = None):
+        """阻塞直到取得令牌；取消后立即抛出 CheckCancelled，不再占用令牌"""
+        while True:
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            if cancel is not None:
+                cancel.wait(wait)
+            else:
+                self._sleep(wait)
+
+# ===== 并发抓取引擎 =====
+class FetchEngine:
+    """并发抓取引擎
+
+    - 同一主机的并发数受 per_host_limit 限制
+    - 所有请求共享一个令牌桶，保证对官网的访问频率可控
+    - 结果按完成顺序回调，最慢的页面不会阻塞其他页面的显示
+    """
+    def __init__(self, max_workers: int = 6, per_host_limit: int = 3,
+                 rate: float = 2.0, burst: float = 3.0):
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.bucket = TokenBucket(rate, burst)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """获取指定主机的并发槽位"""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_slots[host] = slot
+            return slot
+
+    def _run_job(self, key: str, url: str, task: Callable[[str], dict],
+                 cancel: Optional[CancelToken] = None) -> dict:
+        """在主机槽位和令牌桶的限制下执行单个任务（已取消时不再发出请求）"""
+        with self._host_slot(url):
+            self.bucket.acquire(cancel=cancel)
+            if cancel is None:
+                return task(key)
+            # 任务期间发出的请求登记到取消标记（见 on_cancel），取消时关闭连接，不再等待响应
+            _job.token, _job.callbacks = cancel, []
+            try:
+                return task(key)
+            finally:
+                for callback in _job.callbacks:
+                    cancel.remove_callback(callback)
+                _job.token, _job.callbacks = None, []
+
+    def run(self, jobs: Iterable[Tuple[str, str]], task: Callable[[str], dict],
+            on_result: Callable[[str, dict], None],
+            on_error: Optional[Callable[[str, Exception], dict]] = None,
+            timeout: Optional[float] = None,
+            on_timeout: Optional[Callable[[str], dict]] = None,
+            cancel: Optional[CancelToken] = None):
+        """并发执行任务，并在调用线程中按完成顺序回调 on_result
+
+        Args:
+            jobs: (任务标识, 目标URL) 列表，URL 用于按主机限流
+            task: 执行单个任务的函数，参数为任务标识，返回结果字典
+            on_result: 每个任务完成后调用，参数为任务标识和结果
+            on_error: 任务抛出异常时用于生成结果，不提供则异常向上抛出
+            timeout: 最多等待的秒数，到时仍未完成的任务用 on_timeout 生成结果，
+                不再等待（任务在后台按各自的请求超时结束，结果被丢弃）
+            on_timeout: 任务超时时用于生成结果，参数为任务标识
+            cancel: 取消标记，取消后立即停止等待并抛出 CheckCancelled（不再回调未完成的任务，
+                尚未开始的任务不再执行）
+        """
+        jobs = list(jobs)
+        if not jobs:
+            return
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+
+        def deliver(key: str, future):
+            try:
+                result = future.result()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                result = on_error(key, e)
+            on_result(key, result)
+
+        workers = max(1, min(self.max_workers, len(jobs)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch")
+        abandoned = False  # 超时或取消时不等待未完成的任务
+        try:
+            futures = {
+                executor.submit(self._run_job, key, url, task, cancel): key
+                for key, url in jobs
+            }
+            pending = dict(futures)
+            # 取消标记的 Future 和任务一起等待，取消时立即唤醒
+            waiter = cancel.waiter() if cancel is not None else None
+            try:
+                for future in as_completed(list(futures) + ([waiter] if waiter else []), timeout=timeout):
+                    if future is waiter or cancel is not None and cancel.cancelled():
+                        abandoned = True
+                        for pending_future in pending:
+                            pending_future.cancel()
+                        raise CheckCancelled(cancel.reason)
+                    deliver(pending.pop(future), future)
+                    if not pending:
+                        break
+            except FuturesTimeoutError:
+                if on_timeout is None:
+                    raise
+                abandoned = True
+                for future, key in pending.items():
+                    if future.done():
+                        deliver(key, future)
+                    else:
+                        future.cancel()
+                        on_result(key, on_timeout(key))
+        finally:
+            executor.shutdown(wait=not abandoned, cancel_futures=abandoned)
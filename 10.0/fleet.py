@@ -0,0 +1,197 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""批量检查：一次比较大量电脑上已安装的版本
+
+用法：
+  python fleet.py --collect >> inventory.ndjson            # 在每台电脑上收集本机的安装版本
+  python fleet.py inventory.ndjson [-o report.ndjson]      # 汇总后统一检查
+  python fleet.py inventory.csv --format csv -o report.csv
+
+清单为 NDJSON（每行一个 {"host", "service", "installed_version"}）或带表头的 CSV（同名列）。
+每个官网页面只请求一次，每行的判断与窗口中的检查相同；清单逐行读取、报告逐行写出，
+内存占用与清单行数无关。每批 CLASSIFY_BATCH 行中同一应用的本地版本整列与官网版本比较
+（versions.compare_column，安装了 NumPy 时一次比较整列）。统计信息输出到标准错误。
+"""
+
+import argparse
+import csv
+import json
+import socket
+import sys
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO
+
+from checker import COMPARE_STATUS, classify, error_result, fetch_online
+from fetch_engine import FetchEngine
+from http_cache import get_validator_cache
+from local_versions import read_installed_versions
+from services import installed_versions_config, website_config
+from versions import compare_column
+
+REPORT_FIELDS = ("host", "service", "installed_version", "online_version", "status", "status_type")
+CLASSIFY_BATCH = 8192  # 每批判断的行数（整列比较的列长度，也是同时保留在内存中的行数）
+
+# 清单行无效或应用未配置时的结果
+INVALID_ROW = {"online_version": "", "status": "清单格式错误", "status_type": "error", "download_url": ""}
+UNKNOWN_SERVICE = fetch_online(None)
+
+# ===== 清单 =====
+class InventoryRow(NamedTuple):
+    """清单中的一行（格式错误的行 service 为 None）"""
+    host: str
+    service: Optional[str]
+    installed_version: Optional[str]
+
+def _row_from_dict(data) -> InventoryRow:
+    if not isinstance(data, dict) or not data.get("service"):
+        return InventoryRow(str(data.get("host", "")) if isinstance(data, dict) else "", None, None)
+    version = data.get("installed_version")
+    return InventoryRow(str(data.get("host", "")), str(data["service"]), str(version) if version else None)
+
+def read_inventory(stream: TextIO, fmt: str = "ndjson") -> Iterator[InventoryRow]:
+    """逐行读取清单（不一次读入整个文件）"""
+    if fmt == "csv":
+        for data in csv.DictReader(stream):
+            yield _row_from_dict(data)
+        return
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        yield _row_from_dict(data)
+
+def collect_inventory(host: Optional[str] = None) -> Iterator[dict]:
+    """本机各应用的安装版本（清单格式）"""
+    host = host or socket.gethostname()
+    for service, version in read_installed_versions(installed_versions_config).items():
+        yield {"host": host, "service": service, "installed_version": version}
+
+# ===== 检查 =====
+def fetch_online_versions(fetch_engine: Optional[FetchEngine] = None) -> Dict[str, dict]:
+    """并发请求全部官网页面，每个页面只请求一次，返回 {应用键: fetch_online 的结果}"""
+    fetch_engine = fetch_engine or FetchEngine()
+    online: Dict[str, dict] = {}
+
+    def on_error(key: str, error: Exception) -> dict:
+        result = error_result(None, error, website_config[key]["url"])
+        del result["local_version"]
+        return result
+
+    jobs = [(key, info["url"]) for key, info in website_config.items()]
+    fetch_engine.run(jobs, lambda key: fetch_online(website_config[key]), online.__setitem__, on_error)
+    get_validator_cache().flush()
+    return online
+
+def classify_inventory(rows: Iterable[InventoryRow], online: Dict[str, dict],
+                       batch_size: int = CLASSIFY_BATCH) -> Iterator[dict]:
+    """判断清单中每台电脑每个应用的状态（每 batch_size 行一批，按清单顺序输出）"""
+    batch: List[InventoryRow] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield from _classify_batch(batch, online)
+            batch = []
+    if batch:
+        yield from _classify_batch(batch, online)
+
+def _classify_batch(rows: List[InventoryRow], online: Dict[str, dict]) -> Iterator[dict]:
+    """判断一批清单行：需要比较版本的行按应用分列，每列与官网版本一次比较，其余行与窗口中一样用 classify"""
+    results: List[Optional[dict]] = [None] * len(rows)
+    columns: Dict[str, List[int]] = {}
+    for index, row in enumerate(rows):
+        info = INVALID_ROW if row.service is None else online.get(row.service, UNKNOWN_SERVICE)
+        if "status_type" in info or not row.installed_version:
+            results[index] = classify(row.installed_version, info)
+        else:
+            columns.setdefault(row.service, []).append(index)
+
+    for service, indices in columns.items():
+        online_version = online[service]["online_version"]
+        signs = compare_column([rows[index].installed_version for index in indices], online_version)
+        for index, sign in zip(indices, signs):
+            status, status_type = COMPARE_STATUS[int(sign)]
+            results[index] = {"online_version": online_version, "status": status, "status_type": status_type}
+
+    for row, result in zip(rows, results):
+        yield {
+            "host": row.host,
+            "service": row.service or "",
+            "installed_version": row.installed_version or "",
+            "online_version": result["online_version"],
+            "status": result["status"],
+            "status_type": result["status_type"]
+        }
+
+# ===== 报告 =====
+class ReportWriter:
+    """逐行写出报告，并按 (应用, 状态类型) 计数"""
+    def __init__(self, stream: TextIO, fmt: str = "ndjson"):
+        self.stream = stream
+        self.fmt = fmt
+        self.counts: Counter = Counter()
+        self._csv = None
+        if fmt == "csv":
+            self._csv = csv.DictWriter(stream, fieldnames=REPORT_FIELDS, lineterminator="\n")
+            self._csv.writeheader()
+
+    def write(self, record: dict):
+        self.counts[(record["service"], record["status_type"])] += 1
+        if self._csv is not None:
+            self._csv.writerow(record)
+        else:
+            self.stream.write(json.dumps(record, ensure_ascii=False))
+            self.stream.write("\n")
+
+    def summary(self) -> str:
+        """按应用汇总各状态的数量"""
+        lines = []
+        for service in sorted({service for service, _ in self.counts}):
+            parts = [f"{status_type}={count}" for (name, status_type), count in sorted(self.counts.items())
+                     if name == service]
+            lines.append(f"{service or '(无效行)'}: {', '.join(parts)}")
+        return "\n".join(lines)
+
+def run_fleet(inventory: TextIO, output: TextIO, in_fmt: str = "ndjson", out_fmt: str = "ndjson",
+              online: Optional[Dict[str, dict]] = None) -> ReportWriter:
+    """检查整个清单并写出报告（online 为空时先请求官网）"""
+    if online is None:
+        online = fetch_online_versions()
+    writer = ReportWriter(output, out_fmt)
+    for record in classify_inventory(read_inventory(inventory, in_fmt), online):
+        writer.write(record)
+    return writer
+
+def main():
+    parser = argparse.ArgumentParser(description="批量检查大量电脑上已安装的版本")
+    parser.add_argument("inventory", nargs="?", help="清单文件（NDJSON 或 CSV，- 为标准输入）")
+    parser.add_argument("-o", "--output", help="报告文件（默认输出到标准输出）")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson", help="报告格式")
+    parser.add_argument("--input-format", choices=["ndjson", "csv"],
+                        help="清单格式（默认按扩展名判断，.csv 为 CSV）")
+    parser.add_argument("--collect", action="store_true", help="输出本机的安装版本（清单格式）")
+    args = parser.parse_args()
+
+    if args.collect:
+        for record in collect_inventory():
+            print(json.dumps(record, ensure_ascii=False))
+        return
+    if not args.inventory:
+        parser.error("需要清单文件，或使用 --collect")
+
+    in_fmt = args.input_format or ("csv" if args.inventory.lower().endswith(".csv") else "ndjson")
+    inventory = sys.stdin if args.inventory == "-" else open(args.inventory, "r", encoding="utf-8-sig", newline="")
+    output = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        writer = run_fleet(inventory, output, in_fmt, args.format)
+    finally:
+        if inventory is not sys.stdin:
+            inventory.close()
+        if output is not sys.stdout:
+            output.close()
+    print(writer.summary(), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
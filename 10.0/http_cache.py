@@ -0,0 +1,137 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from app_config import get_data_path, load_config
+
+# ===== 默认配置 =====
+DEFAULT_TTL = 600            # 新鲜期（秒），期间直接使用缓存，不发送请求
+DEFAULT_MAX_ENTRIES = 64     # 最多缓存的页面数量
+DEFAULT_MAX_BYTES = 64 * 1024  # 缓存文件大小上限
+
+# ===== 校验信息缓存 =====
+class ValidatorCache:
+    """官网页面的HTTP校验信息缓存
+
+    以URL为键，保存 ETag / Last-Modified 和从页面中提取的版本文本：
+    - 新鲜期内直接返回缓存的提取结果（用户手动检查时除外，见 checker.fetch_version_text）
+    - 过期后发送条件请求，服务器返回304时复用提取结果，无需下载和解析页面
+    - 超出条目数或文件大小上限时，按最近最少使用的顺序淘汰
+    """
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES,
+                 clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, dict] = self._load()
+
+    def _load(self) -> Dict[str, dict]:
+        """从磁盘读取缓存，文件损坏时从空缓存开始"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            if isinstance(entries, dict):
+                return {url: e for url, e in entries.items() if isinstance(e, dict)}
+        except Exception:
+            pass
+        return {}
+
+    def get(self, url: str) -> Optional[dict]:
+        """获取缓存条目（返回副本）"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            entry["accessed_at"] = self._clock()
+            return dict(entry)
+
+    def is_fresh(self, entry: Optional[dict]) -> bool:
+        """缓存条目是否仍在新鲜期内"""
+        if not entry:
+            return False
+        return self._clock() - entry.get("stored_at", 0) < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[dict]) -> dict:
+        """根据缓存的校验信息生成条件请求头"""
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, etag: Optional[str], last_modified: Optional[str], text: Optional[str]):
+        """保存页面的校验信息和提取结果"""
+        now = self._clock()
+        with self._lock:
+            self._entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "text": text,
+                "stored_at": now,
+                "accessed_at": now
+            }
+            self._evict()
+            self._dirty = True
+
+    def revalidated(self, url: str):
+        """服务器返回304，刷新缓存条目的新鲜期"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                entry["stored_at"] = entry["accessed_at"] = self._clock()
+                self._dirty = True
+
+    def _evict(self):
+        """按最近最少使用的顺序淘汰超出上限的条目（调用方需持有锁）"""
+        by_age = sorted(self._entries, key=lambda u: self._entries[u].get("accessed_at", 0))
+        while by_age and (
+            len(self._entries) > self.max_entries
+            or len(json.dumps(self._entries, ensure_ascii=False).encode("utf-8")) > self.max_bytes
+        ):
+            del self._entries[by_age.pop(0)]
+
+    def flush(self):
+        """有改动时写回磁盘（先写临时文件再替换，避免写坏缓存）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps(self._entries, ensure_ascii=False, indent=2)
+            self._dirty = False
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            # 缓存写入失败不影响检查结果
+            pass
+
+# ===== 全局缓存实例 =====
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_validator_cache() -> ValidatorCache:
+    """获取全局共享的校验信息缓存，新鲜期可通过 config.json 的 http_cache_ttl 配置"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = load_config()
+                _cache = ValidatorCache(
+                    get_data_path("http_cache.json"),
+                    ttl=float(config.get("http_cache_ttl", DEFAULT_TTL)),
+                    max_entries=int(config.get("http_cache_max_entries", DEFAULT_MAX_ENTRIES))
+                )
+    return _cache
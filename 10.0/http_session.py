@@ -0,0 +1,302 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import errno
+import socket
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+from urllib.request import getproxies
+
+import diagnostics
+import tracing
+from fetch_engine import on_cancel
+
+if TYPE_CHECKING:
+    import requests
+    from requests.adapters import HTTPAdapter
+
+# ===== 进程级HTTP会话管理 =====
+class SessionManager:
+    """进程级HTTP会话管理器
+
+    所有检查共享同一个 requests.Session 和 keep-alive 连接池，
+    普通模式与通透模式窗口都通过 SessionManager.instance() 获取。
+    requests 在首次使用会话时才导入（通常在后台预连接线程中），不拖慢窗口启动。
+    """
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 6):
+        self.pool_connections = pool_connections  # 缓存的主机连接池数量
+        self.pool_maxsize = pool_maxsize          # 每个主机保留的空闲连接数
+        self._session = None
+        self._adapter = None
+        self._session_lock = threading.Lock()
+
+        # 后台预连接状态
+        self._warmup_threads: List[threading.Thread] = []
+        self._stats_lock = threading.Lock()
+        self.preconnect_count = 0
+        self.preconnect_failures = 0
+
+    @classmethod
+    def instance(cls) -> "SessionManager":
+        """获取全局唯一的会话管理器"""
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def _ensure_session(self):
+        """首次使用时创建会话和连接池"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import requests
+                    from requests.adapters import HTTPAdapter
+
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize,
+                        max_retries=0
+                    )
+                    # 新建连接时记录DNS解析、建立连接和TLS握手的耗时（见 diagnostics）
+                    adapter.poolmanager.pool_classes_by_scheme = _timed_pool_classes()
+                    session = requests.Session()
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._adapter = adapter
+                    self._session = session
+
+    @property
+    def session(self) -> "requests.Session":
+        """共享的 requests.Session"""
+        self._ensure_session()
+        return self._session
+
+    @property
+    def adapter(self) -> "HTTPAdapter":
+        """会话挂载的连接池适配器"""
+        self._ensure_session()
+        return self._adapter
+
+    def preconnect(self, urls: Iterable[str], connections_per_host: int = 3, timeout: float = 5):
+        """在后台提前建立到各主机的连接（DNS、TCP、TLS），供首次检查直接复用
+
+        每个主机并发建立 connections_per_host 个连接，与并发抓取引擎的每主机并发数保持一致，
+        建立后的连接直接放回连接池，检查时按 keep-alive 复用。
+        """
+        targets: Dict[str, str] = {}
+        for url in urls:
+            parts = urlsplit(url)
+            if parts.scheme and parts.netloc:
+                targets.setdefault(f"{parts.scheme}://{parts.netloc}", url)
+
+        for origin, url in targets.items():
+            for _ in range(connections_per_host):
+                t = threading.Thread(
+                    target=self._warm_connection,
+                    args=(url, timeout),
+                    name=f"preconnect-{urlsplit(origin).netloc}",
+                    daemon=True
+                )
+                self._warmup_threads.append(t)
+                t.start()
+
+    def _warm_connection(self, url: str, timeout: float):
+        """只建立连接（DNS、TCP、TLS）并放回连接池，不发送任何请求
+
+        不用 HEAD 请求预热：它要占用连接等待一次完整的响应，首次检查反而要多等一个来回。
+        建立连接没有公开接口，依赖以下接口（requests 2.x、urllib3 1.26 和 2.x 均有）：
+        - 与检查的请求取同一个连接池（证书、代理设置一致）：requests 2.32.2 起为
+          HTTPAdapter.get_connection_with_tls_context，更早的版本为 HTTPAdapter.get_connection
+        - 从连接池取出和放回连接：urllib3 的 HTTPConnectionPool._get_conn / _put_conn
+        网络错误不影响检查（检查时重新建立连接），计入 preconnect_failures 并记录跟踪事件。
+        """
+        import requests
+        from urllib3.exceptions import HTTPError
+
+        try:
+            settings = self.session.merge_environment_settings(url, {}, None, None, None)
+            if hasattr(self.adapter, "get_connection_with_tls_context"):
+                request = self.session.prepare_request(requests.Request("GET", url))
+                pool = self.adapter.get_connection_with_tls_context(
+                    request, settings["verify"], settings["proxies"], settings["cert"]
+                )
+            else:
+                pool = self.adapter.get_connection(url, settings["proxies"])
+            conn = pool._get_conn(timeout=timeout)
+        except (OSError, HTTPError) as e:
+            self._preconnect_failed(url, e)
+            return
+
+        try:
+            # 池中已有空闲连接时直接放回，避免重复握手
+            if getattr(conn, "sock", None) is None:
+                conn.timeout = timeout
+                conn.connect()
+        except (OSError, HTTPError) as e:
+            # 与 urllib3 请求失败时一样关闭连接并归还空位
+            conn.close()
+            pool._put_conn(None)
+            self._preconnect_failed(url, e)
+            return
+        pool._put_conn(conn)
+        with self._stats_lock:
+            self.preconnect_count += 1
+
+    def _preconnect_failed(self, url: str, error: Exception):
+        with self._stats_lock:
+            self.preconnect_failures += 1
+        tracing.instant("preconnect_failed", "http", url=url, error=str(error)[:200])
+
+    def wait_ready(self, timeout: Optional[float] = None):
+        """等待后台预连接结束（超时后直接返回，不影响检查）"""
+        threads, self._warmup_threads = self._warmup_threads, []
+        for t in threads:
+            t.join(timeout)
+
+    def connection_stats(self) -> dict:
+        """统计连接池的连接建立与复用次数"""
+        opened = 0
+        requests_sent = 0
+        pools = self._adapter.poolmanager.pools if self._adapter is not None else {}
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            requests_sent += pool.num_requests
+        return {
+            "connections_opened": opened,
+            "requests": requests_sent,
+            "reused": max(0, requests_sent - opened),
+            "preconnected": self.preconnect_count,
+            "preconnect_failures": self.preconnect_failures
+        }
+
+    def close(self):
+        """关闭会话并释放连接池"""
+        if self._session is not None:
+            self._session.close()
+
+def _timed_pool_classes() -> dict:
+    """连接池类：正在记录检查耗时的线程新建连接时，分别记录DNS解析、建立连接和TLS握手的耗时；
+    检查被取消时关闭正在发送请求或读取响应的连接（见 fetch_engine.on_cancel）"""
+    from urllib3.connection import HTTPConnection, HTTPSConnection
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+    from urllib3.exceptions import NameResolutionError
+    from urllib3.util.connection import allowed_gai_family
+
+    class TimedConnectionMixin:
+        def _new_conn(self):
+            if diagnostics.current() is None:
+                return super()._new_conn()
+            host = self._dns_host
+            try:
+                with diagnostics.stage("dns"):
+                    addresses = socket.getaddrinfo(host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+            except socket.gaierror as e:
+                raise NameResolutionError(self.host, self, e) from e
+
+            # 与 create_connection 一样逐个尝试解析出的地址，传入IP地址避免再次解析
+            error = None
+            with diagnostics.stage("connect"):
+                for *_, address in addresses:
+                    self._dns_host = address[0]
+                    try:
+                        return super()._new_conn()
+                    except Exception as e:
+                        error = e
+                    finally:
+                        self._dns_host = host
+            raise error
+
+    class CancellableConnectionMixin:
+        def request(self, *args, **kwargs):
+            # 阻塞在等待响应或读取响应体的线程，在连接关闭后立即结束
+            on_cancel(self._abort)
+            return super().request(*args, **kwargs)
+
+        def _abort(self):
+            sock = self.sock
+            if sock is not None:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    class TimedHTTPConnection(CancellableConnectionMixin, TimedConnectionMixin, HTTPConnection):
+        pass
+
+    class TimedHTTPSConnection(CancellableConnectionMixin, TimedConnectionMixin, HTTPSConnection):
+        def connect(self):
+            with diagnostics.stage("tls", exclude=("dns", "connect")):
+                super().connect()
+
+    class TimedHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = TimedHTTPSConnection
+
+    return {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+def get_session() -> "requests.Session":
+    """获取全局共享的HTTP会话"""
+    return SessionManager.instance().session
+
+def format_connection_stats() -> str:
+    """连接复用统计的可读文本"""
+    stats = SessionManager.instance().connection_stats()
+    return f"网络连接：新建 {stats['connections_opened']} 个，复用 {stats['reused']} 次"
+
+# ===== 网络探测 =====
+# 说明没有到目标主机的路由的错误
+NO_ROUTE_ERRNOS = {errno.ENETUNREACH, errno.EHOSTUNREACH, errno.ENETDOWN, errno.EADDRNOTAVAIL}
+
+def _probe_host(host: str, port: int) -> Optional[str]:
+    """解析域名并查找路由（UDP connect 不发送数据包），没有路由时返回原因"""
+    try:
+        family, _, _, _, address = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+        with socket.socket(family, socket.SOCK_DGRAM) as sock:
+            sock.connect(address)
+    except socket.gaierror:
+        return "网络不可用"
+    except OSError as e:
+        return "网络不可用" if e.errno in NO_ROUTE_ERRNOS else None
+    return None
+
+def probe_network(urls: Iterable[str], timeout: float = 0.1) -> Optional[str]:
+    """快速判断是否无法访问各主机：全部确定不可达时返回原因，否则返回 None
+
+    无网络时域名解析或路由查找通常在几毫秒内失败；timeout 内无法判断（如DNS较慢）时按可访问处理，
+    由正常的请求超时决定结果。配置了代理时不探测（由代理访问官网）。
+    """
+    targets = set()
+    for url in urls:
+        parts = urlsplit(url)
+        if parts.hostname:
+            targets.add((parts.hostname, parts.port or (443 if parts.scheme == "https" else 80)))
+    proxies = getproxies()
+    if not targets or proxies.get("https") or proxies.get("http"):
+        return None
+
+    reasons: Dict[tuple, Optional[str]] = {}
+
+    def probe(host: str, port: int):
+        reasons[(host, port)] = _probe_host(host, port)
+
+    threads = [threading.Thread(target=probe, args=target, name="network-probe", daemon=True) for target in targets]
+    for t in threads:
+        t.start()
+    deadline = time.monotonic() + timeout
+    for t in threads:
+        t.join(max(0.0, deadline - time.monotonic()))
+
+    finished = dict(reasons)
+    if len(finished) == len(targets) and all(finished.values()):
+        return next(iter(finished.values()))
+    return None
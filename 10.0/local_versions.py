@@ -0,0 +1,262 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import os
+import threading
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import winreg
+except ImportError:
+    # 非 Windows 平台（如在 Linux 上测试）
+    winreg = None
+
+from services import installed_versions_config
+
+# ===== XML版本文件 =====
+class XmlVersionProvider:
+    """product_adapter_version.xml 的版本读取
+
+    - 以文件的 (修改时间, 大小) 为键缓存读取结果，文件未变化时不再解析
+    - 解析时用 iterparse 边读边解析，读到第一个 <version> 元素即停止
+    - hits / misses 统计缓存命中和实际解析的次数
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[Tuple[int, int], Optional[str]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def read(self, xml_path: str) -> Optional[str]:
+        """读取版本号，文件不存在时返回 None"""
+        try:
+            st = os.stat(xml_path)
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._cache.get(xml_path)
+            if cached is not None and cached[0] == stamp:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        version = self._parse(xml_path)
+        with self._lock:
+            self._cache[xml_path] = (stamp, version)
+        return version
+
+    @staticmethod
+    def _parse(xml_path: str) -> Optional[str]:
+        """查找根元素下第一个 <version> 元素（与 root.find(".//version") 相同），找到后不再读取文件其余部分"""
+        try:
+            with open(xml_path, "rb") as f:
+                root = target = None
+                for event, elem in ET.iterparse(f, events=("start", "end")):
+                    if event == "start":
+                        if root is None:
+                            root = elem
+                        elif target is None and elem.tag == "version":
+                            target = elem
+                    elif elem is target:
+                        return elem.text.strip()
+        except Exception as e:
+            return f"读取版本失败: {e}"
+        return None
+
+    def invalidate(self):
+        """清空缓存"""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        """缓存统计"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "files": len(self._cache)}
+
+_xml_provider = XmlVersionProvider()
+
+# ===== 注册表 =====
+class RegistryBackend:
+    """注册表访问后端（HKEY_LOCAL_MACHINE 下的键）
+
+    open_key 打开键并返回句柄，键不存在时抛出 OSError；last_write_time 返回键的最后写入时间；
+    enum_values 一次枚举键下的全部值。
+    """
+    name = ""
+
+    def open_key(self, path: str):
+        raise NotImplementedError
+
+    def close_key(self, handle):
+        raise NotImplementedError
+
+    def last_write_time(self, handle) -> int:
+        raise NotImplementedError
+
+    def enum_values(self, handle) -> Dict[str, object]:
+        raise NotImplementedError
+
+class WinregBackend(RegistryBackend):
+    """通过 winreg 访问Windows注册表"""
+    name = "winreg"
+
+    def open_key(self, path: str):
+        if winreg is None:
+            raise OSError("当前系统不支持注册表")
+        return winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path)
+
+    def close_key(self, handle):
+        winreg.CloseKey(handle)
+
+    def last_write_time(self, handle) -> int:
+        # QueryInfoKey 返回 (子键数, 值数, 最后写入时间)
+        return winreg.QueryInfoKey(handle)[2]
+
+    def enum_values(self, handle) -> Dict[str, object]:
+        values = {}
+        for index in range(winreg.QueryInfoKey(handle)[1]):
+            name, value, _ = winreg.EnumValue(handle, index)
+            values[name] = value
+        return values
+
+class FakeRegistryBackend(RegistryBackend):
+    """测试用后端：内存中的注册表，set_value 修改值并更新最后写入时间，统计打开和枚举次数"""
+    name = "fake"
+
+    def __init__(self, keys: Optional[Dict[str, Dict[str, object]]] = None):
+        self.keys = {path: dict(values) for path, values in (keys or {}).items()}
+        self.write_times = {path: 1 for path in self.keys}
+        self.opens = 0
+        self.enumerations = 0
+
+    def open_key(self, path: str):
+        self.opens += 1
+        if path not in self.keys:
+            raise FileNotFoundError(2, "系统找不到指定的文件。")
+        return path
+
+    def close_key(self, handle):
+        pass
+
+    def last_write_time(self, handle) -> int:
+        return self.write_times[handle]
+
+    def enum_values(self, handle) -> Dict[str, object]:
+        self.enumerations += 1
+        return dict(self.keys[handle])
+
+    def set_value(self, path: str, name: str, value: object):
+        """写入一个值（键不存在时创建）"""
+        self.keys.setdefault(path, {})[name] = value
+        self.write_times[path] = self.write_times.get(path, 0) + 1
+
+class RegistryVersionProvider:
+    """注册表中的版本读取
+
+    - 每次读取只打开一次键，先查询键的最后写入时间
+    - 最后写入时间未变化时使用缓存的全部值，变化时一次枚举键下的全部值
+    - hits / misses 统计使用缓存和重新枚举的次数
+    """
+    def __init__(self, backend: Optional[RegistryBackend] = None):
+        self.backend = backend or WinregBackend()
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[int, Dict[str, object]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def read_values(self, path: str) -> Dict[str, object]:
+        """读取键下的全部值，键无法打开时抛出异常"""
+        handle = self.backend.open_key(path)
+        try:
+            stamp = self.backend.last_write_time(handle)
+            with self._lock:
+                cached = self._cache.get(path)
+                if cached is not None and cached[0] == stamp:
+                    self.hits += 1
+                    return cached[1]
+            values = self.backend.enum_values(handle)
+        finally:
+            self.backend.close_key(handle)
+        with self._lock:
+            self.misses += 1
+            self._cache[path] = (stamp, values)
+        return values
+
+    def read_many(self, path: str, value_names: Iterable[str]) -> Dict[str, Optional[str]]:
+        """读取同一键下的多个版本号，出错的值为“读取版本失败: ...”"""
+        value_names = list(value_names)
+        try:
+            values = self.read_values(path)
+        except Exception as e:
+            return {name: f"读取版本失败: {e}" for name in value_names}
+        versions = {}
+        for name in value_names:
+            try:
+                if name not in values:
+                    raise FileNotFoundError(2, "系统找不到指定的文件。")
+                versions[name] = values[name].strip()
+            except Exception as e:
+                versions[name] = f"读取版本失败: {e}"
+        return versions
+
+    def invalidate(self):
+        """清空缓存"""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> dict:
+        """缓存统计"""
+        with self._lock:
+            return {"backend": self.backend.name, "hits": self.hits, "misses": self.misses, "keys": len(self._cache)}
+
+_registry_provider = RegistryVersionProvider()
+
+def get_registry_provider() -> RegistryVersionProvider:
+    """获取进程内共享的注册表版本读取器"""
+    return _registry_provider
+
+def set_registry_backend(backend: RegistryBackend) -> RegistryVersionProvider:
+    """更换注册表访问后端（如在 Linux 上使用 FakeRegistryBackend），返回新的读取器"""
+    global _registry_provider
+    _registry_provider = RegistryVersionProvider(backend)
+    return _registry_provider
+
+def get_xml_provider() -> XmlVersionProvider:
+    """获取进程内共享的XML版本读取器"""
+    return _xml_provider
+
+# ===== 本地版本读取 =====
+def get_local_version(xml_path: str) -> Optional[str]:
+    """从XML文件中获取本地版本号（文件未变化时直接返回缓存的结果）"""
+    return _xml_provider.read(xml_path)
+
+def get_registry_version(path: str, value_name: str) -> Optional[str]:
+    """从Windows注册表中获取版本号（键未被修改时直接返回缓存的值）"""
+    return _registry_provider.read_many(path, [value_name])[value_name]
+
+def read_installed_version(key: str) -> Optional[str]:
+    """按 installed_versions_config 读取应用的本地版本，未配置时返回 None"""
+    return read_installed_versions([key])[key]
+
+def read_installed_versions(keys: Iterable[str]) -> Dict[str, Optional[str]]:
+    """一次读取多个应用的本地版本（未配置的应用为 None）
+
+    同一注册表键下的多个版本只打开一次键，新增从注册表读取版本的应用不会增加打开次数。
+    """
+    versions: Dict[str, Optional[str]] = {}
+    registry_entries: Dict[str, List[Tuple[str, str]]] = {}  # 键路径 -> [(应用键, 值名称)]
+    for key in keys:
+        config = installed_versions_config.get(key)
+        versions[key] = None
+        if not config:
+            continue
+        if config["type"] == "xml":
+            versions[key] = get_local_version(config["path"])
+        elif config["type"] == "registry":
+            registry_entries.setdefault(config["path"], []).append((key, config["value_name"]))
+
+    for path, entries in registry_entries.items():
+        values = _registry_provider.read_many(path, [name for _, name in entries])
+        for key, name in entries:
+            versions[key] = values[name]
+    return versions
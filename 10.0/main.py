@@ -1,14 +1,20 @@
 # HUANCHUAN with Copilot by Trae  版本号：10.0.0
 
 import sys, os, json
+
+# --trace out.json：把启动、检查和界面更新记录为 Chrome 跟踪事件（先于其余导入开始，记录各模块的导入耗时）
+import tracing
+tracing.start_from_argv(sys.argv)
+
 import certifi
 from PySide6 import QtCore
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QFont
 from datetime import datetime
 
-import main_normal
-import main_transparency
+from auto_check import AutoCheckRunner
+from mode_switch import load_window_class, set_current_window
+from stall_watchdog import start_stall_watchdog
 
 # 设置TLS证书路径，解决打包后的TLS错误
 os.environ["REQUESTS_CA_BUNDLE"] = certifi.where()
@@ -49,16 +55,30 @@ def main():
     except Exception:
         pass
 
+    # --background：开机自启等场景，不显示窗口，只按计划自动检查，发现新版本时才打开窗口
+    background = "--background" in sys.argv
+
     # 启动应用
-    app = QApplication(sys.argv)
+    with tracing.span("QApplication"):
+        app = QApplication(sys.argv)
     app.setFont(QFont("HONOR Sans CN", 10))
 
-    if preferred_mode == "glass":
-        window = main_transparency.GlassWindow()
-    else:
-        window = main_normal.MainWindow()
+    # UI线程卡顿监测（config.json 的 stall_threshold_ms，默认关闭），窗口创建期间的阻塞也会记为卡顿
+    start_stall_watchdog(app)
 
-    window.show()
+    auto_check = AutoCheckRunner()
+    if background and auto_check.install_tray_icon(resource_path("resources/icon.png")):
+        app.setQuitOnLastWindowClosed(False)
+    else:
+        with tracing.span("create_window", mode=preferred_mode):
+            window = load_window_class(preferred_mode)()
+        set_current_window(window)
+        with tracing.span("show_window"):
+            window.show()
+    auto_check.start()
+    # 事件循环开始处理事件的时间（与窗口创建之间的空隙即启动时的阻塞）
+    if tracing.enabled():
+        QtCore.QTimer.singleShot(0, lambda: tracing.instant("event_loop_started"))
     sys.exit(app.exec())
 
 if __name__ == "__main__":
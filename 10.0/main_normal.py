@@ -1,17 +1,9 @@
 # HUANCHUAN with Copilot by Trae  版本号：10.0.0
 
 import json
-import subprocess
-from datetime import datetime
 import sys
 import os
-import re
-import xml.etree.ElementTree as ET
-import winreg
-import requests
-import threading
-import time
-from typing import Tuple, Optional, List
+from typing import Optional, Tuple
 import ctypes
 from ctypes import wintypes
 import certifi
@@ -19,10 +11,20 @@ import certifi
 # 设置TLS证书路径，解决打包后的TLS错误
 os.environ["REQUESTS_CA_BUNDLE"] = certifi.where()
 
-from bs4 import BeautifulSoup
+from card_state import CardState
+from check_window import CheckWindowMixin
+from fetch_engine import FetchEngine
+from http_session import SessionManager, format_connection_stats
+from local_versions import read_installed_versions
+from mode_switch import load_window_class, set_current_window, switch_mode
+from scheduler import get_scheduler
+from services import service_names, installed_versions_config, website_config
+from styles import normal_style_sheet, set_status_style
+from theme_watcher import ThemeWatcher, read_system_dark_mode
+import tracing
 from PySide6.QtCore import (
     Qt, QObject, Signal, QRect,
-    QEasingCurve, QPropertyAnimation, QUrl, QTimer
+    QEasingCurve, QPropertyAnimation, QUrl
 )
 from PySide6.QtGui import (
     QFont, QIcon, QColor, QPixmap, QDesktopServices
@@ -39,84 +41,7 @@ APP_NAME = "荣耀软件更新检查器"
 APP_VERSION = "10.0.0"
 COPYRIGHT_YEAR = "2025"
 
-# 应用名称映射
-service_names = {
-    "pc_manager": "荣耀电脑管家",
-    "honor_workstation": "荣耀超级工作台",
-    "yoyo_assistant": "荣耀 YOYO 助理"
-}
-
-# 服务安装路径和版本获取方式
-installed_versions_config = {
-    "pc_manager": {
-        "type": "xml",
-        "path": r"C:\\Program Files\\HONOR\\PCManager\\config\\product_adapter_version.xml"
-    },
-    "honor_workstation": {
-        "type": "registry",
-        "path": r"SOFTWARE\\HONOR\\Hihonornote",
-        "value_name": "HonorWorkStationVersion"
-    },
-    "yoyo_assistant": {
-        "type": "xml",
-        "path": r"C:\\Program Files\\HONOR\\HNMagicAI\\config\\product_adapter_version.xml"
-    }
-}
-
-# 官网页面配置
-website_config = {
-    "pc_manager": {
-        "url": "https://www.honor.com/cn/tech/pc-manager/",
-        "selector": ("p", "path")
-    },
-    "honor_workstation": {
-        "url": "https://www.honor.com/cn/tech/honor-workstation/",
-        "selector": ("div", "btn-text")
-    },
-    "yoyo_assistant": {
-        "url": "https://www.honor.com/cn/tech/pc-yoyo-assistant-2/",
-        "selector": ("p", "path")
-    }
-}
-
 # ===== 工具函数 =====
-def get_local_version(xml_path: str) -> Optional[str]:
-    """从XML文件中获取本地版本号"""
-    if os.path.exists(xml_path):
-        try:
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
-            version_elem = root.find(".//version")
-            if version_elem is not None:
-                return version_elem.text.strip()
-        except Exception as e:
-            return f"读取版本失败: {e}"
-    return None
-
-def get_registry_version(path: str, value_name: str) -> Optional[str]:
-    """从Windows注册表中获取版本号"""
-    try:
-        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path)
-        value, _ = winreg.QueryValueEx(key, value_name)
-        winreg.CloseKey(key)
-        return value.strip()
-    except Exception as e:
-        return f"读取版本失败: {e}"
-
-def version_tuple(v: str) -> Tuple[int, ...]:
-    """将版本字符串转换为元组，用于比较版本号"""
-    try:
-        return tuple(int(x) for x in v.strip().split(".") if x.isdigit())
-    except ValueError:
-        return (0,)
-
-def clean_version(v: str, remove_patch: bool = True) -> str:
-    """清理版本字符串，移除多余信息"""
-    v = v.replace("Version", "").replace("版本", "").strip()
-    if remove_patch:
-        v = re.sub(r"\(.*?\)", "", v).strip()
-    return v
-
 def resource_path(relative_path: str) -> str:
     """获取资源文件的绝对路径（兼容PyInstaller打包后）"""
     if hasattr(sys, "_MEIPASS"):  # PyInstaller 打包后的临时目录
@@ -135,17 +60,8 @@ class ThemeManager:
         self.load_system_theme()
         
     def load_system_theme(self):
-        """加载系统主题设置"""
-        try:
-            # 尝试从Windows注册表获取系统主题设置
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, 
-                               r"SOFTWARE\Microsoft\Windows\CurrentVersion\Themes\Personalize")
-            value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
-            winreg.CloseKey(key)
-            self.is_dark_mode = value == 0
-        except:
-            # 默认使用浅色主题
-            self.is_dark_mode = False
+        """加载系统主题设置（读取失败时默认使用浅色主题）"""
+        self.is_dark_mode = read_system_dark_mode()
     
     def toggle_theme(self):
         """切换主题模式"""
@@ -153,119 +69,17 @@ class ThemeManager:
         return self.is_dark_mode
     
     def get_style_sheet(self) -> str:
-        """获取当前主题的样式表"""
-        if self.is_dark_mode:
-            return self._get_dark_style_sheet()
-        else:
-            return self._get_light_style_sheet()
-    
-    def _get_light_style_sheet(self) -> str:
-        """获取浅色主题样式表"""
-        return """
-            /* 主窗口样式 */
-            MainWindow {
-                background-color: #f3f3f3;
-                color: #212529;
-            }
-            
-            /* 卡片样式 */
-            .Card {
-                background-color: #ffffff;
-                border-radius: 12px;
-                border: 1px solid #e9ecef;
-                padding: 16px;
-                margin: 8px;
-            }
-            
-            /* 按钮样式 */
-            .PrimaryButton {
-                background-color: #3773e8;
-                color: white;
-                border: none;
-                border-radius: 20px;
-                padding: 8px 24px;
-                font-size: 14px;
-                font-weight: 500;
-            }
-            .PrimaryButton:hover {
-                background-color: #4285f4;
-            }
-            .PrimaryButton:pressed {
-                background-color: #2c66d4;
-            }
-            
-            /* 状态标签样式 */
-            .StatusLabel {
-                font-weight: 500;
-                padding: 4px 8px;
-                border-radius: 12px;
-                font-size: 12px;
-            }
-            
-            /* 信息文本样式 */
-            .InfoText {
-                color: #6c757d;
-                font-size: 12px;
-            }
-        """
-    
-    def _get_dark_style_sheet(self) -> str:
-        """获取深色主题样式表"""
-        return """
-            /* 主窗口样式 */
-            MainWindow {
-                background-color: #1e1e1e;
-                color: #f3f3f3;
-            }
-            
-            /* 卡片样式 */
-            .Card {
-                background-color: #2d2d2d;
-                border-radius: 12px;
-                border: 1px solid #404040;
-                padding: 16px;
-                margin: 8px;
-            }
-            
-            /* 按钮样式 */
-            .PrimaryButton {
-                background-color: #3773e8;
-                color: white;
-                border: none;
-                border-radius: 20px;
-                padding: 8px 24px;
-                font-size: 14px;
-                font-weight: 500;
-            }
-            .PrimaryButton:hover {
-                background-color: #4285f4;
-            }
-            .PrimaryButton:pressed {
-                background-color: #2c66d4;
-            }
-            
-            /* 状态标签样式 */
-            .StatusLabel {
-                font-weight: 500;
-                padding: 4px 8px;
-                border-radius: 12px;
-                font-size: 12px;
-            }
-            
-            /* 信息文本样式 */
-            .InfoText {
-                color: #adb5bd;
-                font-size: 12px;
-            }
-        """
+        """获取当前主题的样式表（每个主题只生成一次）"""
+        return normal_style_sheet(self.is_dark_mode)
 
 # ===== 工作线程通信对象 =====
 class WorkerBridge(QObject):
     """用于工作线程与UI线程通信的桥梁"""
     update_progress = Signal(int, str)
-    update_result = Signal(str, dict)
-    check_complete = Signal()
+    update_result = Signal(str, object)  # (应用键, CardState)
+    check_complete = Signal(object)  # 结束的检查任务（workers.Task）
     show_message = Signal(str, str, int)
+    theme_changed = Signal(bool)  # 系统主题变化（True 为深色）
 
 # ===== 自定义渐变按钮 =====
 class GradientButton(QPushButton):
@@ -353,9 +167,11 @@ class SoftwareCard(QFrame):
         self.name = name
         self.icon_path = icon_path
         
-        # 现在卡片样式通过主题管理系统在update_card_theme方法中设置
+        # 当前显示的状态（CardState），更新时只重绘发生变化的字段
+        self.state: Optional[CardState] = None
+        
+        # 卡片样式由主窗口的整窗样式表按 objectName 设置
         self.setObjectName("SoftwareCard")
-        self.setStyleSheet("QFrame#SoftwareCard { margin: 8px; }")
         
         # 添加阴影效果
         shadow = QGraphicsDropShadowEffect(self)
@@ -383,101 +199,6 @@ class SoftwareCard(QFrame):
         self.fade_animation = QPropertyAnimation(self, b"windowOpacity")
         self.fade_animation.setDuration(500)
         
-    def update_card_theme(self, is_dark_mode: bool):
-        """根据主题更新卡片样式"""
-        if is_dark_mode:
-            # 深色模式样式
-            card_style = """
-                QFrame#SoftwareCard {
-                    background-color: #2d2d2d;
-                    border-radius: 16px;
-                    border: 1px solid #404040;
-                    padding: 20px;
-                }
-                QFrame#SoftwareCard:disabled {
-                    opacity: 0.7;
-                }
-            """
-            text_color = "#f3f3f3"
-            info_color = "#adb5bd"
-        else:
-            # 浅色模式样式 - 优化版本
-            card_style = """
-                QFrame#SoftwareCard {
-                    background-color: white;
-                    border-radius: 16px;
-                    border: 1px solid #e9ecef;
-                    padding: 20px;
-                    box-shadow: 0 4px 12px rgba(0, 0, 0, 0.05);
-                    transition: all 0.3s ease;
-                }
-                QFrame#SoftwareCard:hover {
-                    box-shadow: 0 6px 16px rgba(0, 0, 0, 0.08);
-                    border-color: #dee2e6;
-                }
-                QFrame#SoftwareCard:disabled {
-                    opacity: 0.7;
-                }
-            """
-            text_color = "#495057"
-            info_color = "#6c757d"
-        
-        # 更新卡片样式
-        self.setStyleSheet(card_style)
-        
-        # 更新文本颜色，确保文字不透明
-        self.name_label.setStyleSheet(f"color: {text_color}; background-color: transparent;")
-        
-        # 更新版本标签颜色，确保文字不透明
-        for label in [self.local_version_value, self.online_version_value]:
-            label.setStyleSheet(f"color: {text_color}; background-color: transparent;")
-        
-        # 更新状态标签颜色（如果已经设置了状态），确保背景和文字都不透明
-        current_status = self.status_label.text()
-        if "已是最新版本" in current_status:
-            self.status_label.setStyleSheet(f"""
-                QLabel#StatusLabel {{
-                    background-color: rgba(45, 62, 54, 1.0);
-                    color: rgba(146, 208, 80, 1.0);
-                    border-radius: 12px;
-                    padding: 4px 8px;
-                    font-size: 12px;
-                }}
-            """)
-        elif "有更新可用" in current_status:
-            self.status_label.setStyleSheet(f"""
-                QLabel#StatusLabel {{
-                    background-color: rgba(62, 54, 45, 1.0);
-                    color: rgba(255, 193, 7, 1.0);
-                    border-radius: 12px;
-                    padding: 4px 8px;
-                    font-size: 12px;
-                }}
-            """)
-        elif "检查失败" in current_status:
-            self.status_label.setStyleSheet(f"""
-                QLabel#StatusLabel {{
-                    background-color: rgba(62, 45, 45, 1.0);
-                    color: rgba(255, 107, 107, 1.0);
-                    border-radius: 12px;
-                    padding: 4px 8px;
-                    font-size: 12px;
-                }}
-            """)
-        elif "未知" in current_status:
-            self.status_label.setStyleSheet(f"""
-                QLabel#StatusLabel {{
-                    background-color: #2d2d3e;
-                    color: #adb5bd;
-                    border-radius: 12px;
-                    padding: 4px 8px;
-                    font-size: 12px;
-                }}
-            """)
-        
-        # 默认设置为半透明，等待数据加载后显示
-        self.setWindowOpacity(0.7)
-    
     def _create_header_section(self):
         """创建卡片顶部信息区"""
         header_layout = QHBoxLayout()
@@ -495,6 +216,7 @@ class SoftwareCard(QFrame):
         
         # 软件名称
         self.name_label = QLabel(self.name)
+        self.name_label.setObjectName("CardName")
         name_font = QFont("HONOR Sans CN", 16, QFont.Bold)
         name_font.setStyleStrategy(QFont.PreferAntialias)
         self.name_label.setFont(name_font)
@@ -516,6 +238,7 @@ class SoftwareCard(QFrame):
         local_version_label.setStyleSheet("color: #6c757d;")
         
         self.local_version_value = QLabel("加载中...")
+        self.local_version_value.setObjectName("VersionValue")
         self.local_version_value.setTextInteractionFlags(Qt.TextSelectableByMouse)
         
         # 官网版本
@@ -523,6 +246,7 @@ class SoftwareCard(QFrame):
         online_version_label.setStyleSheet("color: #6c757d;")
         
         self.online_version_value = QLabel("加载中...")
+        self.online_version_value.setObjectName("VersionValue")
         self.online_version_value.setTextInteractionFlags(Qt.TextSelectableByMouse)
         
         # 添加到布局
@@ -546,24 +270,10 @@ class SoftwareCard(QFrame):
         
         # 更新链接按钮
         self.download_button = QPushButton("更新链接")
-        self.download_button.setStyleSheet("""
-            QPushButton {
-                background-color: #3773e8;
-                color: white;
-                border: none;
-                border-radius: 16px;
-                padding: 6px 16px;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: #4285f4;
-            }
-            QPushButton:disabled {
-                background-color: #adb5bd;
-                color: #6c757d;
-            }
-        """)
+        self.download_button.setObjectName("DownloadButton")
         self.download_button.setVisible(False)
+        # 只连接一次，点击时打开当前状态的链接
+        self.download_button.clicked.connect(self.open_download_url)
         
         status_layout.addWidget(self.status_label)
         status_layout.addStretch()
@@ -571,77 +281,46 @@ class SoftwareCard(QFrame):
         
         self.main_layout.addLayout(status_layout)
     
-    def update_info(self, local_version: str, online_version: str, status: str, 
-                   status_type: str, download_url: str = ""):
-        """更新卡片信息"""
-        # 更新版本信息
-        self.local_version_value.setText(local_version or "未知")
-        self.online_version_value.setText(online_version or "未知")
-        
-        # 更新状态标签
-        self.status_label.setText(status)
-        
-        # 保存状态类型，用于主题变化时重新应用样式
-        self.status_type = status_type
-        
-        # 根据状态类型设置样式
-        if status_type == "up_to_date":
-            self.status_label.setStyleSheet("""
-                QLabel#StatusLabel {
-                    background-color: #d4edda;
-                    color: #155724;
-                    padding: 4px 12px;
-                    border-radius: 16px;
-                    font-weight: 500;
-                }
-            """)
-            self.download_button.setVisible(False)
-        elif status_type == "update_available":
-            self.status_label.setStyleSheet("""
-                QLabel#StatusLabel {
-                    background-color: #fff3cd;
-                    color: #856404;
-                    padding: 4px 12px;
-                    border-radius: 16px;
-                    font-weight: 500;
-                }
-            """)
-            if download_url:
-                self.download_button.setVisible(True)
-                self.download_button.clicked.connect(lambda: QDesktopServices.openUrl(QUrl(download_url)))
-        elif status_type == "error":
-            self.status_label.setStyleSheet("""
-                QLabel#StatusLabel {
-                    background-color: #f8d7da;
-                    color: #721c24;
-                    padding: 4px 12px;
-                    border-radius: 16px;
-                    font-weight: 500;
-                }
-            """)
-            self.download_button.setVisible(False)
-        elif status_type == "higher_version":
-            self.status_label.setStyleSheet("""
-                QLabel#StatusLabel {
-                    background-color: #d1ecf1;
-                    color: #0c5460;
-                    padding: 4px 12px;
-                    border-radius: 16px;
-                    font-weight: 500;
-                }
-            """)
-            if download_url:
-                self.download_button.setVisible(True)
-                self.download_button.setText("官网链接")
-                self.download_button.clicked.connect(lambda: QDesktopServices.openUrl(QUrl(download_url)))
+    def apply_state(self, state: CardState) -> Tuple[str, ...]:
+        """应用新的显示状态，只更新发生变化的字段，返回变化的字段"""
+        changed = state.changed_fields(self.state)
+        if not changed:
+            return changed
+        first_time = self.state is None
+        self.state = state
         
-        # 显示完整内容的动画
-        self.fade_in()
+        # 更新版本信息
+        if "local_version" in changed:
+            self.local_version_value.setText(state.local_version)
+        if "online_version" in changed:
+            self.online_version_value.setText(state.online_version)
+        
+        # 更新状态标签（切换 status 动态属性，样式在整窗样式表中）
+        if "status" in changed:
+            self.status_label.setText(state.status)
+        if "status_type" in changed:
+            set_status_style(self.status_label, state.status_type)
+        
+        # 更新链接按钮（点击信号在创建时已连接一次，这里只更新显示）
+        if "status_type" in changed or "download_url" in changed:
+            self.download_button.setText(state.link_text)
+            self.download_button.setVisible(state.show_link)
+        
+        # 首次显示结果时播放淡入动画
+        if first_time:
+            self.fade_in()
+        return changed
+    
+    def open_download_url(self):
+        """打开当前状态的链接"""
+        if self.state is not None and self.state.download_url:
+            QDesktopServices.openUrl(QUrl(self.state.download_url))
     
     def fade_in(self):
         """淡入动画"""
         self.fade_animation.setStartValue(self.windowOpacity())
         self.fade_animation.setEndValue(1.0)
+        tracing.animation_started(self.fade_animation, f"fade_in {self.software_key}")
         self.fade_animation.start()
 
 # ===== 自定义进度条 =====
@@ -678,7 +357,7 @@ class AboutDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("关于荣耀软件更新检查器")
         self.setModal(True)
-        self.setFixedSize(340, 240)
+        self.setFixedSize(340, 280)
         
         # 记录点击次数
         self.click_count = 0
@@ -702,6 +381,13 @@ class AboutDialog(QDialog):
                 font-size: 14px;
                 color: #3773e8;
             }
+            QLabel#NetworkLabel {
+                font-size: 11px;
+                color: #6c757d;
+            }
+            QLabel#DiagnosticsLabel {
+                font-size: 11px;
+            }
         """)
         
         # 创建布局
@@ -738,12 +424,25 @@ class AboutDialog(QDialog):
         self.feedback_label = QLabel("反馈/建议：请使用 QQ 联系 HUANCHUAN")
         self.feedback_label.setAlignment(Qt.AlignCenter)
         
+        # 网络连接复用统计
+        self.network_label = QLabel(format_connection_stats())
+        self.network_label.setObjectName("NetworkLabel")
+        self.network_label.setAlignment(Qt.AlignCenter)
+        
+        # 检查耗时诊断入口
+        self.diagnostics_label = QLabel('<a href="#diagnostics">检查耗时诊断</a>')
+        self.diagnostics_label.setObjectName("DiagnosticsLabel")
+        self.diagnostics_label.setAlignment(Qt.AlignCenter)
+        self.diagnostics_label.linkActivated.connect(self.open_diagnostics_dialog)
+        
         # 添加到布局
         self.main_layout.addWidget(self.icon_label)
         self.main_layout.addWidget(self.title_label)
         self.main_layout.addWidget(self.version_label)
         self.main_layout.addWidget(self.copyright_label)
         self.main_layout.addWidget(self.feedback_label)
+        self.main_layout.addWidget(self.network_label)
+        self.main_layout.addWidget(self.diagnostics_label)
     
     def set_windows_title_bar_color(self, hex_color):
         """设置Windows窗口标题栏颜色和文字颜色"""
@@ -811,6 +510,13 @@ class AboutDialog(QDialog):
                         font-size: 14px;
                         color: #4285f4;
                     }
+                    QLabel#NetworkLabel {
+                        font-size: 11px;
+                        color: #adb5bd;
+                    }
+                    QLabel#DiagnosticsLabel {
+                        font-size: 11px;
+                    }
                 """)
                 # 设置标题栏颜色为深色主题背景色
                 self.set_windows_title_bar_color("#2d2d2d")
@@ -836,6 +542,15 @@ class AboutDialog(QDialog):
         """打开版本修改对话框"""
         if hasattr(self.parent_window, 'open_manual_version_dialog'):
             self.parent_window.open_manual_version_dialog()
+    
+    def open_diagnostics_dialog(self, link=None):
+        """打开检查耗时诊断对话框"""
+        # 只在打开时导入（对话框很少使用，不计入启动时间）
+        from diagnostics_dialog import DiagnosticsDialog
+
+        theme_manager = getattr(self.parent_window, 'theme_manager', None)
+        dialog = DiagnosticsDialog(self, bool(theme_manager and theme_manager.is_dark_mode))
+        dialog.exec()
 
 # ===== 手动版本输入对话框 =====
 class ManualVersionDialog(QDialog):
@@ -947,9 +662,13 @@ class ManualVersionDialog(QDialog):
     def reset_to_local_versions(self):
         """还原为本地检测的版本号"""
         if hasattr(self.parent(), 'software_cards'):
+            # 重新检测本地版本号（不使用手动设置的版本），同一注册表键只打开一次
+            local_versions = read_installed_versions(self.version_inputs)
             for app_key, line_edit in self.version_inputs.items():
-                # 重新检测本地版本号（不使用手动设置的版本）
-                local_version = self._get_local_version_directly(app_key)
+                if app_key in installed_versions_config:
+                    local_version = local_versions[app_key]
+                else:
+                    local_version = "配置不存在"
                 line_edit.setText(local_version or "")
             
             # 显示还原成功的提示
@@ -960,19 +679,6 @@ class ManualVersionDialog(QDialog):
                     QMessageBox.Information
                 )
     
-    def _get_local_version_directly(self, app_key: str) -> str:
-        """直接获取本地版本号（不依赖手动设置）"""
-        if app_key in installed_versions_config:
-            config = installed_versions_config[app_key]
-            try:
-                if config["type"] == "xml":
-                    return get_local_version(config["path"])
-                elif config["type"] == "registry":
-                    return get_registry_version(config["path"], config["value_name"])
-            except Exception:
-                return "检测失败"
-        return "配置不存在"
-    
     def set_windows_title_bar_color(self, hex_color):
         """设置Windows窗口标题栏颜色和文字颜色"""
         try:
@@ -1064,13 +770,18 @@ class ManualVersionDialog(QDialog):
             self.set_windows_title_bar_color("#f3f3f3")
 
 # ===== 主窗口类 =====
-class MainWindow(QWidget):
+class MainWindow(CheckWindowMixin, QWidget):
     """主窗口类"""
-    def __init__(self):
+    @tracing.traced()
+    def __init__(self, initial_state: Optional[dict] = None):
         super().__init__()
         # 设置主题管理器
         self.theme_manager = ThemeManager()
         
+        # 共享的HTTP会话：在构建窗口的同时后台预连接官网，首次检查直接复用连接
+        self.session_manager = SessionManager.instance()
+        self.session_manager.preconnect(info["url"] for info in website_config.values())
+        
         # 初始化样式表
         self.style_sheet = ""
         
@@ -1083,11 +794,6 @@ class MainWindow(QWidget):
         if os.path.exists(icon_path):
             self.setWindowIcon(QIcon(icon_path))
         
-        # 创建定时器用于检测系统主题变化
-        self.theme_timer = QTimer(self)
-        self.theme_timer.timeout.connect(self.check_system_theme_change)
-        self.theme_timer.start(1000)  # 每秒检查一次主题变化
-        
         # 加载图标路径
         self.icon_files = {
             "pc_manager": resource_path("resources/pc_manager.png"),
@@ -1095,13 +801,11 @@ class MainWindow(QWidget):
             "yoyo_assistant": resource_path("resources/yoyo_assistant.png")
         }
         
-        # 初始化状态
-        self.running = False
-        self.auto_check_enabled = True
-        self.check_interval = 3  # 默认每周检查
-        
-        # 存储手动设置的版本号
-        self.manual_versions = {}
+        # 初始化检查相关的状态（手动版本号、检查结果、快照结果、进度）
+        self._init_check_state()
+        # 自动检查设置来自 config.json（默认每周检查），定期检查由 scheduler.CheckScheduler 负责
+        self.auto_check_enabled = get_scheduler().enabled
+        self.check_interval = get_scheduler().check_interval
         
         # 创建主布局
         self.main_layout = QVBoxLayout(self)
@@ -1120,19 +824,36 @@ class MainWindow(QWidget):
         # 创建按钮区域
         self._create_buttons()
         
-        # 创建线程通信桥
+        # 创建并发抓取引擎（按主机限流，结果按完成顺序返回）
+        self.fetch_engine = FetchEngine()
+        
+        # 创建线程通信桥（跟踪时记录信号从工作线程发出到UI线程处理的等待）
         self.worker_bridge = WorkerBridge()
-        self.worker_bridge.update_progress.connect(self.update_progress)
-        self.worker_bridge.update_result.connect(self.update_card_result)
-        self.worker_bridge.check_complete.connect(self.on_check_complete)
-        self.worker_bridge.show_message.connect(self.show_message)
+        tracing.connect_traced(self.worker_bridge.update_progress, self.update_progress, "update_progress")
+        tracing.connect_traced(self.worker_bridge.update_result, self.update_card_result, "update_result")
+        tracing.connect_traced(self.worker_bridge.check_complete, self.on_check_complete, "check_complete")
+        tracing.connect_traced(self.worker_bridge.show_message, self.show_message, "show_message")
+        tracing.connect_traced(self.worker_bridge.theme_changed, self.on_system_theme_changed, "theme_changed")
+        
+        # 监听系统主题变化（注册表变更通知，主题不变时没有任何周期性工作）
+        self.theme_watcher = ThemeWatcher(
+            self.worker_bridge.theme_changed.emit,
+            initial=self.theme_manager.is_dark_mode
+        )
+        self.theme_watcher.start()
         
         # 应用主题
         self.apply_theme()
         
-        # 如果启用了自动检查，就开始检查
-        if self.auto_check_enabled:
-            self.run_check()
+        if initial_state:
+            # 从通透模式切换而来，沿用原窗口的检查结果
+            self.restore_state(initial_state)
+        else:
+            # 先显示上次保存的检查结果，不必等待网络请求
+            self.show_snapshot()
+            if self.auto_check_enabled:
+                # 如果启用了自动检查，就在后台重新检查，只更新结果变化的卡片
+                self.run_check()
     
     def _create_header(self):
         """创建窗口顶部区域"""
@@ -1215,15 +936,6 @@ class MainWindow(QWidget):
         """创建进度条区域"""
         self.progress_frame = QFrame()
         self.progress_frame.setObjectName("ProgressFrame")
-        self.progress_frame.setStyleSheet("""
-            QFrame#ProgressFrame {
-                background-color: white;
-                border-radius: 12px;
-                border: 1px solid #e9ecef;
-                padding: 16px;
-                margin-top: 0;
-            }
-        """)
         
         progress_layout = QVBoxLayout(self.progress_frame)
         progress_layout.setContentsMargins(0, 0, 0, 0)
@@ -1231,7 +943,7 @@ class MainWindow(QWidget):
         
         # 进度条标签
         self.progress_label = QLabel("准备检查更新...")
-        self.progress_label.setStyleSheet("color: #495057;")
+        self.progress_label.setObjectName("ProgressLabel")
         
         # 进度条
         self.progress_bar = CustomProgressBar()
@@ -1249,9 +961,10 @@ class MainWindow(QWidget):
         """创建结果显示区域"""
         # 创建滚动区域
         self.scroll_area = QScrollArea()
+        self.scroll_area.setObjectName("ResultsArea")
         self.scroll_area.setWidgetResizable(True)
         
-        # 初始设置简单样式，具体样式在apply_theme中设置
+        # 样式在整窗样式表中设置
         
         # 滚动区域内容
         scroll_content = QWidget()
@@ -1261,14 +974,17 @@ class MainWindow(QWidget):
         
         # 添加占位符
         self.placeholder_label = QLabel("点击下方按钮开始检查更新")
+        self.placeholder_label.setObjectName("PlaceholderLabel")
         self.placeholder_label.setAlignment(Qt.AlignCenter)
-        self.placeholder_label.setStyleSheet("""
-            color: #adb5bd;
-            font-size: 14px;
-            padding: 40px;
-        """)
         self.results_layout.addWidget(self.placeholder_label)
         
+        # 快照结果提示（先显示上次保存的结果时可见，全部卡片刷新后隐藏）
+        self.stale_label = QLabel()
+        self.stale_label.setObjectName("StaleLabel")
+        self.stale_label.setAlignment(Qt.AlignCenter)
+        self.stale_label.setVisible(False)
+        self.results_layout.addWidget(self.stale_label)
+        
         # 创建软件卡片
         self.software_cards = {}
         for key, name in service_names.items():
@@ -1297,24 +1013,12 @@ class MainWindow(QWidget):
         self.check_button = GradientButton("检查更新")
         self.check_button.setFixedHeight(40)
         self.check_button.setMinimumWidth(160)
-        self.check_button.clicked.connect(self.run_check)
+        self.check_button.clicked.connect(self.run_manual_check)
         
         # 全部展开按钮（默认隐藏）
         self.expand_button = QPushButton("全部展开")
+        self.expand_button.setObjectName("ExpandButton")
         self.expand_button.setFixedHeight(40)
-        self.expand_button.setStyleSheet("""
-            QPushButton {
-                background-color: white;
-                color: #495057;
-                border: 1px solid #dee2e6;
-                border-radius: 20px;
-                padding: 0 16px;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #f3f3f3;
-            }
-        """)
         self.expand_button.setVisible(False)
         
         buttons_layout.addStretch()
@@ -1368,164 +1072,36 @@ class MainWindow(QWidget):
             # 忽略错误，确保程序正常运行
             pass
     
+    @tracing.traced()
     def apply_theme(self):
-        """应用当前主题"""
-        # 保存当前样式表
-        self.style_sheet = self.theme_manager.get_style_sheet()
-        
-        # 应用全局样式表
-        self.setStyleSheet(self.style_sheet)
-        
-        # 设置窗口背景色和标题栏颜色（保持一致）
-        if self.theme_manager.is_dark_mode:
-            bg_color = "#1e1e1e"
-        else:
-            bg_color = "#f3f3f3"
+        """应用当前主题
         
-        # 设置窗口背景色
-        self.setStyleSheet(self.styleSheet() + f"""
-            MainWindow {{
-                background-color: {bg_color};
-            }}
-        """)
+        整窗样式表按主题缓存（见 styles.py），只在主窗口上设置一次，
+        卡片和状态标签通过 objectName 与 status 动态属性匹配，不再逐个控件设置样式表。
+        """
+        self.style_sheet = self.theme_manager.get_style_sheet()
+        if self.styleSheet() != self.style_sheet:
+            self.setStyleSheet(self.style_sheet)
         
         # 设置Windows标题栏颜色以匹配窗口背景
+        bg_color = "#1e1e1e" if self.theme_manager.is_dark_mode else "#f3f3f3"
         self.set_windows_title_bar_color(bg_color)
-        
-        # 更新组件样式
-        self._update_components_style()
     
-    def check_system_theme_change(self):
-        """检查系统主题是否发生变化"""
-        try:
-            # 保存当前主题状态
-            old_is_dark_mode = self.theme_manager.is_dark_mode
-            
-            # 重新加载系统主题设置
-            self.theme_manager.load_system_theme()
-            
-            # 如果主题发生变化，重新应用主题
-            if old_is_dark_mode != self.theme_manager.is_dark_mode:
-                self.apply_theme()
-                
-                # 遍历所有软件卡片，更新它们的主题
-                for card in self.software_cards.values():
-                    card.update_card_theme(self.theme_manager.is_dark_mode)
-                    # 如果卡片可见且已显示信息，重新应用状态标签样式
-                    if card.isVisible() and hasattr(card, 'status_label') and hasattr(card, 'status_type'):
-                        # 获取当前状态信息
-                        local_version = card.local_version_value.text() if hasattr(card, 'local_version_value') else ''
-                        online_version = card.online_version_value.text() if hasattr(card, 'online_version_value') else ''
-                        status = card.status_label.text()
-                        status_type = getattr(card, 'status_type', 'up_to_date')
-                        # 重新应用状态标签样式
-                        card.update_info(local_version, online_version, status, status_type)
-        except Exception:
-            # 忽略错误，确保程序正常运行
-            pass
-            
-    def _update_components_style(self):
-        """更新各个组件的样式"""
-        # 选项框样式
-        if self.theme_manager.is_dark_mode:
-            frame_bg_color = "#2d2d2d"
-            frame_border_color = "#404040"
-        else:
-            frame_bg_color = "white"
-            frame_border_color = "#e9ecef"
-        # 普通模式下的样式
-        options_style = f""
-        options_style += f"    background-color: {frame_bg_color};\n"
-        options_style += "    border-radius: 12px;\n"
-        options_style += f"    border: 1px solid {frame_border_color};\n"
-        options_style += "    padding: 16px;\n"
-        
-        # 进度框样式
-        progress_style = options_style
-        # 使用字符串拼接避免大括号冲突
-        progress_sheet = "QFrame#ProgressFrame { " + progress_style + " margin-top: 0; }"
-        self.findChild(QFrame, "ProgressFrame").setStyleSheet(progress_sheet)
-        
-        # 更新文字颜色
-        text_color = "#495057" if not self.theme_manager.is_dark_mode else "#f3f3f3"
-        info_color = "#6c757d" if not self.theme_manager.is_dark_mode else "#adb5bd"
-        
-        # 使用字符串拼接替代f-string以避免语法冲突
-        self.progress_label.setStyleSheet("color: " + text_color + ";")
-        self.placeholder_label.setStyleSheet("color: " + info_color + "; font-size: 14px; padding: 40px;")
-        
-        # 更新软件卡片样式
-        for card in self.software_cards.values():
-            card.update_card_theme(self.theme_manager.is_dark_mode)
-        
-        # 更新下载按钮样式
-        border_color = "#dee2e6" if not self.theme_manager.is_dark_mode else "#404040"
-        bg_color = "white" if not self.theme_manager.is_dark_mode else "#2d2d2d"
-        hover_color = "#f3f3f3" if not self.theme_manager.is_dark_mode else "#3a3a3a"
-        
-        # 构建样式表字符串
-        style_sheet = ""
-        style_sheet += "QPushButton {\n"
-        style_sheet += "    background-color: " + bg_color + ";\n"
-        style_sheet += "    color: " + text_color + ";\n"
-        style_sheet += "    border: 1px solid " + border_color + ";\n"
-        style_sheet += "    border-radius: 20px;\n"
-        style_sheet += "    padding: 0 16px;\n"
-        style_sheet += "    font-size: 13px;\n"
-        style_sheet += "}\n"
-        style_sheet += "QPushButton:hover {\n"
-        style_sheet += "    background-color: " + hover_color + ";\n"
-        style_sheet += "}"
-        
-        self.expand_button.setStyleSheet(style_sheet)
-        
-        # 更新滚动条样式（隐藏滚动条）
-        if not self.theme_manager.is_dark_mode:
-            # 浅色模式滚动条样式 - 隐藏滚动条
-            scrollbar_style = """
-                QScrollArea {
-                    border: none;
-                    background-color: transparent;
-                }
-                QScrollBar:vertical {
-                    width: 0px;
-                    background-color: transparent;
-                    margin: 0;
-                }
-                QScrollBar::handle:vertical {
-                    background-color: transparent;
-                    width: 0px;
-                }
-                QScrollBar::add-line:vertical,
-                QScrollBar::sub-line:vertical {
-                    height: 0px;
-                    subcontrol-origin: margin;
-                }
-            """
-        else:
-            # 深色模式滚动条样式 - 隐藏滚动条
-            scrollbar_style = """
-                QScrollArea {
-                    border: none;
-                    background-color: transparent;
-                }
-                QScrollBar:vertical {
-                    width: 0px;
-                    background-color: transparent;
-                    margin: 0;
-                }
-                QScrollBar::handle:vertical {
-                    background-color: transparent;
-                    width: 0px;
-                }
-                QScrollBar::add-line:vertical,
-                QScrollBar::sub-line:vertical {
-                    height: 0px;
-                    subcontrol-origin: margin;
-                }
-            """
+    def on_system_theme_changed(self, is_dark_mode: bool):
+        """系统主题变化时重新应用主题（由主题监听器触发）
         
-        self.scroll_area.setStyleSheet(scrollbar_style)
+        卡片和状态标签的样式都在整窗样式表中，只需换用另一个主题的缓存样式表。
+        """
+        if is_dark_mode != self.theme_manager.is_dark_mode:
+            self.theme_manager.is_dark_mode = is_dark_mode
+            self.apply_theme()
+
+    def closeEvent(self, event):
+        """关闭窗口时取消正在进行的检查，停止主题监听"""
+        if self.check_worker is not None:
+            self.check_worker.cancel("窗口已关闭")
+        self.theme_watcher.stop()
+        super().closeEvent(event)
 
     def open_about(self):
         """打开关于对话框"""
@@ -1561,66 +1137,12 @@ class MainWindow(QWidget):
                 QMessageBox.Information
             )
     
-    def run_check(self):
-        """运行更新检查"""
-        if self.running:
-            return
-        
-        self.running = True
-        self.check_button.setEnabled(False)
-        self.check_button.setText("正在检查...")
-        
-        # 显示进度条区域
-        self.progress_frame.setVisible(True)
-        self.progress_bar.setValue(0)
-        
-        # 隐藏占位符，显示所有选中的卡片
-        self.placeholder_label.setVisible(False)
-        
-        # 检查所有服务
-        selected_services = list(service_names.keys())
-        
-        # 创建工作线程
-        t = threading.Thread(
-            target=self.check_task,
-            args=(selected_services,),
-            daemon=True
-        )
-        t.start()
-    
-    def update_progress(self, value: int, message: str):
-        """更新进度条"""
-        self.progress_bar.setValue(value)
-        self.progress_label.setText(message)
-    
-    def update_card_result(self, service_key: str, result: dict):
-        """更新卡片显示结果"""
-        if service_key in self.software_cards:
-            card = self.software_cards[service_key]
-            card.setVisible(True)
-            card.update_info(
-                result.get("local_version", ""),
-                result.get("online_version", ""),
-                result.get("status", ""),
-                result.get("status_type", ""),
-                result.get("download_url", "")
-            )
-    
-    def on_check_complete(self):
-        """检查完成后的处理"""
-        self.running = False
-        self.check_button.setEnabled(True)
-        self.check_button.setText("检查更新")
-        
-        # 隐藏进度条
-        self.progress_frame.setVisible(False)
-
     def switch_to_glass_mode(self):
-        """切换到通透模式，修改配置文件并重启应用"""
+        """切换到通透模式，保存配置并在当前进程内打开通透模式窗口"""
         # 显示确认对话框
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle("确认切换")
-        msg_box.setText("确定要切换到通透模式吗？\n切换后将关闭当前窗口并重启应用。")
+        msg_box.setText("确定要切换到通透模式吗？\n当前的检查结果和手动设置的版本号会保留。")
         # 添加原生提示图标
         msg_box.setIcon(QMessageBox.Question)
         # 设置按钮文本为中文
@@ -1666,24 +1188,8 @@ class MainWindow(QWidget):
         # 检查哪个按钮被点击
         if msg_box.clickedButton() == yes_button:
             try:
-                # 保存用户配置 - 使用json文件存储偏好设置
-                config_path = get_config_path()
-                # 确保目录存在
-                os.makedirs(os.path.dirname(config_path), exist_ok=True)
-                config = {
-                    "preferred_mode": "glass",
-                    "last_updated": datetime.now().isoformat()
-                }
-                with open(config_path, "w", encoding="utf-8") as f:
-                    json.dump(config, f, ensure_ascii=False, indent=2)
-                
-                # 重启自己（无论是 main.py 还是打包后的 main.exe）
-                # 使用os.path.abspath确保获取完整路径
-                app_path = os.path.abspath(sys.argv[0])
-                subprocess.Popen([sys.executable, app_path])
-                
-                # 关闭当前窗口
-                self.close()
+                # 在当前进程内打开通透模式窗口，沿用检查结果、手动版本号和HTTP连接
+                switch_mode(self, "glass")
             except Exception as e:
                 self.show_message("错误", f"无法切换到通透模式: {str(e)}", QMessageBox.Critical)
 
@@ -1692,7 +1198,7 @@ class MainWindow(QWidget):
         # 显示确认对话框
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle("确认切换")
-        msg_box.setText("确定要切换到通透模式吗？\n切换后将关闭当前窗口并重启应用。")
+        msg_box.setText("确定要切换到通透模式吗？\n当前的检查结果和手动设置的版本号会保留。")
         # 添加原生提示图标
         msg_box.setIcon(QMessageBox.Question)
         # 设置按钮文本为中文
@@ -1738,24 +1244,8 @@ class MainWindow(QWidget):
         # 检查哪个按钮被点击
         if msg_box.clickedButton() == yes_button:
             try:
-                # 保存用户配置 - 使用json文件存储偏好设置
-                config_path = get_config_path()
-                # 确保目录存在
-                os.makedirs(os.path.dirname(config_path), exist_ok=True)
-                config = {
-                    "preferred_mode": "glass",
-                    "last_updated": datetime.now().isoformat()
-                }
-                with open(config_path, "w", encoding="utf-8") as f:
-                    json.dump(config, f, ensure_ascii=False, indent=2)
-                
-                # 重启自己（无论是 main.py 还是打包后的 main.exe）
-                # 使用os.path.abspath确保获取完整路径
-                app_path = os.path.abspath(sys.argv[0])
-                subprocess.Popen([sys.executable, app_path])
-                
-                # 关闭当前窗口
-                self.close()
+                # 在当前进程内打开通透模式窗口，沿用检查结果、手动版本号和HTTP连接
+                switch_mode(self, "glass")
             except Exception as e:
                 self.show_message("错误", f"无法切换到通透模式: {str(e)}", QMessageBox.Critical)
     
@@ -1827,118 +1317,6 @@ class MainWindow(QWidget):
         except Exception as e:
             # 忽略错误，确保程序正常运行
             pass
-    
-    def check_task(self, services: List[str]):
-        """更新检查的具体任务"""
-        # 先获取所有本地版本
-        installed_versions = {}
-        
-        # 更新进度
-        total_services = len(services)
-        
-        for i, key in enumerate(services):
-            # 更新进度
-            progress_value = int((i / total_services) * 70)  # 留30%给后续处理
-            self.worker_bridge.update_progress.emit(
-                progress_value,
-                f"正在检查 {service_names[key]}..."
-            )
-            
-            try:
-                # 优先使用手动设置的版本号（如果有）
-                if key in self.manual_versions and self.manual_versions[key]:
-                    local_version = self.manual_versions[key]
-                else:
-                    # 获取本地版本
-                    if key in installed_versions_config:
-                        config = installed_versions_config[key]
-                        if config["type"] == "xml":
-                            local_version = get_local_version(config["path"])
-                        elif config["type"] == "registry":
-                            local_version = get_registry_version(config["path"], config["value_name"])
-                        else:
-                            local_version = None
-                    else:
-                        local_version = None
-                
-                installed_versions[key] = local_version
-                
-                # 请求官网页面获取最新版本
-                if key in website_config:
-                    info = website_config[key]
-                    res = requests.get(info["url"], timeout=10)
-                    res.raise_for_status()
-                    
-                    soup = BeautifulSoup(res.text, "html.parser")
-                    tag, cls = info["selector"]
-                    element = soup.find(tag, class_=cls)
-                    
-                    if element:
-                        latest_version_text = element.get_text(strip=True)
-                        version_display = clean_version(latest_version_text.split("|")[0], remove_patch=False)
-                        version_compare = clean_version(version_display, remove_patch=True)
-                        
-                        local_ver_compare = clean_version(local_version or "", remove_patch=True)
-                        
-                        # 版本比较
-                        if not local_version:
-                            status = f"未获取到本地版本"
-                            status_type = "error"
-                        elif version_tuple(local_ver_compare) == version_tuple(version_compare):
-                            status = "已是最新版本"
-                            status_type = "up_to_date"
-                        elif version_tuple(local_ver_compare) < version_tuple(version_compare):
-                            status = f"有新版本可用！"
-                            status_type = "update_available"
-                        else:
-                            status = "本地版本高于官网版本"
-                            status_type = "higher_version"
-                        
-                        # 发送结果到UI线程
-                        self.worker_bridge.update_result.emit(key, {
-                            "local_version": local_version,
-                            "online_version": version_display,
-                            "status": status,
-                            "status_type": status_type,
-                            "download_url": info["url"]
-                        })
-                    else:
-                        # 未找到版本信息
-                        self.worker_bridge.update_result.emit(key, {
-                            "local_version": local_version,
-                            "online_version": "未找到",
-                            "status": "未找到官网版本",
-                            "status_type": "error",
-                            "download_url": info["url"]
-                        })
-                else:
-                    # 配置不存在
-                    self.worker_bridge.update_result.emit(key, {
-                        "local_version": local_version,
-                        "online_version": "配置不存在",
-                        "status": "配置错误",
-                        "status_type": "error",
-                        "download_url": ""
-                    })
-                
-            except Exception as e:
-                # 发生错误
-                self.worker_bridge.update_result.emit(key, {
-                    "local_version": installed_versions.get(key, ""),
-                    "online_version": "获取失败",
-                    "status": f"检查失败: {str(e)[:30]}...",
-                    "status_type": "error",
-                    "download_url": website_config.get(key, {}).get("url", "")
-                })
-            
-            # 短暂延迟，避免请求过快
-            time.sleep(0.5)
-        
-        # 更新进度为100%
-        self.worker_bridge.update_progress.emit(100, "检查完成")
-        
-        # 通知UI线程检查完成
-        self.worker_bridge.check_complete.emit()
 
 # ===== 主函数 =====
 def main():
@@ -1967,21 +1345,15 @@ def main():
     font.setStyleStrategy(QFont.PreferAntialias)
     app.setFont(font)
     
-    # 根据用户偏好启动相应模式
-    if preferred_mode == 'glass':
-        # 直接启动通透模式
-        import subprocess
-        try:
-            subprocess.Popen([sys.executable, 'main_transparency.py'])
-            # 不显示普通窗口，直接退出
-            return
-        except Exception:
-            # 如果通透模式启动失败，回退到普通模式
-            pass
-    
-    # 创建并显示主窗口（普通模式）
-    window = MainWindow()
+    # 根据用户偏好启动相应模式（在同一进程内创建窗口）
+    window = load_window_class(preferred_mode)()
+    set_current_window(window)
     window.show()
+
+    # 按计划自动检查更新
+    from auto_check import AutoCheckRunner
+    auto_check = AutoCheckRunner()
+    auto_check.start()
     
     # 运行应用程序
     sys.exit(app.exec())
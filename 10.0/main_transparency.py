@@ -1,17 +1,8 @@
 # HUANCHUAN with Copilot by Trae  版本号：10.0.0
 
-import json
-import subprocess
 import sys
 import os
-import re
-import xml.etree.ElementTree as ET
-import winreg
-import requests
-import threading
-import time
-from typing import Tuple, Optional, List
-from datetime import datetime
+from typing import Optional, Tuple
 import ctypes
 from ctypes import wintypes
 import certifi
@@ -19,10 +10,20 @@ import certifi
 # 设置TLS证书路径，解决打包后的TLS错误
 os.environ["REQUESTS_CA_BUNDLE"] = certifi.where()
 
-from bs4 import BeautifulSoup
+from card_state import CardState
+from check_window import CheckWindowMixin
+from fetch_engine import FetchEngine
+from http_session import SessionManager, format_connection_stats
+from local_versions import read_installed_versions
+from mode_switch import switch_mode
+from services import service_names, installed_versions_config, website_config
+from styles import glass_style_sheet, set_status_style
+from theme_watcher import ThemeWatcher, read_system_dark_mode
+from title_bar_sampler import TitleBarSampler, strip_pixels
+import tracing
 from PySide6.QtCore import (
-    Qt, QObject, Signal,
-    QPropertyAnimation, QUrl, QPoint, QTimer
+    Qt, QObject, Signal, QEvent,
+    QPropertyAnimation, QUrl, QPoint
 )
 from PySide6.QtGui import (
     QFont, QIcon, QColor, QPixmap, QDesktopServices
@@ -40,84 +41,7 @@ APP_NAME = "荣耀软件更新检查器"
 APP_VERSION = "10.0.0"
 COPYRIGHT_YEAR = "2025"
 
-# 应用名称映射
-service_names = {
-    "pc_manager": "荣耀电脑管家",
-    "honor_workstation": "荣耀超级工作台",
-    "yoyo_assistant": "荣耀 YOYO 助理"
-}
-
-# 服务安装路径和版本获取方式
-installed_versions_config = {
-    "pc_manager": {
-        "type": "xml",
-        "path": r"C:\\Program Files\\HONOR\\PCManager\\config\\product_adapter_version.xml"
-    },
-    "honor_workstation": {
-        "type": "registry",
-        "path": r"SOFTWARE\\HONOR\\Hihonornote",
-        "value_name": "HonorWorkStationVersion"
-    },
-    "yoyo_assistant": {
-        "type": "xml",
-        "path": r"C:\\Program Files\\HONOR\\HNMagicAI\\config\\product_adapter_version.xml"
-    }
-}
-
-# 官网页面配置
-website_config = {
-    "pc_manager": {
-        "url": "https://www.honor.com/cn/tech/pc-manager/",
-        "selector": ("p", "path")
-    },
-    "honor_workstation": {
-        "url": "https://www.honor.com/cn/tech/honor-workstation/",
-        "selector": ("div", "btn-text")
-    },
-    "yoyo_assistant": {
-        "url": "https://www.honor.com/cn/tech/pc-yoyo-assistant-2/",
-        "selector": ("p", "path")
-    }
-}
-
 # ===== 工具函数 =====
-def get_local_version(xml_path: str) -> Optional[str]:
-    """从XML文件中获取本地版本号"""
-    if os.path.exists(xml_path):
-        try:
-            tree = ET.parse(xml_path)
-            root = tree.getroot()
-            version_elem = root.find(".//version")
-            if version_elem is not None:
-                return version_elem.text.strip()
-        except Exception as e:
-            return f"读取版本失败: {e}"
-    return None
-
-def get_registry_version(path: str, value_name: str) -> Optional[str]:
-    """从Windows注册表中获取版本号"""
-    try:
-        key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, path)
-        value, _ = winreg.QueryValueEx(key, value_name)
-        winreg.CloseKey(key)
-        return value.strip()
-    except Exception as e:
-        return f"读取版本失败: {e}"
-
-def version_tuple(v: str) -> Tuple[int, ...]:
-    """将版本字符串转换为元组，用于比较版本号"""
-    try:
-        return tuple(int(x) for x in v.strip().split(".") if x.isdigit())
-    except ValueError:
-        return (0,)
-
-def clean_version(v: str, remove_patch: bool = True) -> str:
-    """清理版本字符串，移除多余信息"""
-    v = v.replace("Version", "").replace("版本", "").strip()
-    if remove_patch:
-        v = re.sub(r"\(.*?\)", "", v).strip()
-    return v
-
 def resource_path(relative_path: str) -> str:
     """获取资源文件的绝对路径（兼容PyInstaller打包后）"""
     if hasattr(sys, "_MEIPASS"):  # PyInstaller 打包后的临时目录
@@ -136,21 +60,8 @@ class ThemeManager:
         self.is_dark_mode = self._check_system_theme()
     
     def _check_system_theme(self) -> bool:
-        """检查系统是否使用深色主题"""
-        try:
-            # 检查Windows注册表
-            if sys.platform == 'win32':
-                # Windows 10/11 的深色模式设置
-                key_path = r'SOFTWARE\Microsoft\Windows\CurrentVersion\Themes\Personalize'
-                key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path)
-                value, _ = winreg.QueryValueEx(key, 'AppsUseLightTheme')
-                winreg.CloseKey(key)
-                # 返回 False 表示深色模式，因为值为0时是深色模式
-                return value == 0
-        except Exception:
-            pass
-        # 默认返回浅色模式
-        return False
+        """检查系统是否使用深色主题（读取失败时默认返回浅色模式）"""
+        return read_system_dark_mode()
     
     def get_style_sheet(self) -> str:
         """获取当前主题的样式表"""
@@ -224,7 +135,6 @@ class ThemeManager:
             QFrame {
                 background-color: #ffffff;
                 border-radius: 12px;
-                box-shadow: 0 2px 8px rgba(0, 0, 0, 0.08);
             }
             
             /* 按钮样式 */
@@ -268,9 +178,10 @@ class ThemeManager:
 class WorkerBridge(QObject):
     """用于工作线程与UI线程通信的桥梁"""
     update_progress = Signal(int, str)
-    update_result = Signal(str, dict)
-    check_complete = Signal()
+    update_result = Signal(str, object)  # (应用键, CardState)
+    check_complete = Signal(object)  # 结束的检查任务（workers.Task）
     show_message = Signal(str, str, int)
+    theme_changed = Signal(bool)  # 系统主题变化（True 为深色）
 
 # ===== 自定义卡片组件 =====
 class SoftwareCard(QFrame):
@@ -281,9 +192,11 @@ class SoftwareCard(QFrame):
         self.name = name
         self.icon_path = icon_path
         
-        # 设置卡片样式 - 通透模式专用
+        # 当前显示的状态（CardState），更新时只重绘发生变化的字段
+        self.state: Optional[CardState] = None
+        
+        # 卡片样式由主窗口的整窗样式表按 objectName 设置 - 通透模式专用
         self.setObjectName("SoftwareCard")
-        self.setStyleSheet("QFrame#SoftwareCard { margin: 8px; }")
         
         # 添加阴影效果
         shadow = QGraphicsDropShadowEffect(self)
@@ -313,9 +226,6 @@ class SoftwareCard(QFrame):
         
         # 创建状态区
         self._create_status_section()
-        
-        # 初始设置卡片样式 - 必须在创建所有标签后调用
-        self.update_card_theme()
     
     def _create_header_section(self):
         """创建卡片顶部信息区"""
@@ -337,7 +247,7 @@ class SoftwareCard(QFrame):
         name_font = QFont("HONOR Sans CN", 16, QFont.Bold)
         name_font.setStyleStrategy(QFont.PreferAntialias)
         self.name_label.setFont(name_font)
-        self.name_label.setStyleSheet("color: white;")
+        self.name_label.setObjectName("CardName")
         
         header_layout.addWidget(self.icon_label)
         header_layout.addWidget(self.name_label)
@@ -357,7 +267,7 @@ class SoftwareCard(QFrame):
         
         self.local_version_value = QLabel("加载中...")
         self.local_version_value.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        self.local_version_value.setStyleSheet("color: white;")
+        self.local_version_value.setObjectName("VersionValue")
         
         # 官网版本
         online_version_label = QLabel("官网版本:")
@@ -365,7 +275,7 @@ class SoftwareCard(QFrame):
         
         self.online_version_value = QLabel("加载中...")
         self.online_version_value.setTextInteractionFlags(Qt.TextSelectableByMouse)
-        self.online_version_value.setStyleSheet("color: white;")
+        self.online_version_value.setObjectName("VersionValue")
         
         # 添加到布局
         version_layout.addWidget(local_version_label, 0, 0)
@@ -388,24 +298,10 @@ class SoftwareCard(QFrame):
         
         # 更新链接按钮
         self.download_button = QPushButton("更新链接")
-        self.download_button.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(55, 115, 232, 0.8);
-                color: white;
-                border: none;
-                border-radius: 16px;
-                padding: 6px 16px;
-                font-size: 12px;
-            }
-            QPushButton:hover {
-                background-color: rgba(66, 133, 244, 1);
-            }
-            QPushButton:disabled {
-                background-color: rgba(173, 181, 189, 0.5);
-                color: rgba(255, 255, 255, 0.6);
-            }
-        """)
+        self.download_button.setObjectName("DownloadButton")
         self.download_button.setVisible(False)
+        # 只连接一次，点击时打开当前状态的链接
+        self.download_button.clicked.connect(self.open_download_url)
         
         status_layout.addWidget(self.status_label)
         status_layout.addStretch()
@@ -413,105 +309,47 @@ class SoftwareCard(QFrame):
         
         self.main_layout.addLayout(status_layout)
     
-    def update_card_theme(self):
-        """更新卡片样式 - 通透模式专用"""
-        # 通透模式专用样式
-        card_style = """
-            QFrame#SoftwareCard {
-                background-color: rgba(255, 255, 255, 0.1);
-                backdrop-filter: blur(10px);
-                border-radius: 16px;
-                border: 1px solid rgba(255, 255, 255, 0.2);
-                padding: 20px;
-            }
-            QFrame#SoftwareCard:disabled {
-                opacity: 0.7;
-            }
-        """
-        
-        # 更新卡片样式
-        self.setStyleSheet(card_style)
-        
-        # 更新文本颜色
-        text_color = "white"
-        info_color = "rgba(255, 255, 255, 0.8)"
-        
-        # 更新名称标签颜色
-        self.name_label.setStyleSheet(f"color: {text_color}; background-color: transparent;")
-        
-        # 更新版本标签颜色
-        for label in [self.local_version_value, self.online_version_value]:
-            label.setStyleSheet(f"color: {text_color}; background-color: transparent;")
-    
     def fade_in(self):
         """淡入动画"""
         self.fade_animation.setStartValue(self.windowOpacity())
         self.fade_animation.setEndValue(1.0)
+        tracing.animation_started(self.fade_animation, f"fade_in {self.software_key}")
         self.fade_animation.start()
     
-    def update_info(self, local_version: str, online_version: str, status: str,
-                   status_type: str, download_url: str = ""):
-        """更新卡片信息"""
-        # 更新版本信息
-        self.local_version_value.setText(local_version or "未知")
-        self.online_version_value.setText(online_version or "未知")
-        
-        # 更新状态标签
-        self.status_label.setText(status)
-        
-        # 根据状态类型设置样式 - 通透模式专用
-        if status_type == "up_to_date":
-            self.status_label.setStyleSheet("""
-                QLabel#StatusLabel {
-                    background-color: rgba(45, 62, 54, 0.8);
-                    color: rgba(146, 208, 80, 1);
-                    padding: 4px 12px;
-                    border-radius: 16px;
-                    font-weight: 500;
-                }
-            """)
-            self.download_button.setVisible(False)
-        elif status_type == "update_available":
-            self.status_label.setStyleSheet("""
-                QLabel#StatusLabel {
-                    background-color: rgba(62, 54, 45, 0.8);
-                    color: rgba(255, 193, 7, 1);
-                    padding: 4px 12px;
-                    border-radius: 16px;
-                    font-weight: 500;
-                }
-            """)
-            if download_url:
-                self.download_button.setVisible(True)
-                self.download_button.clicked.connect(lambda: QDesktopServices.openUrl(QUrl(download_url)))
-        elif status_type == "error":
-            self.status_label.setStyleSheet("""
-                QLabel#StatusLabel {
-                    background-color: rgba(62, 45, 45, 0.8);
-                    color: rgba(255, 107, 107, 1);
-                    padding: 4px 12px;
-                    border-radius: 16px;
-                    font-weight: 500;
-                }
-            """)
-            self.download_button.setVisible(False)
-        elif status_type == "higher_version":
-            self.status_label.setStyleSheet("""
-                QLabel#StatusLabel {
-                    background-color: rgba(45, 54, 62, 0.8);
-                    color: rgba(119, 191, 249, 1);
-                    padding: 4px 12px;
-                    border-radius: 16px;
-                    font-weight: 500;
-                }
-            """)
-            if download_url:
-                self.download_button.setVisible(True)
-                self.download_button.setText("官网链接")
-                self.download_button.clicked.connect(lambda: QDesktopServices.openUrl(QUrl(download_url)))
+    def apply_state(self, state: CardState) -> Tuple[str, ...]:
+        """应用新的显示状态，只更新发生变化的字段，返回变化的字段"""
+        changed = state.changed_fields(self.state)
+        if not changed:
+            return changed
+        first_time = self.state is None
+        self.state = state
         
-        # 显示完整内容的动画
-        self.fade_in()
+        # 更新版本信息
+        if "local_version" in changed:
+            self.local_version_value.setText(state.local_version)
+        if "online_version" in changed:
+            self.online_version_value.setText(state.online_version)
+        
+        # 更新状态标签（切换 status 动态属性，样式在整窗样式表中）
+        if "status" in changed:
+            self.status_label.setText(state.status)
+        if "status_type" in changed:
+            set_status_style(self.status_label, state.status_type)
+        
+        # 更新链接按钮（点击信号在创建时已连接一次，这里只更新显示）
+        if "status_type" in changed or "download_url" in changed:
+            self.download_button.setText(state.link_text)
+            self.download_button.setVisible(state.show_link)
+        
+        # 首次显示结果时播放淡入动画
+        if first_time:
+            self.fade_in()
+        return changed
+    
+    def open_download_url(self):
+        """打开当前状态的链接"""
+        if self.state is not None and self.state.download_url:
+            QDesktopServices.openUrl(QUrl(self.state.download_url))
 
 # ===== 关于对话框 =====
 class AboutDialog(QDialog):
@@ -521,7 +359,7 @@ class AboutDialog(QDialog):
         super().__init__(parent)
         self.setWindowTitle("关于荣耀软件更新检查器")
         self.setModal(True)
-        self.setFixedSize(340, 240)
+        self.setFixedSize(340, 300)
         self.parent_window = parent
         # 初始化点击计数器
         self.click_count = 0
@@ -568,12 +406,29 @@ class AboutDialog(QDialog):
         self.feedback_label = QLabel("反馈/建议：请使用 QQ 联系 HUANCHUAN")
         self.feedback_label.setAlignment(Qt.AlignCenter)
         
+        # 网络连接复用统计和标题栏取色统计
+        stats_text = format_connection_stats()
+        sampler = getattr(self.parent(), "title_bar_sampler", None)
+        if sampler is not None:
+            stats_text += "\n" + sampler.format_stats()
+        self.network_label = QLabel(stats_text)
+        self.network_label.setObjectName("NetworkLabel")
+        self.network_label.setAlignment(Qt.AlignCenter)
+        
+        # 检查耗时诊断入口
+        self.diagnostics_label = QLabel('<a href="#diagnostics">检查耗时诊断</a>')
+        self.diagnostics_label.setObjectName("DiagnosticsLabel")
+        self.diagnostics_label.setAlignment(Qt.AlignCenter)
+        self.diagnostics_label.linkActivated.connect(self.open_diagnostics_dialog)
+        
         # 添加到布局
         self.main_layout.addWidget(self.icon_label)
         self.main_layout.addWidget(self.title_label)
         self.main_layout.addWidget(self.version_label)
         self.main_layout.addWidget(self.copyright_label)
         self.main_layout.addWidget(self.feedback_label)
+        self.main_layout.addWidget(self.network_label)
+        self.main_layout.addWidget(self.diagnostics_label)
     
     def set_windows_title_bar_color(self, hex_color):
         """设置Windows窗口标题栏颜色和文字颜色"""
@@ -637,6 +492,13 @@ class AboutDialog(QDialog):
                     font-size: 14px;
                     color: #4285f4;
                 }
+                QLabel#NetworkLabel {
+                    font-size: 11px;
+                    color: #adb5bd;
+                }
+                QLabel#DiagnosticsLabel {
+                    font-size: 11px;
+                }
             """)
             # 设置标题栏颜色为深色主题背景色
             self.set_windows_title_bar_color("#2d2d2d")
@@ -660,6 +522,13 @@ class AboutDialog(QDialog):
                     font-size: 14px;
                     color: #4285f4;
                 }
+                QLabel#NetworkLabel {
+                    font-size: 11px;
+                    color: #6c757d;
+                }
+                QLabel#DiagnosticsLabel {
+                    font-size: 11px;
+                }
             """)
             # 设置标题栏颜色为浅色主题背景色
             self.set_windows_title_bar_color("#f3f3f3")
@@ -679,6 +548,15 @@ class AboutDialog(QDialog):
         """打开版本修改对话框"""
         if hasattr(self.parent_window, 'open_manual_version_dialog'):
             self.parent_window.open_manual_version_dialog()
+    
+    def open_diagnostics_dialog(self, link=None):
+        """打开检查耗时诊断对话框"""
+        # 只在打开时导入（对话框很少使用，不计入启动时间）
+        from diagnostics_dialog import DiagnosticsDialog
+
+        theme_manager = getattr(self.parent_window, 'theme_manager', None)
+        dialog = DiagnosticsDialog(self, bool(theme_manager and theme_manager.is_dark_mode))
+        dialog.exec()
 
 # ===== 手动版本修改对话框 =====
 class ManualVersionDialog(QDialog):
@@ -770,9 +648,13 @@ class ManualVersionDialog(QDialog):
     def reset_to_local_versions(self):
         """还原为本地检测的版本号"""
         if hasattr(self.parent(), 'software_cards'):
+            # 重新检测本地版本号（不使用手动设置的版本），同一注册表键只打开一次
+            local_versions = read_installed_versions(self.version_inputs)
             for app_key, line_edit in self.version_inputs.items():
-                # 重新检测本地版本号（不使用手动设置的版本）
-                local_version = self._get_local_version_directly(app_key)
+                if app_key in installed_versions_config:
+                    local_version = local_versions[app_key]
+                else:
+                    local_version = "配置不存在"
                 line_edit.setText(local_version or "")
             
             # 显示还原成功的提示
@@ -783,19 +665,6 @@ class ManualVersionDialog(QDialog):
                     QMessageBox.Information
                 )
     
-    def _get_local_version_directly(self, app_key: str) -> str:
-        """直接获取本地版本号（不依赖手动设置）"""
-        if app_key in installed_versions_config:
-            config = installed_versions_config[app_key]
-            try:
-                if config["type"] == "xml":
-                    return get_local_version(config["path"])
-                elif config["type"] == "registry":
-                    return get_registry_version(config["path"], config["value_name"])
-            except Exception:
-                return "检测失败"
-        return "配置不存在"
-    
     def set_windows_title_bar_color(self, hex_color):
         """设置Windows窗口标题栏颜色和文字颜色"""
         try:
@@ -918,16 +787,27 @@ class ManualVersionDialog(QDialog):
             self.set_windows_title_bar_color("#f3f3f3")
 
 # ===== 通透模式窗口类 =====
-class GlassWindow(QWidget):
-    def __init__(self):
+class GlassWindow(CheckWindowMixin, QWidget):
+    @tracing.traced()
+    def __init__(self, initial_state: Optional[dict] = None):
         super().__init__()
         
-        # 初始化手动版本号字典
-        self.manual_versions = {}
-        
         # 初始化主题管理器
         self.theme_manager = ThemeManager()
         
+        # 共享的HTTP会话：在构建窗口的同时后台预连接官网，首次检查直接复用连接
+        self.session_manager = SessionManager.instance()
+        self.session_manager.preconnect(info["url"] for info in website_config.values())
+        
+        # 标题栏取色：窗口移动、缩放、激活时取色，其余时间按自适应间隔低频取色，
+        # 颜色不变时不调用DWM，窗口隐藏或最小化时停止（在 showEvent 中开始）。
+        # 先于设置窗口大小、恢复状态和开始检查创建，窗口事件处理中随时可用
+        self.title_bar_sampler = TitleBarSampler(
+            self.grab_title_strip,
+            self.set_windows_title_bar_color,
+            parent=self
+        )
+        
         # 设置窗口标题、大小和最小大小
         self.setWindowTitle(f"Update Checker for HONOR MagicBook")
         self.resize(400, 740)
@@ -941,14 +821,14 @@ class GlassWindow(QWidget):
         # 完全透明背景 + 系统毛玻璃（保留原有通透模式效果）
         self.setAttribute(Qt.WA_TranslucentBackground)
         GlobalBlur(self.winId(), Dark=False, Acrylic=False, QWidget=self)  # 示例，参数名以你的库为准
-        self.setStyleSheet("background-color: rgba(0, 0, 0, 0);")
+        # 整窗样式表（透明背景、卡片和状态标签），只生成一次
+        self.setStyleSheet(glass_style_sheet())
         
         # 设置整体窗口透明度（0.0 ~ 1.0）
         self.setWindowOpacity(0.995)  # 保持原有设置
         
-        # 存储状态
-        self.running = False
-        self.manual_versions = {}
+        # 初始化检查相关的状态（手动版本号、检查结果、快照结果、进度）
+        self._init_check_state()
         
         # 加载图标路径
         self.icon_files = {
@@ -974,43 +854,38 @@ class GlassWindow(QWidget):
         # 创建按钮区域
         self._create_buttons()
         
-        # 创建线程通信桥
+        # 创建并发抓取引擎（按主机限流，结果按完成顺序返回）
+        self.fetch_engine = FetchEngine()
+        
+        # 创建线程通信桥（跟踪时记录信号从工作线程发出到UI线程处理的等待）
         self.worker_bridge = WorkerBridge()
-        self.worker_bridge.update_progress.connect(self.update_progress)
-        self.worker_bridge.update_result.connect(self.update_card_result)
-        self.worker_bridge.check_complete.connect(self.on_check_complete)
-        self.worker_bridge.show_message.connect(self.show_message)
-        
-        # 自动开始检查更新
-        self.run_check()
-        
-        # 设置窗口标题栏颜色为指定颜色
-        # 从窗口左侧1像素从客户区顶部下1像素的位置取色
-        self.update_title_bar_color()
-        
-        # 设置定时器，定期更新标题栏颜色（每500毫秒）
-        self.color_update_timer = QTimer(self)
-        self.color_update_timer.timeout.connect(self.update_title_bar_color)
-        self.color_update_timer.start(300)  # 300毫秒更新一次
-        
-        # 设置主题检测定时器
-        self.theme_timer = QTimer(self)
-        self.theme_timer.setInterval(1000)  # 每秒检查一次主题变化
-        self.theme_timer.timeout.connect(self.check_system_theme_change)
-        self.theme_timer.start()
+        tracing.connect_traced(self.worker_bridge.update_progress, self.update_progress, "update_progress")
+        tracing.connect_traced(self.worker_bridge.update_result, self.update_card_result, "update_result")
+        tracing.connect_traced(self.worker_bridge.check_complete, self.on_check_complete, "check_complete")
+        tracing.connect_traced(self.worker_bridge.show_message, self.show_message, "show_message")
+        tracing.connect_traced(self.worker_bridge.theme_changed, self.on_system_theme_changed, "theme_changed")
+        
+        # 监听系统主题变化（注册表变更通知，主题不变时没有任何周期性工作）
+        self.theme_watcher = ThemeWatcher(
+            self.worker_bridge.theme_changed.emit,
+            initial=self.theme_manager.is_dark_mode
+        )
+        self.theme_watcher.start()
+        
+        if initial_state:
+            # 从普通模式切换而来，沿用原窗口的检查结果
+            self.restore_state(initial_state)
+        else:
+            # 先显示上次保存的检查结果，再在后台重新检查，只更新结果变化的卡片
+            self.show_snapshot()
+            self.run_check()
     
     def update_title_bar_color(self):
         """更新标题栏颜色
         
-        此方法会重新获取窗口颜色并应用到标题栏，用于定时更新
-        或手动触发颜色更新
+        立即重新取色，颜色变化时应用到标题栏，用于手动触发颜色更新
         """
-        try:
-            color = self.get_pixel_color_at_position(1, 1)
-            self.set_windows_title_bar_color(color)
-        except Exception as e:
-            # 更新失败时不影响程序运行
-            pass
+        self.title_bar_sampler.sample()
     
     def _create_title(self):
         """创建标题区域"""
@@ -1078,7 +953,6 @@ class GlassWindow(QWidget):
         self.progress_frame.setStyleSheet("""
             QFrame#ProgressFrame {
                 background-color: rgba(255, 255, 255, 0.1);
-                backdrop-filter: blur(10px);
                 border-radius: 12px;
                 border: 1px solid rgba(255, 255, 255, 0.2);
                 padding: 16px;
@@ -1155,6 +1029,13 @@ class GlassWindow(QWidget):
         """)
         self.results_layout.addWidget(self.placeholder_label)
         
+        # 快照结果提示（先显示上次保存的结果时可见，全部卡片刷新后隐藏）
+        self.stale_label = QLabel()
+        self.stale_label.setObjectName("StaleLabel")
+        self.stale_label.setAlignment(Qt.AlignCenter)
+        self.stale_label.setVisible(False)
+        self.results_layout.addWidget(self.stale_label)
+        
         # 创建软件卡片
         self.software_cards = {}
         for key, name in service_names.items():
@@ -1207,7 +1088,7 @@ class GlassWindow(QWidget):
                 color: rgba(255, 255, 255, 0.6);
             }
         """)
-        self.check_button.clicked.connect(self.run_check)
+        self.check_button.clicked.connect(self.run_manual_check)
         
         buttons_layout.addStretch()
         buttons_layout.addWidget(self.check_button)
@@ -1215,72 +1096,52 @@ class GlassWindow(QWidget):
         
         self.main_layout.addWidget(buttons_frame)
     
-    def check_system_theme_change(self):
-        """检查系统主题变化并更新UI"""
-        new_is_dark_mode = self.theme_manager._check_system_theme()
-        if new_is_dark_mode != self.theme_manager.is_dark_mode:
+    def on_system_theme_changed(self, is_dark_mode: bool):
+        """系统主题变化时更新主题状态（由主题监听器触发）
+        
+        通透模式的整窗样式表与系统主题无关，卡片无需重新设置样式。
+        """
+        if is_dark_mode != self.theme_manager.is_dark_mode:
             # 更新主题模式
-            self.theme_manager.is_dark_mode = new_is_dark_mode
-            
-            # 更新所有软件卡片的主题
-            for card in self.software_cards.values():
-                if hasattr(card, 'update_card_theme'):
-                    card.update_card_theme()
-                # 重新应用状态标签样式
-                if hasattr(card, 'status_type') and hasattr(card, 'update_info'):
-                    # 使用现有数据重新调用update_info
-                    card.update_info(
-                        getattr(card, 'local_version', ''),
-                        getattr(card, 'online_version', ''),
-                        getattr(card, 'status', ''),
-                        getattr(card, 'status_type', ''),
-                        getattr(card, 'download_url', '')
-                    )
+            self.theme_manager.is_dark_mode = is_dark_mode
     
-    def run_check(self):
-        """运行更新检查"""
-        if self.running:
-            return
-        
-        self.running = True
-        self.check_button.setEnabled(False)
-        self.check_button.setText("正在检查...")
-        
-        # 显示进度条区域
-        self.progress_frame.setVisible(True)
-        self.progress_bar.setValue(0)
-        
-        # 隐藏占位符，显示所有选中的卡片
-        self.placeholder_label.setVisible(False)
-        
-        # 检查所有服务
-        selected_services = list(service_names.keys())
-        
-        # 创建工作线程
-        t = threading.Thread(
-            target=self.check_task,
-            args=(selected_services,),
-            daemon=True
-        )
-        t.start()
+    def closeEvent(self, event):
+        """关闭窗口时取消正在进行的检查，停止主题监听和标题栏取色"""
+        if self.check_worker is not None:
+            self.check_worker.cancel("窗口已关闭")
+        self.theme_watcher.stop()
+        self.title_bar_sampler.stop()
+        super().closeEvent(event)
     
-    def update_progress(self, value: int, message: str):
-        """更新进度条"""
-        self.progress_bar.setValue(value)
-        self.progress_label.setText(message)
+    def showEvent(self, event):
+        """窗口显示时开始标题栏取色"""
+        super().showEvent(event)
+        if not self.isMinimized():
+            self.title_bar_sampler.start()
     
-    def update_card_result(self, service_key: str, result: dict):
-        """更新卡片显示结果"""
-        if service_key in self.software_cards:
-            card = self.software_cards[service_key]
-            card.setVisible(True)
-            card.update_info(
-                result.get("local_version", ""),
-                result.get("online_version", ""),
-                result.get("status", ""),
-                result.get("status_type", ""),
-                result.get("download_url", "")
-            )
+    def hideEvent(self, event):
+        """窗口隐藏时停止标题栏取色"""
+        super().hideEvent(event)
+        self.title_bar_sampler.stop()
+    
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        self.title_bar_sampler.request_sample()
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.title_bar_sampler.request_sample()
+    
+    def changeEvent(self, event):
+        """最小化时停止取色，还原或激活时重新取色"""
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            if self.isMinimized():
+                self.title_bar_sampler.stop()
+            elif self.isVisible():
+                self.title_bar_sampler.start()
+        elif event.type() == QEvent.ActivationChange:
+            self.title_bar_sampler.request_sample()
     
     def open_about(self):
         """打开关于对话框"""
@@ -1316,15 +1177,6 @@ class GlassWindow(QWidget):
                 QMessageBox.Information
             )
     
-    def on_check_complete(self):
-        """检查完成后的处理"""
-        self.running = False
-        self.check_button.setEnabled(True)
-        self.check_button.setText("检查更新")
-        
-        # 隐藏进度条
-        self.progress_frame.setVisible(False)
-    
     def show_message(self, title: str, message: str, icon_type: int):
         """显示消息对话框 - 适配深色/浅色主题"""
         msg_box = QMessageBox(self)
@@ -1369,127 +1221,22 @@ class GlassWindow(QWidget):
         
         msg_box.exec()
     
-    def get_pixel_color_at_position(self, x, y):
-        """获取窗口内指定位置的像素颜色并进行智能调整
-        
-        Args:
-            x: 窗口左侧的水平偏移像素（从左边缘计算）
-            y: 客户区垂直偏移像素（从标题栏下方开始计算）
-        """
-        try:
-            # 获取窗口在屏幕上的位置
-            screen_pos = self.mapToGlobal(QPoint(0, 0))
-            
-            # 计算客户区在屏幕上的位置（需要考虑标题栏高度）
-            title_bar_height = self.frameGeometry().height() - self.geometry().height()
-            
-            # 获取窗口宽度
-            window_width = self.width()
-            
-            # 定义多个取色点的百分比位置（横向）
-            percent_positions = [0.01, 0.25, 0.5, 0.75, 0.99]  # 1%, 25%, 50%, 75%, 99%
-            colors = []
-            
-            # 遍历所有取色点获取颜色
-            for percent in percent_positions:
-                # 计算当前取色点的x坐标
-                current_x = int(window_width * percent)
-                
-                # 计算实际屏幕坐标
-                screen_x = screen_pos.x() + current_x
-                screen_y = screen_pos.y() + title_bar_height + 1  # 纵向固定为1像素
-                
-                # 获取屏幕截图
-                screen = QApplication.primaryScreen()
-                pixmap = screen.grabWindow(0, screen_x, screen_y, 1, 1)  # 获取指定像素
-                
-                # 获取像素颜色
-                image = pixmap.toImage()
-                color = image.pixelColor(0, 0)
-                
-                # 保存RGB值
-                colors.append((color.red(), color.green(), color.blue()))
-            
-            # 颜色聚类：找出最相近的颜色组
-            # 使用简单的聚类方法，计算颜色之间的欧氏距离
-            def color_distance(c1, c2):
-                return ((c1[0] - c2[0]) ** 2 + (c1[1] - c2[1]) ** 2 + (c1[2] - c2[2]) ** 2) ** 0.5
-            
-            # 设定颜色相似度阈值
-            similarity_threshold = 20
-            
-            # 聚类结果
-            clusters = []
-            
-            # 对每个颜色进行聚类
-            for color in colors:
-                # 查找是否可以加入现有聚类
-                added_to_cluster = False
-                for cluster in clusters:
-                    # 计算与聚类中第一个颜色的距离（简化处理）
-                    if color_distance(color, cluster[0]) < similarity_threshold:
-                        cluster.append(color)
-                        added_to_cluster = True
-                        break
-                
-                # 如果没有找到合适的聚类，创建新聚类
-                if not added_to_cluster:
-                    clusters.append([color])
-            
-            # 找出最大的聚类
-            if clusters:
-                largest_cluster = max(clusters, key=len)
-                
-                # 计算最大聚类的平均颜色
-                avg_r = sum(c[0] for c in largest_cluster) // len(largest_cluster)
-                avg_g = sum(c[1] for c in largest_cluster) // len(largest_cluster)
-                avg_b = sum(c[2] for c in largest_cluster) // len(largest_cluster)
-            else:
-                # 如果聚类失败，使用第一个取色点
-                avg_r, avg_g, avg_b = colors[0] if colors else (45, 45, 45)  # 默认颜色
-            
-            # 智能颜色调整逻辑
-            # 1. 对于白色(ffffff)，调整为bebebe
-            if avg_r == 255 and avg_g == 255 and avg_b == 255:
-                r = 215
-                g = 215
-                b = 215
-            # 2. 对于深色，根据亮度进行调整
-            elif avg_r < 50 and avg_g < 50 and avg_b < 50:  # 非常暗的颜色
-                # 1e1f22(30,31,34) -> 222222(34,34,34)
-                # 1a1b1d(26,27,29) -> 1c1d1f(28,29,31)
-                # 基于亮度增加RGB值
-                avg_brightness = (avg_r + avg_g + avg_b) // 3
-                if avg_brightness < 30:  # 极暗
-                    r = min(255, avg_r + 3)
-                    g = min(255, avg_g + 2)
-                    b = min(255, avg_b + 3)
-                else:  # 一般暗
-                    r = min(255, avg_r + 2)
-                    g = min(255, avg_g + 2)
-                    b = min(255, avg_b + 2)
-            # 3. 对于蓝色系深色(如091c3a)
-            elif avg_r < 30 and avg_g < 50 and avg_b > 50:
-                # 091c3a(9,28,58) -> 0c1e3d(12,30,61)
-                r = min(255, avg_r + 3)
-                g = min(255, avg_g + 2)
-                b = min(255, avg_b + 3)
-            else:
-                # 其他情况使用平均颜色
-                r, g, b = avg_r, avg_g, avg_b
-            
-            # 确保RGB值在有效范围内
-            r = max(0, min(255, r))
-            g = max(0, min(255, g))
-            b = max(0, min(255, b))
-            
-            return f"#{r:02x}{g:02x}{b:02x}"
-        except Exception as e:
-            # 如果取色失败，返回默认颜色
-            return "#2d2d2d"  # 深色主题背景色调淡版
+    def grab_title_strip(self):
+        """截取客户区顶部下方的一行像素（一次截屏），返回取色数据"""
+        # 获取窗口在屏幕上的位置
+        screen_pos = self.mapToGlobal(QPoint(0, 0))
+        
+        # 计算客户区在屏幕上的位置（需要考虑标题栏高度）
+        title_bar_height = self.frameGeometry().height() - self.geometry().height()
+        
+        # 一次截取整行，整行像素用于主色提取
+        screen = QApplication.primaryScreen()
+        pixmap = screen.grabWindow(0, screen_pos.x(), screen_pos.y() + title_bar_height + 1, self.width(), 1)
+        return strip_pixels(pixmap.toImage())
     
     def set_windows_title_bar_color(self, hex_color):
-        """设置窗口标题栏颜色"""
+        """设置窗口标题栏颜色，返回调用 DwmSetWindowAttribute 的次数"""
+        calls = 0
         try:
             # 转换十六进制颜色到RGB
             hex_color = hex_color.lstrip('#')
@@ -1511,6 +1258,7 @@ class GlassWindow(QWidget):
                 ctypes.byref(color_value), 
                 ctypes.sizeof(color_value)
             )
+            calls += 1
             
             # 判断是否为深色背景，如果是则设置文字为白色
             brightness = (r * 299 + g * 587 + b * 114) / 1000
@@ -1522,9 +1270,11 @@ class GlassWindow(QWidget):
                     ctypes.byref(text_color), 
                     ctypes.sizeof(text_color)
                 )
+                calls += 1
         except Exception as e:
             # 忽略错误，确保程序正常运行
             pass
+        return calls
     
     def _set_message_box_title_bar_color(self, msg_box, hex_color):
         """设置消息对话框的标题栏颜色"""
@@ -1565,11 +1315,11 @@ class GlassWindow(QWidget):
             pass
 
     def switch_to_normal_mode(self):
-        """切换到普通模式，修改配置文件并重启应用"""
+        """切换到普通模式，保存配置并在当前进程内打开普通模式窗口"""
         # 显示确认对话框
         msg_box = QMessageBox(self)
         msg_box.setWindowTitle("确认切换")
-        msg_box.setText("确定要切换到普通模式吗？\n切换后将关闭当前窗口并重启应用。")
+        msg_box.setText("确定要切换到普通模式吗？\n当前的检查结果和手动设置的版本号会保留。")
         # 添加原生提示图标
         msg_box.setIcon(QMessageBox.Question)
         # 设置按钮文本为中文
@@ -1615,138 +1365,10 @@ class GlassWindow(QWidget):
         # 检查哪个按钮被点击
         if msg_box.clickedButton() == yes_button:
             try:
-                # 保存用户配置 - 使用json文件存储偏好设置
-                config_path = get_config_path()
-                # 确保目录存在
-                os.makedirs(os.path.dirname(config_path), exist_ok=True)
-                config = {
-                    "preferred_mode": "normal",
-                    "last_updated": datetime.now().isoformat()
-                }
-                with open(config_path, "w", encoding="utf-8") as f:
-                    json.dump(config, f, ensure_ascii=False, indent=2)
-                
-                # 重启自己（无论是 main.py 还是打包后的 main.exe）
-                # 使用os.path.abspath确保获取完整路径
-                app_path = os.path.abspath(sys.argv[0])
-                subprocess.Popen([sys.executable, app_path])
-                
-                # 关闭当前窗口
-                self.close()
+                # 在当前进程内打开普通模式窗口，沿用检查结果、手动版本号和HTTP连接
+                switch_mode(self, "normal")
             except Exception as e:
                 self.show_message("错误", f"无法切换到普通模式: {str(e)}", QMessageBox.Critical)
-    
-    def check_task(self, services: List[str]):
-        """更新检查的具体任务"""
-        # 先获取所有本地版本
-        installed_versions = {}
-        
-        # 更新进度
-        total_services = len(services)
-        
-        for i, key in enumerate(services):
-            # 更新进度
-            progress_value = int((i / total_services) * 70)  # 留30%给后续处理
-            self.worker_bridge.update_progress.emit(
-                progress_value,
-                f"正在检查 {service_names[key]}..."
-            )
-            
-            try:
-                # 优先使用手动设置的版本号（如果有）
-                if key in self.manual_versions and self.manual_versions[key]:
-                    local_version = self.manual_versions[key]
-                else:
-                    # 获取本地版本
-                    if key in installed_versions_config:
-                        config = installed_versions_config[key]
-                        if config["type"] == "xml":
-                            local_version = get_local_version(config["path"])
-                        elif config["type"] == "registry":
-                            local_version = get_registry_version(config["path"], config["value_name"])
-                        else:
-                            local_version = None
-                    else:
-                        local_version = None
-                
-                installed_versions[key] = local_version
-                
-                # 请求官网页面获取最新版本
-                if key in website_config:
-                    info = website_config[key]
-                    res = requests.get(info["url"], timeout=10)
-                    res.raise_for_status()
-                    
-                    soup = BeautifulSoup(res.text, "html.parser")
-                    tag, cls = info["selector"]
-                    element = soup.find(tag, class_=cls)
-                    
-                    if element:
-                        latest_version_text = element.get_text(strip=True)
-                        version_display = clean_version(latest_version_text.split("|")[0], remove_patch=False)
-                        version_compare = clean_version(version_display, remove_patch=True)
-                        
-                        local_ver_compare = clean_version(local_version or "", remove_patch=True)
-                        
-                        # 版本比较
-                        if not local_version:
-                            status = f"未获取到本地版本"
-                            status_type = "error"
-                        elif version_tuple(local_ver_compare) == version_tuple(version_compare):
-                            status = "已是最新版本"
-                            status_type = "up_to_date"
-                        elif version_tuple(local_ver_compare) < version_tuple(version_compare):
-                            status = f"有新版本可用！"
-                            status_type = "update_available"
-                        else:
-                            status = "本地版本高于官网版本"
-                            status_type = "higher_version"
-                        
-                        # 发送结果到UI线程
-                        self.worker_bridge.update_result.emit(key, {
-                            "local_version": local_version,
-                            "online_version": version_display,
-                            "status": status,
-                            "status_type": status_type,
-                            "download_url": info["url"]
-                        })
-                    else:
-                        # 未找到版本信息
-                        self.worker_bridge.update_result.emit(key, {
-                            "local_version": local_version,
-                            "online_version": "未找到",
-                            "status": "未找到官网版本",
-                            "status_type": "error",
-                            "download_url": info["url"]
-                        })
-                else:
-                    # 配置不存在
-                    self.worker_bridge.update_result.emit(key, {
-                        "local_version": local_version,
-                        "online_version": "配置不存在",
-                        "status": "配置错误",
-                        "status_type": "error",
-                        "download_url": ""
-                    })
-                
-            except Exception as e:
-                # 发生错误
-                self.worker_bridge.update_result.emit(key, {
-                    "local_version": installed_versions.get(key, ""),
-                    "online_version": "获取失败",
-                    "status": f"检查失败: {str(e)[:30]}...",
-                    "status_type": "error",
-                    "download_url": website_config.get(key, {}).get("url", "")
-                })
-            
-            # 短暂延迟，避免请求过快
-            time.sleep(0.5)
-        
-        # 更新进度为100%
-        self.worker_bridge.update_progress.emit(100, "检查完成")
-        
-        # 通知UI线程检查完成
-        self.worker_bridge.check_complete.emit()
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
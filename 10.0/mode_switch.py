@@ -0,0 +1,50 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+from app_config import update_config
+
+# ===== 窗口模式 =====
+# 当前显示的主窗口（切换模式后由新窗口替换，保持引用避免被回收）
+_current_window = None
+
+def load_window_class(preferred_mode: str):
+    """只导入所选模式的窗口模块（另一个模式的模块和依赖不会加载）"""
+    if preferred_mode == "glass":
+        from main_transparency import GlassWindow
+        return GlassWindow
+    from main_normal import MainWindow
+    return MainWindow
+
+def set_current_window(window):
+    """记录当前的主窗口"""
+    global _current_window
+    _current_window = window
+
+def get_current_window():
+    """获取当前的主窗口（尚未创建时为 None）"""
+    return _current_window
+
+# ===== 进程内热切换 =====
+def switch_mode(window, target_mode: str):
+    """在同一个 QApplication 内切换到另一个模式的窗口
+
+    旧窗口的检查结果和手动版本号（通过 export_state / restore_state）带到新窗口，
+    HTTP会话为进程级共享，连接池直接复用，切换后无需重新检查。
+    """
+    global _current_window
+    state = window.export_state()
+    update_config(preferred_mode=target_mode)
+
+    new_window = load_window_class(target_mode)(initial_state=state)
+
+    # 新窗口出现在旧窗口的位置
+    geometry = new_window.frameGeometry()
+    geometry.moveCenter(window.frameGeometry().center())
+    new_window.move(geometry.topLeft())
+
+    # 先显示新窗口再关闭旧窗口，避免触发“最后一个窗口关闭即退出”
+    new_window.show()
+    window.close()
+    window.deleteLater()
+
+    _current_window = new_window
+    return new_window
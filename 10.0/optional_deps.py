@@ -0,0 +1,15 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+# ===== 可选依赖 =====
+_numpy = None
+
+def get_numpy():
+    """首次使用时导入 NumPy，未安装时返回 None（调用方退回到纯 Python 的实现）"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
@@ -0,0 +1,209 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+from app_config import load_config, update_config
+
+# 检查间隔选项（config.json 中 check_interval 为下标），默认每周
+CHECK_INTERVALS = (
+    ("每小时", 3600),
+    ("每天", 24 * 3600),
+    ("每三天", 3 * 24 * 3600),
+    ("每周", 7 * 24 * 3600),
+)
+DEFAULT_CHECK_INTERVAL = 3
+
+RETRY_BASE = 5 * 60        # 检查失败后的首次重试间隔（秒），之后每次加倍，不超过检查间隔
+JITTER_RATIO = 0.1         # 随机推迟下次检查的比例（相对于间隔）
+MAX_JITTER = 2 * 3600      # 随机推迟的上限（秒）
+MAX_WAIT = 15 * 60         # 后台线程每次最多等待的时间，系统休眠或时钟调整后能及时重新计算
+
+def interval_seconds(index) -> int:
+    """把 check_interval 下标转换为秒数，无效值按默认间隔处理"""
+    try:
+        return CHECK_INTERVALS[int(index)][1]
+    except (TypeError, ValueError, IndexError):
+        return CHECK_INTERVALS[DEFAULT_CHECK_INTERVAL][1]
+
+# ===== 测试用时钟 =====
+class FakeClock:
+    """测试用时钟：advance 手动推进时间，与 CheckScheduler(clock=clock.time) 配合使用"""
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+# ===== 自动检查调度 =====
+class CheckScheduler:
+    """后台自动检查调度
+
+    - 上次成功检查时间、连续失败次数和下次检查时间保存在 config.json，重启后沿用
+    - 距上次成功检查未超过检查间隔时，结果仍然新鲜，不会发起检查
+    - 下次检查时间随机推迟一小段，避免大量电脑在同一时刻访问官网
+    - 检查失败后按指数退避重试（5 分钟起，每次加倍，不超过检查间隔）
+    调度本身不依赖窗口：到期时调用 start(on_due) 传入的 on_due（在后台线程中），
+    由调用方启动检查，检查结束后调用 record_check 记录结果。
+    """
+    def __init__(self, clock: Callable[[], float] = time.time,
+                 rand: Callable[[], float] = random.random,
+                 load: Callable[[], dict] = load_config,
+                 save: Callable[..., dict] = update_config):
+        self.clock = clock
+        self.rand = rand
+        self.save = save
+        config = load()
+        self.enabled = bool(config.get("auto_check_enabled", True))
+        self.check_interval = config.get("check_interval", DEFAULT_CHECK_INTERVAL)
+        self.interval = interval_seconds(self.check_interval)
+        self.last_check_time = float(config.get("last_check_time") or 0)
+        self.next_check_time = float(config.get("next_check_time") or 0)
+        self.failures = int(config.get("check_failures") or 0)
+        self.in_flight = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._on_due: Optional[Callable[[], None]] = None
+        # 统计
+        self.started = 0
+        self.skipped_fresh = 0
+
+    # ----- 状态 -----
+    def is_fresh(self) -> bool:
+        """上次成功检查的结果是否仍在检查间隔内"""
+        return self.last_check_time > 0 and self.clock() - self.last_check_time < self.interval
+
+    def due_time(self) -> float:
+        """下次应检查的时间（从未检查过时立即到期）"""
+        if self.next_check_time:
+            return self.next_check_time
+        if self.last_check_time:
+            return self.last_check_time + self.interval
+        return 0.0
+
+    def seconds_until_due(self) -> Optional[float]:
+        """距离下次检查的秒数，未启用时返回 None"""
+        if not self.enabled:
+            return None
+        return max(0.0, self.due_time() - self.clock())
+
+    def _jitter(self, delay: float) -> float:
+        """随机推迟的秒数（只向后推迟，不会早于新鲜期结束）"""
+        return self.rand() * min(delay * JITTER_RATIO, MAX_JITTER)
+
+    # ----- 调度 -----
+    def poll(self) -> bool:
+        """到期则标记检查开始并返回 True；未到期、未启用或已有检查在进行时返回 False"""
+        with self._lock:
+            if not self.enabled or self.in_flight:
+                return False
+            if self.clock() < self.due_time():
+                return False
+            if self.failures == 0 and self.is_fresh():
+                # 其他途径（如手动检查）刚检查过，结果仍然新鲜
+                self.skipped_fresh += 1
+                self.next_check_time = self.last_check_time + self.interval + self._jitter(self.interval)
+                return False
+            self.in_flight = True
+            self.started += 1
+            return True
+
+    def record_started(self):
+        """记录检查开始（窗口中手动或启动时的检查也应调用，避免重复检查）"""
+        with self._lock:
+            self.in_flight = True
+
+    def record_check(self, ok: bool):
+        """记录一次检查的结果并计算下次检查时间（可在任意线程调用）"""
+        with self._lock:
+            now = self.clock()
+            self.in_flight = False
+            if ok:
+                self.last_check_time = now
+                self.failures = 0
+                delay = self.interval
+            else:
+                self.failures += 1
+                delay = min(RETRY_BASE * 2 ** (self.failures - 1), self.interval)
+            self.next_check_time = now + delay + self._jitter(delay)
+            self._persist()
+        self._wake.set()
+
+    def record_aborted(self):
+        """记录检查未得出结果（被取消、超时或出错）：清除进行中的标记，下次检查时间不变（可在任意线程调用）"""
+        with self._lock:
+            self.in_flight = False
+        self._wake.set()
+
+    def _persist(self):
+        """保存调度状态到配置文件（调用方需持有锁）"""
+        try:
+            self.save(
+                last_check_time=self.last_check_time,
+                next_check_time=self.next_check_time,
+                check_failures=self.failures
+            )
+        except Exception:
+            # 配置文件不可写时仍按内存中的状态调度
+            pass
+
+    # ----- 后台线程 -----
+    def start(self, on_due: Callable[[], None]):
+        """启动后台调度线程，到期时调用 on_due()"""
+        if self._thread is not None:
+            return
+        self._on_due = on_due
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="check-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止后台调度线程"""
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(1)
+            self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            if self.poll():
+                try:
+                    self._on_due()
+                except Exception:
+                    self.record_check(False)
+            wait = self.seconds_until_due()
+            wait = MAX_WAIT if wait is None else min(max(wait, 1.0), MAX_WAIT)
+            self._wake.wait(wait)
+            self._wake.clear()
+
+    def stats(self) -> dict:
+        """调度统计"""
+        return {
+            "enabled": self.enabled,
+            "interval": self.interval,
+            "started": self.started,
+            "skipped_fresh": self.skipped_fresh,
+            "failures": self.failures,
+            "next_check_time": self.next_check_time
+        }
+
+# ===== 全局调度器 =====
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler() -> CheckScheduler:
+    """获取进程内共享的自动检查调度器"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = CheckScheduler()
+    return _scheduler
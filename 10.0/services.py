@@ -0,0 +1,71 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import os
+from typing import Optional
+from urllib.parse import urlsplit
+
+from app_config import load_config
+
+# ===== 应用与官网配置 =====
+# 普通模式与通透模式共用同一份配置
+
+# 应用名称映射
+service_names = {
+    "pc_manager": "荣耀电脑管家",
+    "honor_workstation": "荣耀超级工作台",
+    "yoyo_assistant": "荣耀 YOYO 助理"
+}
+
+# 服务安装路径和版本获取方式
+installed_versions_config = {
+    "pc_manager": {
+        "type": "xml",
+        "path": r"C:\\Program Files\\HONOR\\PCManager\\config\\product_adapter_version.xml"
+    },
+    "honor_workstation": {
+        "type": "registry",
+        "path": r"SOFTWARE\\HONOR\\Hihonornote",
+        "value_name": "HonorWorkStationVersion"
+    },
+    "yoyo_assistant": {
+        "type": "xml",
+        "path": r"C:\\Program Files\\HONOR\\HNMagicAI\\config\\product_adapter_version.xml"
+    }
+}
+
+# 官网页面配置
+# extractor 为版本文本的提取方式（见 extractors.EXTRACTORS），
+# 可用 benchmarks/bench_extractors.py 对比各方式的耗时与内存
+website_config = {
+    "pc_manager": {
+        "url": "https://www.honor.com/cn/tech/pc-manager/",
+        "selector": ("p", "path"),
+        "extractor": "stream"
+    },
+    "honor_workstation": {
+        "url": "https://www.honor.com/cn/tech/honor-workstation/",
+        "selector": ("div", "btn-text"),
+        "extractor": "stream"
+    },
+    "yoyo_assistant": {
+        "url": "https://www.honor.com/cn/tech/pc-yoyo-assistant-2/",
+        "selector": ("p", "path"),
+        "extractor": "stream"
+    }
+}
+
+# ===== 官网地址 =====
+OFFICIAL_SITE = "https://www.honor.com"
+SITE_ENV = "HONOR_SITE_BASE_URL"  # 环境变量，优先于 config.json 的 site_base_url
+
+def redirect_site(base_url: Optional[str] = None):
+    """把官网页面地址指向另一个站点（保留路径），如本地的 stand_in_server；为空时恢复为官网"""
+    base_url = (base_url or OFFICIAL_SITE).rstrip("/")
+    for info in website_config.values():
+        parts = urlsplit(info["url"])
+        info["url"] = base_url + parts.path + (f"?{parts.query}" if parts.query else "")
+
+# 离线测试和基准测试时，通过环境变量或配置文件把官网地址指向本地替身服务
+_site_base_url = os.environ.get(SITE_ENV) or load_config().get("site_base_url")
+if _site_base_url:
+    redirect_site(_site_base_url)
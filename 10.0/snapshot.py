@@ -0,0 +1,114 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from app_config import get_data_path
+from card_state import CardState
+
+SNAPSHOT_VERSION = 1  # 快照格式版本，格式变化时旧快照直接丢弃
+
+# ===== 检查结果快照 =====
+class ResultSnapshot:
+    """上次检查结果的磁盘快照
+
+    窗口启动时先显示快照中的结果，同时在后台重新检查，只更新结果变化的卡片。
+    每个应用保存最近一次成功检查的显示状态和检查时间；请求出错的结果和手动设置
+    版本号后的结果不会覆盖快照。文件格式（紧凑JSON）：
+    {"v": 1, "results": {应用键: [检查时间, 本地版本, 官网版本, 状态, 状态类型, 链接, 请求失败]}}
+    """
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, tuple] = self._load()
+
+    def _load(self) -> Dict[str, tuple]:
+        """从磁盘读取快照，文件损坏或格式不符时从空快照开始"""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("v") != SNAPSHOT_VERSION:
+                return {}
+            entries = {}
+            for key, row in data.get("results", {}).items():
+                checked_at, *fields = row
+                entries[key] = (float(checked_at), CardState(*fields))
+            return entries
+        except Exception:
+            return {}
+
+    def states(self) -> Dict[str, CardState]:
+        """快照中各应用的显示状态"""
+        with self._lock:
+            return {key: state for key, (_, state) in self._entries.items()}
+
+    def checked_at(self, keys=None) -> Optional[float]:
+        """指定应用（默认全部）中最早的检查时间，快照为空时返回 None"""
+        with self._lock:
+            times = [self._entries[key][0] for key in (keys if keys is not None else self._entries)
+                     if key in self._entries]
+        return min(times) if times else None
+
+    def record(self, key: str, state: CardState):
+        """记录一个应用的最新检查结果"""
+        with self._lock:
+            self._entries[key] = (self._clock(), state)
+            self._dirty = True
+
+    def flush(self):
+        """有改动时写回磁盘（先写临时文件再替换，避免写坏快照）"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({
+                "v": SNAPSHOT_VERSION,
+                "results": {key: [checked_at, *state] for key, (checked_at, state) in self._entries.items()}
+            }, ensure_ascii=False, separators=(",", ":"))
+            self._dirty = False
+        try:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            # 快照写入失败不影响检查结果
+            pass
+
+# ===== 结果时间提示 =====
+def format_checked_at(checked_at: float, now: Optional[float] = None) -> str:
+    """检查时间的简短描述，如“3 小时前（10月17日 09:30）”"""
+    age = max(0.0, (time.time() if now is None else now) - checked_at)
+    if age < 60:
+        ago = "刚刚"
+    elif age < 3600:
+        ago = f"{int(age // 60)} 分钟前"
+    elif age < 24 * 3600:
+        ago = f"{int(age // 3600)} 小时前"
+    else:
+        ago = f"{int(age // (24 * 3600))} 天前"
+    when = datetime.fromtimestamp(checked_at)
+    return f"{ago}（{when.month}月{when.day}日 {when:%H:%M}）"
+
+def stale_text(checked_at: float, refreshing: bool, now: Optional[float] = None) -> str:
+    """快照结果的提示文字"""
+    text = f"以下为 {format_checked_at(checked_at, now)} 的检查结果"
+    return text + "，正在刷新..." if refreshing else text
+
+# ===== 全局快照实例 =====
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+def get_result_snapshot() -> ResultSnapshot:
+    """获取全局共享的检查结果快照"""
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                _snapshot = ResultSnapshot(get_data_path("results_snapshot.json"))
+    return _snapshot
@@ -0,0 +1,173 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import json
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import List, Optional
+
+import tracing
+from app_config import get_data_path, load_config
+from PySide6.QtCore import QObject, QTimer
+
+DEFAULT_THRESHOLD_MS = 200  # 跟踪时默认的卡顿阈值
+STALL_CAPACITY = 50         # 保留最近多少次卡顿
+
+# ===== 卡顿记录 =====
+class UIStall:
+    """一次UI线程卡顿：开始时间、持续时间和卡顿期间UI线程的Python调用栈"""
+    __slots__ = ("started_at", "duration", "stack", "location")
+
+    def __init__(self, started_at: float, duration: float, stack: Optional[List[str]]):
+        self.started_at = started_at
+        self.duration = duration
+        self.stack = "".join(stack) if stack else ""
+        # 栈顶的位置（文件:行号 函数），卡顿结束后才检测到时为空
+        self.location = stack[-1].strip().splitlines()[0] if stack else ""
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="milliseconds"),
+            "duration_ms": round(self.duration * 1000, 1),
+            "location": self.location,
+            "stack": self.stack
+        }
+
+# ===== 卡顿监测 =====
+class StallWatchdog(QObject):
+    """UI线程卡顿监测
+
+    UI线程中的定时器按 interval 记录心跳，两次心跳的间隔比预期多出 threshold 以上即为一次卡顿，
+    持续时间由心跳间隔精确得出。后台线程发现心跳超过 threshold 未更新时，
+    抓取UI线程此刻的Python调用栈，卡顿结束时与持续时间一起记入环形缓冲区（最多 capacity 次）。
+    """
+    def __init__(self, threshold_ms: float = DEFAULT_THRESHOLD_MS, capacity: int = STALL_CAPACITY, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.interval = min(0.05, self.threshold / 4)
+        self._stalls = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._main_ident = threading.main_thread().ident
+        self._beat = 0                  # 心跳序号
+        self._last_beat = time.perf_counter()
+        self._pending_stack = None      # (心跳序号, 调用栈)：后台线程在卡顿期间抓取的调用栈
+        self.stall_count = 0
+        self.max_stall = 0.0
+        self.total_stall = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(self.interval * 1000))
+        self._timer.timeout.connect(self._heartbeat)
+
+    def start(self):
+        self._last_beat = time.perf_counter()
+        self._timer.start()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._timer.stop()
+        self._stop.set()
+        self._thread = None
+
+    def _heartbeat(self):
+        """UI线程：按心跳间隔判断是否发生了卡顿"""
+        now = time.perf_counter()
+        stalled = now - self._last_beat - self.interval
+        with self._lock:
+            beat = self._beat
+            pending, self._pending_stack = self._pending_stack, None
+            self._beat += 1
+            self._last_beat = now
+        if stalled < self.threshold:
+            return
+        stack = pending[1] if pending and pending[0] == beat else None
+        stall = UIStall(time.time() - stalled, stalled, stack)
+        with self._lock:
+            self._stalls.append(stall)
+            self.stall_count += 1
+            self.max_stall = max(self.max_stall, stalled)
+            self.total_stall += stalled
+        tracing.elapsed("ui_stall", stalled, "stall", location=stall.location)
+
+    def _watch(self):
+        """后台线程：心跳超过阈值未更新时抓取UI线程的调用栈（每次卡顿只抓取一次）"""
+        while not self._stop.wait(self.threshold / 2):
+            with self._lock:
+                beat = self._beat
+                overdue = time.perf_counter() - self._last_beat - self.interval >= self.threshold
+                captured = self._pending_stack is not None and self._pending_stack[0] == beat
+            if not overdue or captured:
+                continue
+            frame = sys._current_frames().get(self._main_ident)
+            stack = traceback.format_stack(frame) if frame is not None else None
+            with self._lock:
+                if self._beat == beat:
+                    self._pending_stack = (beat, stack)
+
+    def stalls(self) -> List[UIStall]:
+        """最近的卡顿（从早到晚）"""
+        with self._lock:
+            return list(self._stalls)
+
+    def format_stats(self) -> str:
+        """卡顿统计的可读文本"""
+        if not self.stall_count:
+            return f"界面卡顿：无（阈值 {self.threshold * 1000:.0f} 毫秒）"
+        return (f"界面卡顿：{self.stall_count} 次，最长 {self.max_stall * 1000:.0f} 毫秒，"
+                f"共 {self.total_stall * 1000:.0f} 毫秒（阈值 {self.threshold * 1000:.0f} 毫秒）")
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {
+                "threshold_ms": round(self.threshold * 1000),
+                "count": self.stall_count,
+                "max_ms": round(self.max_stall * 1000, 1),
+                "total_ms": round(self.total_stall * 1000, 1),
+                "stalls": [stall.to_dict() for stall in self._stalls]
+            }
+
+    def export(self, path: str):
+        """导出为JSON"""
+        data = json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data)
+
+    def dump(self):
+        """有卡顿时写入 ui_stalls.json（退出程序时调用）"""
+        if self.stall_count:
+            try:
+                self.export(get_data_path("ui_stalls.json"))
+            except OSError:
+                pass
+
+# ===== 全局监测 =====
+_watchdog: Optional[StallWatchdog] = None
+
+def start_stall_watchdog(app) -> Optional[StallWatchdog]:
+    """按 config.json 的 stall_threshold_ms 开始监测UI线程卡顿（需在创建 QApplication 之后调用）
+
+    默认不开启（心跳定时器会定期唤醒UI线程）；开启跟踪（--trace）时默认按 200 毫秒的阈值开启。
+    设置为 0 时关闭。
+    """
+    global _watchdog
+    if _watchdog is None:
+        default = DEFAULT_THRESHOLD_MS if tracing.enabled() else 0
+        threshold_ms = float(load_config().get("stall_threshold_ms", default))
+        if threshold_ms <= 0:
+            return None
+        _watchdog = StallWatchdog(threshold_ms, parent=app)
+        _watchdog.start()
+        app.aboutToQuit.connect(_watchdog.dump)
+    return _watchdog
+
+def get_stall_watchdog() -> Optional[StallWatchdog]:
+    """正在运行的卡顿监测，未开启时返回 None"""
+    return _watchdog
@@ -0,0 +1,264 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""官网页面的本地替身服务（离线测试和基准测试用）
+
+用法：
+  python stand_in_server.py [--port 8765] [--latency 0.2] [--bandwidth 256] [--error-rate 0.1]
+  然后设置环境变量 HONOR_SITE_BASE_URL=http://127.0.0.1:8765（或 config.json 的 site_base_url）再启动程序
+
+按URL最后一段返回 fixtures/pages/ 中的页面副本（文件名与 website_config 中URL的最后一段对应），支持：
+- 延迟（每个请求在发送响应头之前等待）和带宽限制（响应体按字节/秒分段发送）
+- 按比例注入错误：返回错误状态码、直接断开连接，或发送一半响应体后断开
+- ETag / Last-Modified 与条件请求（304），gzip 压缩（请求头 Accept-Encoding 包含 gzip 时）
+- HTTP/1.1 keep-alive，可统计连接复用
+基准测试中可直接使用 StandInServer 在后台线程启动，并用 set_page 模拟官网更新页面。
+"""
+
+import argparse
+import gzip
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+ERROR_MODES = ("status", "reset", "truncate")
+CHUNK_SIZE = 16 * 1024  # 带宽限制时每次发送的字节数
+
+# ===== 页面 =====
+class Page:
+    """一个页面副本及其压缩内容和校验信息"""
+    def __init__(self, body: bytes, modified_at: float):
+        self.body = body
+        self.gzipped = gzip.compress(body, mtime=0)
+        self.etag = hashlib.sha1(body).hexdigest()[:16]
+        self.modified_at = int(modified_at)
+        self.last_modified = formatdate(self.modified_at, usegmt=True)
+
+    def etag_for(self, gzipped: bool) -> str:
+        """每种编码的内容使用不同的强校验值"""
+        return f'"{self.etag}-gz"' if gzipped else f'"{self.etag}"'
+
+# ===== 请求处理 =====
+class StandInHandler(BaseHTTPRequestHandler):
+    """按URL最后一段返回页面副本"""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        stand_in: "StandInServer" = self.server.stand_in
+        stand_in.count("requests")
+        if stand_in.latency > 0:
+            time.sleep(stand_in.latency)
+
+        name = self.path.split("?", 1)[0].rstrip("/").rsplit("/", 1)[-1]
+        page = stand_in.pages.get(name)
+        if page is None:
+            self._send_empty(404)
+            return
+
+        error_mode = stand_in.draw_error()
+        if error_mode == "status":
+            stand_in.count("errors")
+            self._send_empty(stand_in.error_status)
+            return
+        if error_mode == "reset":
+            stand_in.count("errors")
+            self.close_connection = True
+            return
+
+        gzipped = stand_in.gzip_enabled and "gzip" in self.headers.get("Accept-Encoding", "")
+        etag = page.etag_for(gzipped)
+        if self._not_modified(page, etag):
+            stand_in.count("not_modified")
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", page.last_modified)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = page.gzipped if gzipped else page.body
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", page.last_modified)
+        self.send_header("Vary", "Accept-Encoding")
+        if gzipped:
+            self.send_header("Content-Encoding", "gzip")
+            stand_in.count("gzipped")
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+
+        if error_mode == "truncate":
+            stand_in.count("errors")
+            body = body[:len(body) // 2]
+            self.close_connection = True
+        else:
+            stand_in.count("ok")
+        self._write_body(body, stand_in.bandwidth)
+
+    do_HEAD = do_GET
+
+    def _not_modified(self, page: Page, etag: str) -> bool:
+        """条件请求的校验信息是否与当前页面一致（有 If-None-Match 时忽略 If-Modified-Since）"""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= page.modified_at
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send_empty(self, status: int):
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _write_body(self, body: bytes, bandwidth: float):
+        """发送响应体，bandwidth 大于0时按字节/秒限速"""
+        stand_in: "StandInServer" = self.server.stand_in
+        try:
+            if bandwidth <= 0:
+                self.wfile.write(body)
+                stand_in.count("bytes_sent", len(body))
+                return
+            for start in range(0, len(body), CHUNK_SIZE):
+                chunk = body[start:start + CHUNK_SIZE]
+                time.sleep(len(chunk) / bandwidth)
+                self.wfile.write(chunk)
+                self.wfile.flush()
+                stand_in.count("bytes_sent", len(chunk))
+        except OSError:
+            # 客户端提前断开（流式提取找到版本后即停止读取）
+            self.close_connection = True
+
+    def log_message(self, format, *values):
+        if self.server.stand_in.verbose:
+            super().log_message(format, *values)
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # 客户端提前断开连接属于正常情况，不输出异常
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+# ===== 替身服务 =====
+class StandInServer:
+    """官网页面的本地替身服务
+
+    - latency：每个请求的延迟（秒）
+    - bandwidth：每个响应体的发送速度（字节/秒），0 为不限速
+    - error_rate：注入错误的比例，error_mode 为 status（返回 error_status）、reset 或 truncate
+    - seed：错误注入的随机种子，相同的请求顺序得到相同的错误
+    """
+    def __init__(self, pages_dir: str = PAGES_DIR, latency: float = 0.0, bandwidth: float = 0,
+                 error_rate: float = 0.0, error_mode: str = "status", error_status: int = 503,
+                 gzip_enabled: bool = True, seed: Optional[int] = None, verbose: bool = False):
+        if error_mode not in ERROR_MODES:
+            raise ValueError(f"未知的错误注入方式: {error_mode}")
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_mode = error_mode
+        self.error_status = error_status
+        self.gzip_enabled = gzip_enabled
+        self.verbose = verbose
+        self.pages: Dict[str, Page] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {}
+        self._server: Optional[_StandInHTTPServer] = None
+        self.reset_stats()
+        for file_name in sorted(os.listdir(pages_dir)):
+            if file_name.endswith(".html"):
+                path = os.path.join(pages_dir, file_name)
+                with open(path, "rb") as f:
+                    self.pages[file_name[:-5]] = Page(f.read(), os.path.getmtime(path))
+
+    def set_page(self, name: str, body: bytes):
+        """替换页面内容（模拟官网更新），校验信息随之改变"""
+        previous = self.pages.get(name)
+        modified_at = time.time()
+        if previous is not None:
+            modified_at = max(modified_at, previous.modified_at + 1)
+        self.pages[name] = Page(body, modified_at)
+
+    def draw_error(self) -> Optional[str]:
+        """按比例决定本次请求是否注入错误"""
+        if self.error_rate <= 0:
+            return None
+        with self._lock:
+            return self.error_mode if self._random.random() < self.error_rate else None
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] = self._stats.get(name, 0) + amount
+
+    def stats(self) -> Dict[str, int]:
+        """请求、成功、304、错误、gzip 响应的次数和发送的字节数"""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {"requests": 0, "ok": 0, "not_modified": 0, "errors": 0, "gzipped": 0, "bytes_sent": 0}
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """在后台线程启动服务，返回其地址（port 为0时自动选择端口）"""
+        self._server = _StandInHTTPServer((host, port), StandInHandler)
+        self._server.stand_in = self
+        threading.Thread(target=self._server.serve_forever, name="stand-in-server", daemon=True).start()
+        return self.base_url
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+def main():
+    parser = argparse.ArgumentParser(description="官网页面的本地替身服务")
+    parser.add_argument("--host", default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--pages", default=PAGES_DIR, help="页面副本目录")
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的延迟（秒）")
+    parser.add_argument("--bandwidth", type=float, default=0, help="带宽限制（KB/s），0 为不限速")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="注入错误的比例（0~1）")
+    parser.add_argument("--error-mode", choices=ERROR_MODES, default="status", help="错误注入方式")
+    parser.add_argument("--error-status", type=int, default=503, help="error-mode 为 status 时返回的状态码")
+    parser.add_argument("--no-gzip", action="store_true", help="不使用 gzip 压缩")
+    parser.add_argument("--seed", type=int, help="错误注入的随机种子")
+    parser.add_argument("--verbose", action="store_true", help="输出每个请求")
+    args = parser.parse_args()
+
+    server = StandInServer(args.pages, args.latency, args.bandwidth * 1024, args.error_rate, args.error_mode,
+                           args.error_status, not args.no_gzip, args.seed, args.verbose)
+    base_url = server.start(args.host, args.port)
+    print(f"替身服务：{base_url}（页面：{', '.join(server.pages)}）")
+    print(f"使用方式：设置环境变量 HONOR_SITE_BASE_URL={base_url} 后启动程序，按 Ctrl+C 停止")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(server.stats())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+from functools import lru_cache
+
+from PySide6.QtCore import QEvent
+from PySide6.QtWidgets import QApplication, QWidget
+
+# 状态标签的 status 动态属性取值，对应样式表中的 QLabel#StatusLabel[status="..."]
+STATUS_TYPES = ("up_to_date", "update_available", "error", "higher_version")
+
+# ===== 普通模式 =====
+# 各主题的颜色
+NORMAL_PALETTES = {
+    False: {
+        "window_bg": "#f3f3f3",
+        "window_text": "#212529",
+        "card_bg": "white",
+        "card_border": "#e9ecef",
+        "card_hover_border": "#dee2e6",
+        "text": "#495057",
+        "info": "#6c757d",
+        "button_border": "#dee2e6",
+        "button_hover": "#f3f3f3",
+    },
+    True: {
+        "window_bg": "#1e1e1e",
+        "window_text": "#f3f3f3",
+        "card_bg": "#2d2d2d",
+        "card_border": "#404040",
+        "card_hover_border": "#404040",
+        "text": "#f3f3f3",
+        "info": "#adb5bd",
+        "button_border": "#404040",
+        "button_hover": "#3a3a3a",
+    },
+}
+
+# 状态标签颜色（背景色，文字颜色），两种主题相同
+NORMAL_STATUS_COLORS = {
+    "up_to_date": ("#d4edda", "#155724"),
+    "update_available": ("#fff3cd", "#856404"),
+    "error": ("#f8d7da", "#721c24"),
+    "higher_version": ("#d1ecf1", "#0c5460"),
+}
+
+# 通透模式的状态标签颜色
+GLASS_STATUS_COLORS = {
+    "up_to_date": ("rgba(45, 62, 54, 0.8)", "rgba(146, 208, 80, 1)"),
+    "update_available": ("rgba(62, 54, 45, 0.8)", "rgba(255, 193, 7, 1)"),
+    "error": ("rgba(62, 45, 45, 0.8)", "rgba(255, 107, 107, 1)"),
+    "higher_version": ("rgba(45, 54, 62, 0.8)", "rgba(119, 191, 249, 1)"),
+}
+
+def _status_rules(colors: dict) -> str:
+    """生成按 status 动态属性区分的状态标签样式"""
+    rules = []
+    for status_type, (background, color) in colors.items():
+        rules.append(f"""
+            QLabel#StatusLabel[status="{status_type}"] {{
+                background-color: {background};
+                color: {color};
+                padding: 4px 12px;
+                border-radius: 16px;
+                font-weight: 500;
+            }}""")
+    return "".join(rules)
+
+@lru_cache(maxsize=None)
+def normal_style_sheet(is_dark_mode: bool) -> str:
+    """普通模式的整窗样式表（每个主题只生成一次）
+
+    包含窗口、卡片、状态标签、进度区域、按钮和滚动区域的样式，设置在 MainWindow 上，
+    子控件不再单独设置随主题变化的样式表。
+    """
+    p = NORMAL_PALETTES[is_dark_mode]
+    return f"""
+            /* 主窗口样式 */
+            MainWindow {{
+                background-color: {p["window_bg"]};
+                color: {p["window_text"]};
+            }}
+
+            /* 卡片样式 */
+            .Card {{
+                background-color: {p["card_bg"]};
+                border-radius: 12px;
+                border: 1px solid {p["card_border"]};
+                padding: 16px;
+                margin: 8px;
+            }}
+
+            /* 按钮样式 */
+            .PrimaryButton {{
+                background-color: #3773e8;
+                color: white;
+                border: none;
+                border-radius: 20px;
+                padding: 8px 24px;
+                font-size: 14px;
+                font-weight: 500;
+            }}
+            .PrimaryButton:hover {{
+                background-color: #4285f4;
+            }}
+            .PrimaryButton:pressed {{
+                background-color: #2c66d4;
+            }}
+
+            /* 状态标签样式 */
+            .StatusLabel {{
+                font-weight: 500;
+                padding: 4px 8px;
+                border-radius: 12px;
+                font-size: 12px;
+            }}
+
+            /* 信息文本样式 */
+            .InfoText {{
+                color: {p["info"]};
+                font-size: 12px;
+            }}
+
+            /* 软件卡片 */
+            QFrame#SoftwareCard {{
+                background-color: {p["card_bg"]};
+                border-radius: 16px;
+                border: 1px solid {p["card_border"]};
+                padding: 20px;
+            }}
+            QFrame#SoftwareCard:hover {{
+                border-color: {p["card_hover_border"]};
+            }}
+            QLabel#CardName, QLabel#VersionValue {{
+                color: {p["text"]};
+                background-color: transparent;
+            }}
+            QPushButton#DownloadButton {{
+                background-color: #3773e8;
+                color: white;
+                border: none;
+                border-radius: 16px;
+                padding: 6px 16px;
+                font-size: 12px;
+            }}
+            QPushButton#DownloadButton:hover {{
+                background-color: #4285f4;
+            }}
+            QPushButton#DownloadButton:disabled {{
+                background-color: #adb5bd;
+                color: #6c757d;
+            }}
+            {_status_rules(NORMAL_STATUS_COLORS)}
+
+            /* 进度区域 */
+            QFrame#ProgressFrame {{
+                background-color: {p["card_bg"]};
+                border-radius: 12px;
+                border: 1px solid {p["card_border"]};
+                padding: 16px;
+                margin-top: 0;
+            }}
+            QLabel#ProgressLabel {{
+                color: {p["text"]};
+            }}
+            QLabel#PlaceholderLabel {{
+                color: {p["info"]};
+                font-size: 14px;
+                padding: 40px;
+            }}
+            QLabel#StaleLabel {{
+                color: {p["info"]};
+                font-size: 12px;
+            }}
+
+            /* 全部展开按钮 */
+            QPushButton#ExpandButton {{
+                background-color: {p["card_bg"]};
+                color: {p["text"]};
+                border: 1px solid {p["button_border"]};
+                border-radius: 20px;
+                padding: 0 16px;
+                font-size: 13px;
+            }}
+            QPushButton#ExpandButton:hover {{
+                background-color: {p["button_hover"]};
+            }}
+
+            /* 结果滚动区域（隐藏滚动条，不影响对话框等其他控件） */
+            QScrollArea#ResultsArea {{
+                border: none;
+                background-color: transparent;
+            }}
+            QScrollArea#ResultsArea QScrollBar:vertical {{
+                width: 0px;
+                background-color: transparent;
+                margin: 0;
+            }}
+            QScrollArea#ResultsArea QScrollBar::handle:vertical {{
+                background-color: transparent;
+                width: 0px;
+            }}
+            QScrollArea#ResultsArea QScrollBar::add-line:vertical,
+            QScrollArea#ResultsArea QScrollBar::sub-line:vertical {{
+                height: 0px;
+                subcontrol-origin: margin;
+            }}
+        """
+
+# ===== 通透模式 =====
+@lru_cache(maxsize=None)
+def glass_style_sheet() -> str:
+    """通透模式的整窗样式表（与系统主题无关，只生成一次）"""
+    return f"""
+            /* 完全透明背景，由系统毛玻璃提供底色 */
+            * {{
+                background-color: rgba(0, 0, 0, 0);
+            }}
+
+            /* 软件卡片 */
+            QFrame#SoftwareCard {{
+                background-color: rgba(255, 255, 255, 0.1);
+                border-radius: 16px;
+                border: 1px solid rgba(255, 255, 255, 0.2);
+                padding: 20px;
+            }}
+            QLabel#CardName, QLabel#VersionValue {{
+                color: white;
+                background-color: transparent;
+            }}
+            QPushButton#DownloadButton {{
+                background-color: rgba(55, 115, 232, 0.8);
+                color: white;
+                border: none;
+                border-radius: 16px;
+                padding: 6px 16px;
+                font-size: 12px;
+            }}
+            QPushButton#DownloadButton:hover {{
+                background-color: rgba(66, 133, 244, 1);
+            }}
+            QPushButton#DownloadButton:disabled {{
+                background-color: rgba(173, 181, 189, 0.5);
+                color: rgba(255, 255, 255, 0.6);
+            }}
+            {_status_rules(GLASS_STATUS_COLORS)}
+
+            /* 快照结果提示 */
+            QLabel#StaleLabel {{
+                color: rgba(255, 255, 255, 0.7);
+                font-size: 12px;
+            }}
+        """
+
+# ===== 状态标签 =====
+def set_status_style(label: QWidget, status_type: str):
+    """通过 status 动态属性切换状态标签样式，只重新应用该标签自身的样式"""
+    if label.property("status") == status_type:
+        return
+    label.setProperty("status", status_type)
+    style = label.style()
+    style.unpolish(label)
+    style.polish(label)
+    # polish 不会重新计算 QFrame 的边框和内边距，需要再发送 StyleChange（与 setStyleSheet 相同）
+    QApplication.sendEvent(label, QEvent(QEvent.StyleChange))
+    label.update()
@@ -0,0 +1,238 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import sys
+import threading
+from typing import Callable, Optional
+
+try:
+    import winreg
+except ImportError:
+    # 非 Windows 平台（如在 Linux 上测试）
+    winreg = None
+
+PERSONALIZE_KEY = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Themes\Personalize"
+
+def read_system_dark_mode() -> bool:
+    """读取系统是否使用深色主题，读取失败时按浅色主题处理"""
+    try:
+        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, PERSONALIZE_KEY)
+        try:
+            value, _ = winreg.QueryValueEx(key, "AppsUseLightTheme")
+        finally:
+            winreg.CloseKey(key)
+        # 值为0时是深色模式
+        return value == 0
+    except Exception:
+        return False
+
+# ===== 变化通知后端 =====
+class ThemeBackend:
+    """主题变化通知后端
+
+    start(on_change) 开始监听，设置可能发生变化时调用 on_change（可在任意线程），
+    由 ThemeWatcher 重新读取主题并判断是否真的变化。无法使用时 start 抛出异常。
+    """
+    name = ""
+
+    def start(self, on_change: Callable[[], None]):
+        raise NotImplementedError
+
+    def stop(self):
+        pass
+
+class RegistryNotifyBackend(ThemeBackend):
+    """通过 RegNotifyChangeKeyValue 等待 Personalize 注册表键的变化
+
+    后台线程阻塞在 WaitForMultipleObjects 上，设置不变时不会被唤醒，没有任何周期性工作。
+    """
+    name = "registry"
+
+    REG_NOTIFY_CHANGE_LAST_SET = 0x00000004
+    WAIT_OBJECT_0 = 0
+    INFINITE = 0xFFFFFFFF
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = None
+        self._kernel32 = None
+
+    def start(self, on_change: Callable[[], None]):
+        if sys.platform != "win32" or winreg is None:
+            raise OSError("注册表变更通知仅支持 Windows")
+
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.CreateEventW.restype = wintypes.HANDLE
+        kernel32.CreateEventW.argtypes = [ctypes.c_void_p, wintypes.BOOL, wintypes.BOOL, wintypes.LPCWSTR]
+        kernel32.SetEvent.argtypes = [wintypes.HANDLE]
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        kernel32.WaitForMultipleObjects.restype = wintypes.DWORD
+        kernel32.WaitForMultipleObjects.argtypes = [
+            wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE), wintypes.BOOL, wintypes.DWORD
+        ]
+        advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
+        advapi32.RegNotifyChangeKeyValue.restype = wintypes.LONG
+        advapi32.RegNotifyChangeKeyValue.argtypes = [
+            wintypes.HKEY, wintypes.BOOL, wintypes.DWORD, wintypes.HANDLE, wintypes.BOOL
+        ]
+
+        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, PERSONALIZE_KEY, 0,
+                             winreg.KEY_NOTIFY | winreg.KEY_QUERY_VALUE)
+        self._kernel32 = kernel32
+        self._stop_event = kernel32.CreateEventW(None, True, False, None)
+        ready = threading.Event()
+        result = {}
+
+        def wait_loop():
+            change_event = kernel32.CreateEventW(None, False, False, None)
+            handles = (wintypes.HANDLE * 2)(change_event, self._stop_event)
+            try:
+                while True:
+                    # 每次通知只触发一次，需要重新注册
+                    rc = advapi32.RegNotifyChangeKeyValue(
+                        wintypes.HKEY(key.handle), False, self.REG_NOTIFY_CHANGE_LAST_SET, change_event, True
+                    )
+                    if not ready.is_set():
+                        result["rc"] = rc
+                        ready.set()
+                    if rc != 0:
+                        break
+                    if kernel32.WaitForMultipleObjects(2, handles, False, self.INFINITE) != self.WAIT_OBJECT_0:
+                        break
+                    on_change()
+            finally:
+                kernel32.CloseHandle(change_event)
+                winreg.CloseKey(key)
+                ready.set()
+
+        self._thread = threading.Thread(target=wait_loop, name="theme-watcher", daemon=True)
+        self._thread.start()
+        ready.wait(5)
+        if result.get("rc") != 0:
+            self.stop()
+            raise OSError(f"RegNotifyChangeKeyValue 失败: {result.get('rc')}")
+
+    def stop(self):
+        if self._stop_event is not None:
+            self._kernel32.SetEvent(self._stop_event)
+            if self._thread is not None:
+                self._thread.join(1)
+            self._kernel32.CloseHandle(self._stop_event)
+            self._stop_event = None
+            self._thread = None
+
+class PollingBackend(ThemeBackend):
+    """定时重新读取主题（仅在没有变化通知可用时使用）"""
+    name = "polling"
+
+    def __init__(self, interval: float = 2.0):
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, on_change: Callable[[], None]):
+        self._stopped.clear()
+
+        def poll_loop():
+            while not self._stopped.wait(self.interval):
+                on_change()
+
+        self._thread = threading.Thread(target=poll_loop, name="theme-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(1)
+            self._thread = None
+
+class FakeThemeBackend(ThemeBackend):
+    """测试用后端：set_dark_mode 修改“系统”主题并立即发出通知
+
+    与 ThemeWatcher(read_theme=backend.read) 配合使用，可在非 Windows 平台验证监听逻辑。
+    """
+    name = "fake"
+
+    def __init__(self, is_dark_mode: bool = False):
+        self.is_dark_mode = is_dark_mode
+        self.running = False
+        self._on_change: Optional[Callable[[], None]] = None
+
+    def read(self) -> bool:
+        return self.is_dark_mode
+
+    def start(self, on_change: Callable[[], None]):
+        self._on_change = on_change
+        self.running = True
+
+    def stop(self):
+        self.running = False
+        self._on_change = None
+
+    def notify(self):
+        """发出一次通知（设置未必真的变化）"""
+        if self._on_change is not None:
+            self._on_change()
+
+    def set_dark_mode(self, is_dark_mode: bool):
+        self.is_dark_mode = is_dark_mode
+        self.notify()
+
+# ===== 主题监听器 =====
+class ThemeWatcher:
+    """监听系统深色/浅色主题的变化
+
+    优先使用注册表变更通知，不可用时才退回到定时读取。主题真正变化时调用
+    on_theme_changed(is_dark_mode)，调用发生在后端线程中，界面需通过信号转到UI线程。
+    """
+    def __init__(self, on_theme_changed: Callable[[bool], None],
+                 backend: Optional[ThemeBackend] = None,
+                 read_theme: Callable[[], bool] = read_system_dark_mode,
+                 initial: Optional[bool] = None):
+        self.on_theme_changed = on_theme_changed
+        self.backend = backend
+        self.read_theme = read_theme
+        self.is_dark_mode = read_theme() if initial is None else initial
+        self._lock = threading.Lock()
+        # 统计：收到的通知次数、主题实际变化的次数
+        self.notifications = 0
+        self.changes = 0
+
+    def start(self):
+        """开始监听：未指定后端时优先使用注册表变更通知"""
+        if self.backend is not None:
+            self.backend.start(self._on_notify)
+            return
+        try:
+            backend = RegistryNotifyBackend()
+            backend.start(self._on_notify)
+        except Exception:
+            backend = PollingBackend()
+            backend.start(self._on_notify)
+        self.backend = backend
+
+    def stop(self):
+        """停止监听"""
+        if self.backend is not None:
+            self.backend.stop()
+
+    def _on_notify(self):
+        """后端通知设置可能变化：重新读取主题，确实变化时回调"""
+        with self._lock:
+            self.notifications += 1
+            is_dark_mode = self.read_theme()
+            if is_dark_mode == self.is_dark_mode:
+                return
+            self.is_dark_mode = is_dark_mode
+            self.changes += 1
+        self.on_theme_changed(is_dark_mode)
+
+    def stats(self) -> dict:
+        """监听统计"""
+        return {
+            "backend": self.backend.name if self.backend else "",
+            "notifications": self.notifications,
+            "changes": self.changes
+        }
@@ -0,0 +1,234 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QObject, QTimer
+from PySide6.QtGui import QImage
+
+from optional_deps import get_numpy
+
+RGB = Tuple[int, int, int]
+
+# 横向取色点（占窗口宽度的百分比）：1%, 25%, 50%, 75%, 99%
+SAMPLE_PERCENTS = (0.01, 0.25, 0.5, 0.75, 0.99)
+# 颜色相似度阈值（RGB欧氏距离）
+SIMILARITY_THRESHOLD = 20
+# 取色失败时使用的颜色（深色主题背景色调淡版）
+DEFAULT_COLOR = "#2d2d2d"
+
+# 整行主色提取的参数
+QUANTIZE_BITS = 4      # 直方图每个通道的量化位数（16级，每级宽16，小于相似度阈值）
+MAX_ITERATIONS = 3     # 主色修正的最大迭代次数
+
+# ===== 颜色计算 =====
+def cluster_colors(colors: Sequence[RGB], threshold: float = SIMILARITY_THRESHOLD) -> RGB:
+    """颜色聚类：找出最相近的颜色组，返回最大一组的平均颜色"""
+    def color_distance(c1, c2):
+        return ((c1[0] - c2[0]) ** 2 + (c1[1] - c2[1]) ** 2 + (c1[2] - c2[2]) ** 2) ** 0.5
+
+    clusters: List[List[RGB]] = []
+    for color in colors:
+        # 与聚类中第一个颜色比较距离（简化处理）
+        for cluster in clusters:
+            if color_distance(color, cluster[0]) < threshold:
+                cluster.append(color)
+                break
+        else:
+            clusters.append([color])
+
+    if not clusters:
+        return (45, 45, 45)  # 默认颜色
+
+    largest_cluster = max(clusters, key=len)
+    return (
+        sum(c[0] for c in largest_cluster) // len(largest_cluster),
+        sum(c[1] for c in largest_cluster) // len(largest_cluster),
+        sum(c[2] for c in largest_cluster) // len(largest_cluster)
+    )
+
+def dominant_color(pixels, threshold: float = SIMILARITY_THRESHOLD,
+                   max_iterations: int = MAX_ITERATIONS, bits: int = QUANTIZE_BITS) -> RGB:
+    """向量化提取整行像素的主色
+
+    先用量化直方图找出像素最多的颜色格，以格子中心为初值，再反复取与当前主色
+    距离小于 threshold 的像素求平均（最多 max_iterations 次）。与5点聚类的
+    “最大一组相近颜色的平均值”含义一致，但覆盖整行像素。
+    pixels 为 (N, 3) 的 uint8 数组。
+    """
+    np = get_numpy()
+    px = np.asarray(pixels, dtype=np.int32).reshape(-1, 3)
+    if len(px) == 0:
+        return (45, 45, 45)  # 默认颜色
+
+    # 量化直方图：每个像素映射到一个颜色格，取像素最多的格子
+    shift = 8 - bits
+    level_mask = (1 << bits) - 1
+    weights = np.array([1 << (2 * bits), 1 << bits, 1], dtype=np.int32)
+    seed = int(np.bincount((px >> shift) @ weights, minlength=1 << (3 * bits)).argmax())
+    center = np.array([
+        ((seed >> (2 * bits)) & level_mask) << shift,
+        ((seed >> bits) & level_mask) << shift,
+        (seed & level_mask) << shift
+    ], dtype=np.int32) + (1 << (shift - 1))
+
+    # 在阈值范围内修正主色（格内像素与格子中心的距离必然小于阈值，成员不会为空）
+    threshold_sq = threshold * threshold
+    for _ in range(max_iterations):
+        diff = px - center
+        members = np.einsum("ij,ij->i", diff, diff) < threshold_sq
+        count = np.count_nonzero(members)
+        if count == 0:
+            break
+        new_center = (members.astype(np.int32) @ px) // count
+        if (new_center == center).all():
+            break
+        center = new_center
+
+    return tuple(int(v) for v in center)
+
+def pick_caption_rgb(pixels) -> RGB:
+    """从取色数据得到主色：整行像素数组走向量化主色提取，取色点列表走5点聚类"""
+    if isinstance(pixels, (list, tuple)):
+        return cluster_colors(pixels)
+    return dominant_color(pixels)
+
+def strip_pixels(image: QImage):
+    """把截取的一行像素转换为取色数据
+
+    NumPy 可用时返回整行像素的 (N, 3) 数组，否则返回 SAMPLE_PERCENTS 处的取色点列表。
+    """
+    if image.isNull():
+        return []
+    np = get_numpy()
+    if np is None:
+        colors = []
+        for percent in SAMPLE_PERCENTS:
+            x = min(int(image.width() * percent), image.width() - 1)
+            color = image.pixelColor(x, 0)
+            colors.append((color.red(), color.green(), color.blue()))
+        return colors
+
+    image = image.convertToFormat(QImage.Format_RGB888)
+    data = np.frombuffer(image.constBits(), dtype=np.uint8, count=image.sizeInBytes())
+    rows = data.reshape(image.height(), image.bytesPerLine())[:, :image.width() * 3]
+    return rows.reshape(-1, 3).copy()
+
+def adjust_caption_color(rgb: RGB) -> str:
+    """根据取色结果调整标题栏颜色，返回十六进制颜色"""
+    avg_r, avg_g, avg_b = rgb
+    # 1. 对于白色(ffffff)，调整为d7d7d7
+    if avg_r == 255 and avg_g == 255 and avg_b == 255:
+        r, g, b = 215, 215, 215
+    # 2. 对于深色，根据亮度进行调整
+    elif avg_r < 50 and avg_g < 50 and avg_b < 50:
+        # 1e1f22(30,31,34) -> 222222(34,34,34)
+        # 1a1b1d(26,27,29) -> 1c1d1f(28,29,31)
+        avg_brightness = (avg_r + avg_g + avg_b) // 3
+        if avg_brightness < 30:  # 极暗
+            r, g, b = avg_r + 3, avg_g + 2, avg_b + 3
+        else:  # 一般暗
+            r, g, b = avg_r + 2, avg_g + 2, avg_b + 2
+    # 3. 对于蓝色系深色(如091c3a)
+    elif avg_r < 30 and avg_g < 50 and avg_b > 50:
+        # 091c3a(9,28,58) -> 0c1e3d(12,30,61)
+        r, g, b = avg_r + 3, avg_g + 2, avg_b + 3
+    else:
+        # 其他情况使用平均颜色
+        r, g, b = avg_r, avg_g, avg_b
+
+    r = max(0, min(255, r))
+    g = max(0, min(255, g))
+    b = max(0, min(255, b))
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+# ===== 取色调度 =====
+class TitleBarSampler(QObject):
+    """通透模式标题栏取色调度
+
+    - 窗口移动、缩放、激活时（合并短时间内的多次触发）取色
+    - 其余时间按自适应间隔低频取色：颜色变化后回到最短间隔，不变时逐步加倍
+    - 颜色与上次相同时不调用 DWM；窗口隐藏或最小化时完全停止
+    grab_strip() 截取一次标题栏下方的一行像素并返回取色数据（见 strip_pixels），
+    apply_color(hex) 设置标题栏颜色并返回实际调用 DwmSetWindowAttribute 的次数。
+    """
+    def __init__(self, grab_strip: Callable[[], Sequence[RGB]], apply_color: Callable[[str], int],
+                 parent: Optional[QObject] = None, debounce_ms: int = 80,
+                 min_interval_ms: int = 1000, max_interval_ms: int = 8000):
+        super().__init__(parent)
+        self.grab_strip = grab_strip
+        self.apply_color = apply_color
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max_interval_ms
+        self.interval_ms = min_interval_ms
+        self.current_color: Optional[str] = None
+        self.active = False
+
+        # 事件触发的取色（防抖）
+        self._debounce_timer = QTimer(self)
+        self._debounce_timer.setSingleShot(True)
+        self._debounce_timer.setInterval(debounce_ms)
+        self._debounce_timer.timeout.connect(self.sample)
+
+        # 低频兜底取色
+        self._fallback_timer = QTimer(self)
+        self._fallback_timer.setSingleShot(True)
+        self._fallback_timer.timeout.connect(self.sample)
+
+        # 统计
+        self.samples = 0
+        self.grabs = 0
+        self.dwm_calls = 0
+        self.skipped = 0
+
+    def start(self):
+        """窗口显示或还原时开始取色"""
+        if self.active:
+            return
+        self.active = True
+        self.interval_ms = self.min_interval_ms
+        self.sample()
+
+    def stop(self):
+        """窗口隐藏或最小化时停止取色"""
+        self.active = False
+        self._debounce_timer.stop()
+        self._fallback_timer.stop()
+
+    def request_sample(self):
+        """窗口移动、缩放、激活时请求取色"""
+        if self.active:
+            self._debounce_timer.start()
+
+    def sample(self):
+        """截取一次并在颜色变化时更新标题栏"""
+        if not self.active:
+            return
+        self._debounce_timer.stop()
+        self.samples += 1
+        try:
+            self.grabs += 1
+            color = adjust_caption_color(pick_caption_rgb(self.grab_strip()))
+        except Exception:
+            color = DEFAULT_COLOR
+
+        if color == self.current_color:
+            self.skipped += 1
+            self.interval_ms = min(self.interval_ms * 2, self.max_interval_ms)
+        else:
+            self.current_color = color
+            self.dwm_calls += self.apply_color(color)
+            self.interval_ms = self.min_interval_ms
+        self._fallback_timer.start(self.interval_ms)
+
+    def stats(self) -> dict:
+        """取色统计"""
+        return {
+            "samples": self.samples,
+            "grabs": self.grabs,
+            "dwm_calls": self.dwm_calls,
+            "skipped": self.skipped
+        }
+
+    def format_stats(self) -> str:
+        """取色统计的可读文本"""
+        return f"标题栏取色：截屏 {self.grabs} 次，DWM 调用 {self.dwm_calls} 次"
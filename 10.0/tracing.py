@@ -0,0 +1,255 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+"""Chrome 跟踪事件（Trace Event Format）记录
+
+用法：python main.py --trace out.json，退出时写入 out.json，可在 chrome://tracing 或 https://ui.perfetto.dev 中打开。
+记录模块导入、窗口创建、主题应用、检查任务各阶段（含各应用在抓取线程中的各阶段）、
+工作线程到UI线程的信号传递（连线显示从发出到处理的等待）以及卡片动画，全部显示在同一时间轴上。
+未开启跟踪时 span 返回共享的空对象，traced 装饰的函数只多一次判断，信号和动画不做任何处理。
+"""
+
+import atexit
+import builtins
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+# ===== 跟踪记录 =====
+class Span:
+    """一段耗时（完整事件，ph 为 X）"""
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer: "Tracer", name: str, cat: str, args: Optional[dict]):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = self.tracer.now()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.complete(self.name, self.cat, self.start, self.tracer.now(), self.args)
+
+class NullSpan:
+    """未开启跟踪时使用的空对象"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+NULL_SPAN = NullSpan()
+
+class Tracer:
+    """收集跟踪事件，save 时写为 JSON（时间单位为微秒，从开始跟踪时算起）"""
+    def __init__(self, path: str):
+        self.path = path
+        self.pid = 1
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._events: List[dict] = []
+        self._thread_names: Dict[int, str] = {}
+        self._threads = threading.local()  # 每个线程的编号（线程标识在线程结束后会被复用）
+        self._next_id = 0
+        self._pending_signals: Dict[str, deque] = {}
+        self._animations: Dict[int, tuple] = {}
+        self._saved = False
+
+    def now(self) -> float:
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def _new_id(self) -> int:
+        with self._lock:
+            self._next_id += 1
+            return self._next_id
+
+    def add(self, event: dict):
+        """记录一个事件，首次出现的线程同时记录线程名"""
+        tid = getattr(self._threads, "tid", None)
+        if tid is None:
+            tid = self._threads.tid = self._new_id()
+            with self._lock:
+                self._thread_names[tid] = threading.current_thread().name
+        event["pid"] = self.pid
+        event["tid"] = tid
+        with self._lock:
+            self._events.append(event)
+
+    def span(self, name: str, cat: str = "app", args: Optional[dict] = None) -> Span:
+        return Span(self, name, cat, args)
+
+    def complete(self, name: str, cat: str, start: float, end: float, args: Optional[dict] = None):
+        event = {"name": name, "cat": cat, "ph": "X", "ts": start, "dur": end - start}
+        if args:
+            event["args"] = args
+        self.add(event)
+
+    def instant(self, name: str, cat: str = "app", args: Optional[dict] = None):
+        event = {"name": name, "cat": cat, "ph": "i", "s": "t", "ts": self.now()}
+        if args:
+            event["args"] = args
+        self.add(event)
+
+    # ----- 信号传递 -----
+    def signal_emitted(self, name: str):
+        """信号在发送线程中发出：记录瞬时事件和连线起点"""
+        flow_id = self._new_id()
+        ts = self.now()
+        self.add({"name": name, "cat": "signal", "ph": "i", "s": "t", "ts": ts})
+        self.add({"name": name, "cat": "signal", "ph": "s", "id": flow_id, "ts": ts})
+        with self._lock:
+            self._pending_signals.setdefault(name, deque()).append((flow_id, ts))
+
+    def wrap_slot(self, name: str, slot: Callable) -> Callable:
+        """槽在接收线程中处理信号：记录处理耗时、连线终点和从发出到开始处理的等待时间"""
+        def traced_slot(*args):
+            with self._lock:
+                pending = self._pending_signals.get(name)
+                flow_id, emitted_at = pending.popleft() if pending else (None, None)
+            start = self.now()
+            try:
+                return slot(*args)
+            finally:
+                end = self.now()
+                args_info = {"queued_ms": round((start - emitted_at) / 1000, 3)} if emitted_at is not None else None
+                self.complete(f"{name} → {getattr(slot, '__name__', 'slot')}", "signal", start, end, args_info)
+                if flow_id is not None:
+                    # 连线终点绑定到包含它的处理事件
+                    self.add({"name": name, "cat": "signal", "ph": "f", "bp": "e", "id": flow_id, "ts": start})
+        return traced_slot
+
+    # ----- 动画 -----
+    def animation_started(self, animation, name: str):
+        """动画开始时记录异步事件的起点，动画结束（finished 信号）时记录终点"""
+        key = id(animation)
+        with self._lock:
+            connected = key in self._animations
+        if not connected:
+            animation.finished.connect(lambda: self._animation_finished(key))
+        async_id = self._new_id()
+        with self._lock:
+            self._animations[key] = (name, async_id)
+        self.add({"name": name, "cat": "animation", "ph": "b", "id": async_id, "ts": self.now()})
+
+    def _animation_finished(self, key: int):
+        with self._lock:
+            name, async_id = self._animations.get(key, (None, None))
+        if name is not None:
+            self.add({"name": name, "cat": "animation", "ph": "e", "id": async_id, "ts": self.now()})
+
+    # ----- 模块导入 -----
+    def install_import_hook(self):
+        """记录每个新导入模块的耗时（嵌套导入显示为嵌套的事件）"""
+        original_import = builtins.__import__
+
+        def traced_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # 相对导入和已导入的模块直接返回（from 包 import 子模块 时子模块可能尚未导入）
+            module = sys.modules.get(name)
+            if level or (module is not None and all(hasattr(module, item) for item in fromlist or () if item != "*")):
+                return original_import(name, globals, locals, fromlist, level)
+            start = self.now()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                self.complete(f"import {name}", "import", start, self.now())
+
+        builtins.__import__ = traced_import
+
+    # ----- 写入 -----
+    def save(self):
+        """写入跟踪文件（只写一次）"""
+        with self._lock:
+            if self._saved:
+                return
+            self._saved = True
+            events = [
+                {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._thread_names.items()
+            ]
+            events.append({"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0,
+                           "args": {"name": "荣耀软件更新检查器"}})
+            events.extend(self._events)
+        # 先写临时文件再替换，查看器不会读到写了一半的文件
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, ensure_ascii=False))
+        os.replace(tmp_path, self.path)
+
+# ===== 全局跟踪 =====
+_tracer: Optional[Tracer] = None
+
+def start(path: str) -> Tracer:
+    """开始跟踪（应在导入其余模块之前调用），退出时写入 path"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(path)
+        _tracer.install_import_hook()
+        atexit.register(_tracer.save)
+    return _tracer
+
+def start_from_argv(argv: List[str]) -> Optional[Tracer]:
+    """命令行有 --trace out.json（或 --trace=out.json）时开始跟踪"""
+    for index, arg in enumerate(argv):
+        if arg == "--trace" and index + 1 < len(argv):
+            return start(argv[index + 1])
+        if arg.startswith("--trace="):
+            return start(arg.split("=", 1)[1])
+    return None
+
+def enabled() -> bool:
+    return _tracer is not None
+
+def span(name: str, cat: str = "app", **args):
+    """记录一段耗时的上下文管理器（未开启跟踪时为空对象）"""
+    if _tracer is None:
+        return NULL_SPAN
+    return _tracer.span(name, cat, args or None)
+
+def instant(name: str, cat: str = "app", **args):
+    if _tracer is not None:
+        _tracer.instant(name, cat, args or None)
+
+def elapsed(name: str, seconds: float, cat: str = "app", **args):
+    """记录一段刚结束、持续了 seconds 秒的耗时（事后才知道起止时间时使用，如UI线程卡顿）"""
+    if _tracer is not None:
+        end = _tracer.now()
+        _tracer.complete(name, cat, end - seconds * 1e6, end, args or None)
+
+def traced(name: Optional[str] = None, cat: str = "app"):
+    """记录函数每次调用耗时的装饰器，name 默认为函数的限定名"""
+    def decorator(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(label, cat, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def connect_traced(signal, slot: Callable, name: str):
+    """连接信号与槽；跟踪时记录信号在发送线程中发出和在接收线程中处理的时间，并用连线关联两者"""
+    if _tracer is None:
+        signal.connect(slot)
+        return
+    from PySide6.QtCore import Qt
+
+    # 直接连接在发送线程中同步调用，先于槽记录发出的时间
+    tracer = _tracer
+    signal.connect(lambda *args: tracer.signal_emitted(name), Qt.DirectConnection)
+    signal.connect(tracer.wrap_slot(name, slot))
+
+def animation_started(animation, name: str):
+    """记录动画从开始到结束的时间（在 animation.start() 之前调用）"""
+    if _tracer is not None:
+        _tracer.animation_started(animation, name)
@@ -0,0 +1,180 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import re
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+from optional_deps import get_numpy
+
+# 括号中的补丁信息（比较时去掉）
+_PAREN_RE = re.compile(r"\(.*?\)")
+# 第一个括号中的补丁号，如 "(SP5C233)"、"(SP10)"、"(C233)"
+_PATCH_RE = re.compile(r"\((?:[^)]*?SP(\d+))?(?:[^)]*?C(\d+))?[^)]*\)", re.IGNORECASE)
+
+PARSE_CACHE_SIZE = 4096  # 解析结果的缓存条数（官网和本地的版本号种类很少）
+
+# 整数键：数字部分最多4段，每段14位（存 值+1，缺少的段为0，使 (1, 2) < (1, 2, 0) 与元组比较一致），
+# 低7位为 SP 号；共63位，可放入 int64
+PACK_COMPONENTS = 4
+PACK_COMPONENT_BITS = 14
+PACK_SP_BITS = 7
+UNPACKABLE = -1  # 无法编码（超过4段、某段大于16382或 SP 大于127），需按 Version 比较
+
+# ===== 版本号 =====
+class Version:
+    """解析后的版本号（解析结果会被缓存共享，创建后不要修改）
+
+    - release：数字部分，如 "20.0.0.31 (SP5C233)" 为 (20, 0, 0, 31)
+    - patch：补丁号 (SP, C)，如 (5, 233)，没有补丁信息时为 (0, 0)
+    - text：原始文本
+    按 (release, patch) 全序比较；只比较数字部分时使用 release。
+    """
+    __slots__ = ("text", "release", "patch", "_key")
+
+    def __init__(self, text: str, release: Tuple[int, ...], patch: Tuple[int, int] = (0, 0)):
+        self.text = text
+        self.release = release
+        self.patch = patch
+        self._key = (release, patch)
+
+    @classmethod
+    def parse(cls, text: str) -> "Version":
+        """解析版本文本（不使用缓存，一般用 parse_version）
+
+        数字部分的规则与原先的 clean_version + version_tuple 相同：去掉“Version”“版本”
+        和括号内容后按“.”分割，只保留纯数字的部分。
+        """
+        text = text or ""
+        cleaned = text.replace("Version", "").replace("版本", "")
+        patch = (0, 0)
+        if "(" in cleaned:
+            cleaned = _PAREN_RE.sub("", cleaned)
+            match = _PATCH_RE.search(text)
+            if match:
+                sp, c = match.groups()
+                patch = (int(sp) if sp else 0, int(c) if c else 0)
+        parts = [part for part in cleaned.strip().split(".") if part.isdigit()]
+        try:
+            release = tuple(map(int, parts))
+        except ValueError:
+            # “²”等 isdigit 为真但不能转换为整数的字符
+            release = (0,)
+        return cls(text, release, patch)
+
+    @property
+    def sp(self) -> int:
+        return self.patch[0]
+
+    @property
+    def c(self) -> int:
+        return self.patch[1]
+
+    def __eq__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._key == other._key
+
+    def __lt__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._key < other._key
+
+    def __le__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._key <= other._key
+
+    def __gt__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._key > other._key
+
+    def __ge__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self._key >= other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    def __repr__(self):
+        return f"Version({self.text!r})"
+
+    def __str__(self):
+        return self.text
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_version(text: str) -> Version:
+    """解析版本文本（相同文本只解析一次）"""
+    return Version.parse(text)
+
+def display_version(text: str, remove_patch: bool = True) -> str:
+    """用于显示的版本文本：去掉“Version”“版本”字样，可选去掉括号中的补丁信息"""
+    text = text.replace("Version", "").replace("版本", "").strip()
+    if remove_patch:
+        text = _PAREN_RE.sub("", text).strip()
+    return text
+
+# ===== 整数键 =====
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def pack_version(text: str) -> int:
+    """把版本文本编码为非负整数键，整数大小顺序与 (release, SP) 的顺序相同（C 号不参与编码）
+
+    右移 PACK_SP_BITS 位后只剩数字部分，与 compare_versions 的比较方式相同；无法编码时返回 UNPACKABLE。
+    """
+    version = parse_version(text)
+    limit = (1 << PACK_COMPONENT_BITS) - 1
+    if len(version.release) > PACK_COMPONENTS or version.sp >= 1 << PACK_SP_BITS:
+        return UNPACKABLE
+    key = 0
+    for index in range(PACK_COMPONENTS):
+        value = version.release[index] + 1 if index < len(version.release) else 0
+        if value > limit:
+            return UNPACKABLE
+        key = (key << PACK_COMPONENT_BITS) | value
+    return (key << PACK_SP_BITS) | version.sp
+
+def pack_versions(texts: Sequence[str]):
+    """一列版本文本的整数键（有 NumPy 时为 int64 数组，否则为列表）"""
+    np = get_numpy()
+    if np is None:
+        return [pack_version(text or "") for text in texts]
+    return np.fromiter((pack_version(text or "") for text in texts), dtype=np.int64, count=len(texts))
+
+def compare_packed(keys, online_key: int):
+    """已编码的 int64 数组与官网版本的整数键比较（只比较数字部分，不处理 UNPACKABLE 的行）"""
+    np = get_numpy()
+    return np.sign((keys >> PACK_SP_BITS) - (online_key >> PACK_SP_BITS)).astype(np.int8)
+
+def compare_column(texts: Sequence[str], online_text: str):
+    """一列本地版本与同一个官网版本比较（只比较数字部分）：低于为 -1，相同为 0，高于为 1
+
+    有 NumPy 时整列一次比较并返回 int8 数组，无法编码的行单独按 Version 比较；否则返回列表。
+    """
+    def compare_one(text: str) -> int:
+        local, online = parse_version(text or "").release, parse_version(online_text).release
+        return (local > online) - (local < online)
+
+    np = get_numpy()
+    if np is None:
+        return [compare_one(text) for text in texts]
+    online_key = pack_version(online_text)
+    if online_key == UNPACKABLE:
+        return np.fromiter((compare_one(text) for text in texts), dtype=np.int8, count=len(texts))
+    keys = pack_versions(texts)
+    result = compare_packed(keys, online_key)
+    for index in np.flatnonzero(keys == UNPACKABLE):
+        result[index] = compare_one(texts[index])
+    return result
+
+def argsort_versions(texts: Sequence[str]):
+    """按 (release, SP) 从低到高排序后的下标（稳定排序；有 NumPy 且全部可编码时为数组，否则为列表）"""
+    def sort_key(index: int) -> Tuple[Tuple[int, ...], int]:
+        version = parse_version(texts[index] or "")
+        return version.release, version.sp
+
+    np = get_numpy()
+    keys = pack_versions(texts)
+    if np is None or (keys == UNPACKABLE).any():
+        return sorted(range(len(texts)), key=sort_key)
+    return np.argsort(keys, kind="stable")
@@ -0,0 +1,176 @@
+# HUANCHUAN with Copilot by Trae  版本号：10.0.0
+
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Sequence
+
+import tracing
+from fetch_engine import CancelToken, CheckBudget, CheckCancelled
+from scheduler import get_scheduler
+from PySide6.QtCore import QCoreApplication, QRunnable, QThreadPool
+
+MAX_WORKERS = 2             # 同时执行的任务数（检查任务内部另有抓取线程）
+SHUTDOWN_WAIT_MS = 2000     # 退出时等待已取消的任务结束的时间（毫秒）
+CHECK_TASK_KEY = "check"    # 检查任务的键，同一时间只进行一次检查
+CHECK_TIMEOUT_GRACE = 5.0   # 检查任务的时限比时间预算多出的秒数
+
+# ===== 任务 =====
+class Task(QRunnable):
+    """在工作线程池中执行的任务
+
+    - 协作式取消：cancel 只设置取消标记 token，函数在检查点调用 token.raise_if_cancelled 自行结束；
+      尚未开始执行的任务直接从队列中移除
+    - 时限：从开始执行起 timeout 秒内未结束时按“超时”取消
+    - 结果：future（concurrent.futures.Future）记录函数的返回值或异常，取消的任务结果为 CheckCancelled
+    """
+    def __init__(self, fn: Callable, args: Sequence = (), name: str = "", key: Optional[str] = None,
+                 timeout: Optional[float] = None, token: Optional[CancelToken] = None):
+        super().__init__()
+        # 由任务池保留引用直到结束
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = tuple(args)
+        self.name = name or getattr(fn, "__name__", "task")
+        self.key = key
+        self.timeout = timeout
+        self.token = token or CancelToken()
+        self.future = Future()
+        self._pool: Optional[QThreadPool] = None
+
+    def run(self):
+        """在线程池的线程中执行（由 QThreadPool 调用）"""
+        if not self.future.set_running_or_notify_cancel():
+            return
+        threading.current_thread().name = "worker"
+        timer = None
+        if self.timeout is not None:
+            timer = threading.Timer(self.timeout, self.token.cancel, ("超时",))
+            timer.daemon = True
+            timer.start()
+        try:
+            self.token.raise_if_cancelled()
+            with tracing.span(self.name, "worker", key=self.key):
+                result = self.fn(*self.args)
+            # 取消后才结束的任务，结果同样丢弃
+            self.token.raise_if_cancelled()
+        except Exception as e:
+            error = e
+        else:
+            error = None
+        if timer is not None:
+            timer.cancel()
+        if error is None:
+            self.future.set_result(result)
+        else:
+            self.future.set_exception(error)
+
+    def cancel(self, reason: str = "已取消") -> bool:
+        """请求取消，首次取消时返回 True"""
+        if not self.token.cancel(reason):
+            return False
+        tracing.instant("task_cancelled", "worker", task=self.name, reason=reason)
+        if self._pool is not None and self._pool.tryTake(self):
+            # 尚未开始执行：不再执行，直接以取消结束
+            self.future.set_running_or_notify_cancel()
+            self.future.set_exception(CheckCancelled(reason))
+        return True
+
+    def cancelled(self) -> bool:
+        return self.token.cancelled()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None):
+        """等待并返回结果（失败或取消时抛出相应的异常）"""
+        return self.future.result(timeout)
+
+    def add_done_callback(self, callback: Callable[["Task"], None]):
+        """任务结束时（在执行任务的线程中）调用 callback(task)，已结束时立即调用"""
+        self.future.add_done_callback(lambda future: callback(self))
+
+# ===== 任务池 =====
+class WorkerPool:
+    """基于 QThreadPool 的任务池
+
+    同一 key 的任务同时只执行一个：再次提交时默认并入正在进行的任务（返回该任务，新任务不执行），
+    replace=True 时取消正在进行的任务，再开始新任务。
+    """
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_workers)
+        self._lock = threading.Lock()
+        self._tasks: Dict[int, Task] = {}      # 未结束的任务
+        self._keyed: Dict[str, Task] = {}      # 各 key 正在进行的任务
+
+    def submit(self, task: Task, replace: bool = False) -> Task:
+        """提交任务，返回实际执行的任务（并入正在进行的任务时返回该任务）"""
+        with self._lock:
+            current = self._keyed.get(task.key) if task.key is not None else None
+            if current is not None and not current.done() and not current.cancelled():
+                if not replace:
+                    tracing.instant("task_coalesced", "worker", task=task.name, key=task.key)
+                    return current
+            else:
+                current = None
+            task._pool = self.pool
+            self._tasks[id(task)] = task
+            if task.key is not None:
+                self._keyed[task.key] = task
+        # 取消未开始的任务时会立即调用其结束回调（_forget 需要取得锁），因此在锁外取消
+        if current is not None:
+            current.cancel("已被新的任务取代")
+        task.add_done_callback(self._forget)
+        self.pool.start(task)
+        return task
+
+    def _forget(self, task: Task):
+        with self._lock:
+            self._tasks.pop(id(task), None)
+            if task.key is not None and self._keyed.get(task.key) is task:
+                del self._keyed[task.key]
+
+    def active(self, key: str) -> Optional[Task]:
+        """key 正在进行（未取消）的任务"""
+        with self._lock:
+            task = self._keyed.get(key)
+        return task if task is not None and not task.done() and not task.cancelled() else None
+
+    def shutdown(self, wait_ms: int = SHUTDOWN_WAIT_MS):
+        """取消全部任务，最多等待 wait_ms 毫秒（退出程序时调用）"""
+        with self._lock:
+            tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel("程序退出")
+        self.pool.waitForDone(wait_ms)
+
+def new_check_task(fn: Callable, args: Sequence, budget: CheckBudget) -> Task:
+    """创建检查任务：与预算共用取消标记（预算没有时为其添加），时限为时间预算加 CHECK_TIMEOUT_GRACE 秒
+
+    任务被取消、超时或出错时没有记录检查结果，结束时清除调度器中检查进行中的标记，
+    否则自动检查会一直认为有检查在进行。
+    """
+    if budget.cancel_token is None:
+        budget.cancel_token = CancelToken()
+    task = Task(fn, args, name="check", key=CHECK_TASK_KEY,
+                timeout=budget.total + CHECK_TIMEOUT_GRACE, token=budget.cancel_token)
+    task.add_done_callback(_record_unfinished_check)
+    return task
+
+def _record_unfinished_check(task: Task):
+    """检查任务未正常结束时通知调度器（已有取代它的检查在进行时除外）"""
+    if task.future.exception() is not None and get_worker_pool().active(CHECK_TASK_KEY) is None:
+        get_scheduler().record_aborted()
+
+# ===== 全局任务池 =====
+_worker_pool: Optional[WorkerPool] = None
+
+def get_worker_pool() -> WorkerPool:
+    """获取全局任务池（有 QApplication 时退出前取消全部任务）"""
+    global _worker_pool
+    if _worker_pool is None:
+        _worker_pool = WorkerPool()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(_worker_pool.shutdown)
+    return _worker_pool
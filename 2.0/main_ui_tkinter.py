@@ -70,6 +70,9 @@ def clean_version(v, remove_patch=True):
         v = re.sub(r"\(.*?\)", "", v).strip()
     return v
 
+# 复用同一个会话，多次请求共享 keep-alive 连接
+session = requests.Session()
+
 # ===== UI部分 =====
 anim_running = False
 anim_index = 0
@@ -99,7 +102,7 @@ def check_task():
 
     for key, info in pages.items():
         try:
-            res = requests.get(info["url"], timeout=10)
+            res = session.get(info["url"], timeout=10)
             res.raise_for_status()
             soup = BeautifulSoup(res.text, "html.parser")
 